@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+from batch_selection import BatchSelector
+from candidate_loader import load_category_candidates, to_bytes32
+from monad_bridge import MonadBridge
+from registry_indexer import RegistryIndexer, open_registry_index
+from selection_cache import SelectionCache
+from selection_engine import Candidate, SelectionResult
+
+
+class AgentSelector:
+    """
+    Candidate source for `backend_bridge` and `live_console_demo`.
+
+    With a registry checkpoint (`registry_indexer.py`) the index is caught up
+    with one incremental log scan and every category is served from memory.
+    Without one, each category is read from the contract with
+    `load_category_candidates`.
+
+    `ranking_size` caps `SelectionResult.candidates` (None: the full ranking).
+    With an index and a cap, `select` is a `BudgetIndex` query rather than a
+    scan of the category; the index is updated in place, so nothing caches it.
+    Every other selection, and prompt inference, goes through `cache`
+    (`SelectionCache`), keyed on `version`: the index's version, which moves
+    with every applied `AgentRegisteredV2` / `ReputationUpdated` /
+    `FeedbackApplied`, or without an index a counter bumped by `refresh()`.
+    """
+
+    def __init__(
+        self,
+        bridge: MonadBridge,
+        indexer: RegistryIndexer | None = None,
+        ranking_size: int | None = 10,
+        cache: SelectionCache | None = None,
+    ) -> None:
+        self.bridge = bridge
+        self.indexer = indexer
+        self.ranking_size = ranking_size
+        self.cache = cache or SelectionCache()
+        self._version = 0
+
+    @classmethod
+    def open(
+        cls,
+        bridge: MonadBridge,
+        checkpoint_file: str | Path | None,
+        ranking_size: int | None = 10,
+    ) -> "AgentSelector":
+        indexer = None
+        if checkpoint_file:
+            indexer = open_registry_index(bridge, checkpoint_file, max_k=ranking_size or 10)
+        return cls(bridge, indexer, ranking_size)
+
+    @property
+    def source(self) -> str:
+        return "registry index" if self.indexer is not None else "contract reads"
+
+    @property
+    def version(self) -> int:
+        return self.indexer.version if self.indexer is not None else self._version
+
+    def refresh(self) -> int:
+        """
+        Call after registry writes (registration, feedback). Catches the index up,
+        or without one retires every cached selection. Returns events applied.
+        """
+        if self.indexer is not None:
+            return self.indexer.sync()
+        self._version += 1
+        return 0
+
+    def infer_category(self, prompt: str, default: str = "RESEARCH") -> str:
+        return self.cache.infer_category(prompt, default)
+
+    def candidates(self, category: str) -> list[Candidate]:
+        if self.indexer is not None:
+            return self.indexer.candidates(category)
+        return load_category_candidates(self.bridge, to_bytes32(category))
+
+    def select(self, category: str, budget_wei: int) -> SelectionResult:
+        if self.indexer is not None and self.ranking_size is not None:
+            return self.indexer.select_best(category, budget_wei, limit=self.ranking_size)
+        return self.cache.select(
+            category,
+            budget_wei,
+            lambda: self.candidates(category),
+            version=self.version,
+            limit=self.ranking_size,
+        )
+
+    def select_many(self, categories: Sequence[str], budgets_wei: Sequence[int]) -> list[Candidate | None]:
+        """
+        Best candidate per (category, budget) task, None where `select` would
+        raise. Each distinct category is loaded once and resolved with one
+        vectorized `BatchSelector` pass, however many tasks share it.
+        """
+        pool = [candidate for category in dict.fromkeys(categories) for candidate in self.candidates(category)]
+        return BatchSelector(pool).select_many(categories, budgets_wei)
@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 from eth_account import Account
 from web3 import Web3
 
+from rpc_pool import FailoverHTTPProvider, split_rpc_urls
+
 
 @dataclass(frozen=True)
 class AgentWallet:
@@ -25,7 +27,12 @@ class AgentWalletManager:
         if not worker_private_key:
             raise ValueError("WORKER_PRIVATE_KEY is required")
 
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # MONAD_RPC_URL may list several endpoints separated by commas; reads go to the fastest healthy one.
+        self.rpc_urls = split_rpc_urls(rpc_url)
+        if not self.rpc_urls:
+            raise ValueError("MONAD_RPC_URL is required")
+        self.rpc_url = self.rpc_urls[0]
+        self.w3 = Web3(FailoverHTTPProvider(self.rpc_urls))
         self.master = self._make_wallet("MASTER", master_private_key)
         self.worker = self._make_wallet("WORKER", worker_private_key)
 
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+
+URI_PREFIX = "artifact://sha256/"
+CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class ArtifactRef:
+    digest: str
+    size: int
+    # False when identical content was already stored.
+    created: bool
+
+    @property
+    def uri(self) -> str:
+        return f"{URI_PREFIX}{self.digest}"
+
+
+def parse_uri(uri: str) -> str:
+    if not uri.startswith(URI_PREFIX):
+        raise ValueError(f"Not an artifact URI: {uri}")
+    digest = uri[len(URI_PREFIX) :]
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        raise ValueError(f"Malformed artifact digest: {digest}")
+    return digest
+
+
+def canonical_json(payload: Any) -> bytes:
+    # Stable encoding, so equal payloads hash (and deduplicate) to the same artifact.
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ArtifactStore:
+    """
+    Local content-addressed store for delivery payloads.
+
+    Content is written once under `<root>/sha256/<aa>/<digest>` and referenced
+    by `artifact://sha256/<digest>`, a fixed 82-byte URI, so `submitWork`
+    calldata and storage no longer grow with the deliverable. Writes stream
+    through a temp file while hashing and are published with an atomic rename;
+    identical content is stored once.
+    """
+
+    def __init__(self, root: str | Path = "section2/artifacts") -> None:
+        self.root = Path(root)
+        self._tmp_dir = self.root / "tmp"
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    def exists(self, uri_or_digest: str) -> bool:
+        return self.path_for(_digest(uri_or_digest)).exists()
+
+    def put_bytes(self, data: bytes) -> ArtifactRef:
+        return self.put_stream([data])
+
+    def put_json(self, payload: Any) -> ArtifactRef:
+        return self.put_bytes(canonical_json(payload))
+
+    def put_file(self, fh: BinaryIO) -> ArtifactRef:
+        return self.put_stream(iter(lambda: fh.read(CHUNK_SIZE), b""))
+
+    def put_stream(self, chunks: Iterable[bytes]) -> ArtifactRef:
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            digest = hasher.hexdigest()
+            target = self.path_for(digest)
+            if target.exists():
+                return ArtifactRef(digest=digest, size=size, created=False)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, target)
+            tmp_name = ""
+            return ArtifactRef(digest=digest, size=size, created=True)
+        finally:
+            if tmp_name:
+                os.unlink(tmp_name)
+
+    def open(self, uri_or_digest: str) -> BinaryIO:
+        return self.path_for(_digest(uri_or_digest)).open("rb")
+
+    def read_bytes(self, uri_or_digest: str, verify: bool = True) -> bytes:
+        digest = _digest(uri_or_digest)
+        data = self.path_for(digest).read_bytes()
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Artifact {digest} is corrupted")
+        return data
+
+    def read_json(self, uri_or_digest: str) -> Any:
+        return json.loads(self.read_bytes(uri_or_digest))
+
+
+def _digest(uri_or_digest: str) -> str:
+    return parse_uri(uri_or_digest) if uri_or_digest.startswith(URI_PREFIX) else uri_or_digest
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import aiohttp
+from eth_account.signers.local import LocalAccount
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from web3.contract import AsyncContract
+from web3.exceptions import TransactionNotFound
+
+from fee_oracle import AsyncFeeOracle
+from gas_cache import GasKey, GasLimitCache, gas_key
+from instrumentation import DISABLED, Instrumentation
+from monad_bridge import PendingTx, TxResult, tx_result_from_receipt
+from nonce_manager import NonceManager, is_already_known, is_nonce_error
+from receipt_watcher import AsyncReceiptWatcher
+
+
+async def make_async_web3(rpc_url: str, pool_size: int = 100, timeout_sec: float = 30.0) -> AsyncWeb3:
+    """AsyncWeb3 on a shared keep-alive aiohttp session with up to `pool_size` connections."""
+    provider = AsyncHTTPProvider(rpc_url)
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=timeout_sec),
+    )
+    await provider.cache_async_session(session)
+    return AsyncWeb3(provider)
+
+
+class AsyncMonadBridge:
+    """
+    asyncio counterpart of `MonadBridge` on `AsyncWeb3`.
+
+    Same build -> sign -> send -> wait flow, same `PendingTx` / `TxResult`
+    types, and the same nonce allocator and gas cache, so one event loop can
+    drive many concurrent interactions. Sends from one account are serialized
+    by a per-sender lock so nonces reach the node in order; they also hold the
+    nonce manager's `sender_lock`, so a thread sending through `MonadBridge`
+    from the same account (e.g. `GasFunder`) cannot broadcast out of order. With a started
+    `AsyncReceiptWatcher` attached, receipts come from its block feed instead
+    of one polling loop per tx.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        contract: AsyncContract,
+        default_gas_limit: int = 500_000,
+        nonce_manager: Optional[NonceManager] = None,
+        fee_oracle: Optional[AsyncFeeOracle] = None,
+        gas_cache: Optional[GasLimitCache] = None,
+        receipt_watcher: Optional[AsyncReceiptWatcher] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        self.w3 = w3
+        self.contract = contract
+        self.default_gas_limit = default_gas_limit
+        self.nonce_manager = nonce_manager or NonceManager(None)
+        self.fee_oracle = fee_oracle or AsyncFeeOracle(w3)
+        self.gas_cache = gas_cache or GasLimitCache()
+        self.receipt_watcher = receipt_watcher
+        self.instrumentation = instrumentation or DISABLED
+        if receipt_watcher is not None:
+            receipt_watcher.add_block_listener(self.fee_oracle.notify_block)
+        self._send_locks: Dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    def from_deployment_file(
+        cls,
+        w3: AsyncWeb3,
+        deployment_file: str | Path,
+        default_gas_limit: int = 500_000,
+        nonce_manager: Optional[NonceManager] = None,
+        fee_oracle: Optional[AsyncFeeOracle] = None,
+        gas_cache: Optional[GasLimitCache] = None,
+        receipt_watcher: Optional[AsyncReceiptWatcher] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> "AsyncMonadBridge":
+        path = Path(deployment_file)
+        if not path.exists():
+            raise FileNotFoundError(f"Deployment file not found: {path}")
+
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        address = payload["address"]
+        abi = payload["abi"]
+        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        return cls(
+            w3=w3,
+            contract=contract,
+            default_gas_limit=default_gas_limit,
+            nonce_manager=nonce_manager,
+            fee_oracle=fee_oracle,
+            gas_cache=gas_cache,
+            receipt_watcher=receipt_watcher,
+            instrumentation=instrumentation,
+        )
+
+    async def close(self) -> None:
+        if self.receipt_watcher is not None:
+            await self.receipt_watcher.stop()
+        await self.w3.provider.disconnect()
+
+    async def read(self, fn_name: str, *args: Any) -> Any:
+        fn = getattr(self.contract.functions, fn_name)(*args)
+        with self.instrumentation.span("read", fn_name):
+            return await fn.call()
+
+    async def send_contract_tx(
+        self,
+        account: LocalAccount,
+        fn_name: str,
+        *args: Any,
+        value_wei: int = 0,
+        gas_limit: Optional[int] = None,
+        max_fee_per_gas_wei: Optional[int] = None,
+        max_priority_fee_per_gas_wei: Optional[int] = None,
+        wait_timeout_sec: int = 120,
+        wait_poll_sec: float = 1.0,
+    ) -> TxResult:
+        pending = await self.submit_contract_tx(
+            account,
+            fn_name,
+            *args,
+            value_wei=value_wei,
+            gas_limit=gas_limit,
+            max_fee_per_gas_wei=max_fee_per_gas_wei,
+            max_priority_fee_per_gas_wei=max_priority_fee_per_gas_wei,
+        )
+        return await self.wait_for_receipt(pending, timeout_sec=wait_timeout_sec, poll_sec=wait_poll_sec)
+
+    async def submit_contract_tx(
+        self,
+        account: LocalAccount,
+        fn_name: str,
+        *args: Any,
+        value_wei: int = 0,
+        gas_limit: Optional[int] = None,
+        max_fee_per_gas_wei: Optional[int] = None,
+        max_priority_fee_per_gas_wei: Optional[int] = None,
+    ) -> PendingTx:
+        fn = getattr(self.contract.functions, fn_name)(*args)
+        spans = self.instrumentation
+        learn_key: Optional[GasKey] = None
+        if gas_limit is None and self.gas_cache.is_cacheable(fn_name):
+            learn_key = gas_key(fn_name, args, value_wei)
+            gas_limit = self.gas_cache.limit_for(learn_key)
+        if gas_limit is None:
+            try:
+                with spans.span("estimate_gas", fn_name):
+                    estimated = await fn.estimate_gas({"from": account.address, "value": value_wei})
+                gas_limit = self.gas_cache.record_estimate(learn_key, estimated)
+            except Exception:
+                learn_key = None
+                gas_limit = self.default_gas_limit
+
+        with spans.span("gas_price", fn_name):
+            tx: Dict[str, Any] = {
+                "from": account.address,
+                "value": value_wei,
+                "gas": gas_limit,
+                "chainId": await self.fee_oracle.chain_id(),
+            }
+            tx.update(await self.fee_oracle.fee_fields(max_fee_per_gas_wei, max_priority_fee_per_gas_wei))
+
+        async with self._send_lock(account.address), _holding(self.nonce_manager.sender_lock(account.address)):
+            # One retry after a nonce error: the allocator re-syncs from the chain first.
+            retries_left = 1
+            while True:
+                with spans.span("nonce", fn_name):
+                    nonce = await self._allocate_nonce(account.address)
+                signed = None
+                try:
+                    with spans.span("sign", fn_name):
+                        built_tx = await fn.build_transaction({**tx, "nonce": nonce})
+                        signed = account.sign_transaction(built_tx)
+                    with spans.span("send", fn_name):
+                        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+                except Exception as exc:
+                    if signed is None or not is_already_known(exc):
+                        self.nonce_manager.release(account.address, nonce)
+                        if not is_nonce_error(exc):
+                            raise
+                        await self.resync_nonce(account.address)
+                        if retries_left == 0:
+                            raise
+                        retries_left -= 1
+                        continue
+                    # Our own earlier broadcast of this signed tx reached the node: track it under its nonce.
+                    tx_hash = signed.hash
+                self.nonce_manager.mark_sent(account.address, nonce)
+                return PendingTx(
+                    tx_hash=bytes(tx_hash),
+                    sender=account.address,
+                    nonce=nonce,
+                    fn_name=fn_name,
+                    gas_limit=gas_limit,
+                    gas_key=learn_key,
+                )
+
+    async def submit_transfer(self, account: LocalAccount, to: str, value_wei: int, gas_limit: int = 21_000) -> PendingTx:
+        tx: Dict[str, Any] = {
+            "to": Web3.to_checksum_address(to),
+            "value": value_wei,
+            "gas": gas_limit,
+            "chainId": await self.fee_oracle.chain_id(),
+        }
+        tx.update(await self.fee_oracle.fee_fields())
+        async with self._send_lock(account.address), _holding(self.nonce_manager.sender_lock(account.address)):
+            nonce = await self._allocate_nonce(account.address)
+            signed = account.sign_transaction({**tx, "nonce": nonce})
+            try:
+                tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            except Exception as exc:
+                if not is_already_known(exc):
+                    self.nonce_manager.release(account.address, nonce)
+                    if is_nonce_error(exc):
+                        await self.resync_nonce(account.address)
+                    raise
+                tx_hash = signed.hash
+            self.nonce_manager.mark_sent(account.address, nonce)
+        return PendingTx(tx_hash=bytes(tx_hash), sender=account.address, nonce=nonce, fn_name="transfer", gas_limit=gas_limit)
+
+    async def wait_for_receipt(self, pending: PendingTx, timeout_sec: int = 120, poll_sec: float = 1.0) -> TxResult:
+        with self.instrumentation.span("receipt_wait", pending.fn_name):
+            return await self._wait_for_receipt(pending, timeout_sec, poll_sec)
+
+    async def _wait_for_receipt(self, pending: PendingTx, timeout_sec: int, poll_sec: float) -> TxResult:
+        if self.receipt_watcher is not None:
+            try:
+                receipt = await self.receipt_watcher.wait(pending.tx_hash, timeout_sec=timeout_sec)
+            except TimeoutError:
+                await self.resync_nonce(pending.sender)
+                raise
+            return self._record_receipt(pending, receipt)
+        start = time.time()
+        while True:
+            try:
+                receipt = await self.w3.eth.get_transaction_receipt(pending.tx_hash)
+            except TransactionNotFound:
+                receipt = None
+            if receipt is not None:
+                return self._record_receipt(pending, receipt)
+            if time.time() - start > timeout_sec:
+                # A dropped tx leaves a nonce gap; re-sync so later sends can fill it.
+                await self.resync_nonce(pending.sender)
+                raise TimeoutError(f"Receipt timeout for tx: {pending.tx_hash.hex()}")
+            await asyncio.sleep(poll_sec)
+
+    async def wait_for_receipts(
+        self,
+        pending: Sequence[PendingTx],
+        timeout_sec: int = 120,
+        poll_sec: float = 1.0,
+    ) -> List[TxResult]:
+        return list(
+            await asyncio.gather(
+                *(self.wait_for_receipt(item, timeout_sec=timeout_sec, poll_sec=poll_sec) for item in pending)
+            )
+        )
+
+    def _record_receipt(self, pending: PendingTx, receipt: Any) -> TxResult:
+        result = tx_result_from_receipt(pending.tx_hash, receipt)
+        if pending.gas_key is not None:
+            self.gas_cache.observe(pending.gas_key, result.gas_used, pending.gas_limit, result.status)
+        return result
+
+    async def resync_nonce(self, address: str) -> int:
+        nonce = int(await self.w3.eth.get_transaction_count(Web3.to_checksum_address(address), "pending"))
+        self.nonce_manager.set(address, nonce)
+        return nonce
+
+    async def _allocate_nonce(self, address: str) -> int:
+        if self.nonce_manager.peek(address) is None:
+            chain_nonce = int(await self.w3.eth.get_transaction_count(Web3.to_checksum_address(address), "pending"))
+            self.nonce_manager.seed(address, chain_nonce)
+        return self.nonce_manager.allocate(address)
+
+    def _send_lock(self, address: str) -> asyncio.Lock:
+        key = address.lower()
+        lock = self._send_locks.get(key)
+        if lock is None:
+            lock = self._send_locks[key] = asyncio.Lock()
+        return lock
+
+
+@asynccontextmanager
+async def _holding(lock: threading.Lock, poll_sec: float = 0.001) -> AsyncIterator[None]:
+    # A lock shared with threads: poll instead of blocking the event loop while a thread holds it.
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(poll_sec)
+    try:
+        yield
+    finally:
+        lock.release()
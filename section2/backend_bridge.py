@@ -5,20 +5,10 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from agent_selector import AgentSelector
 from agent_wallet_manager import AgentWalletManager
 from monad_bridge import MonadBridge
-from selection_engine import Candidate, infer_category, select_best
-
-
-def to_bytes32(category: str) -> bytes:
-    raw = category.encode("utf-8")
-    if len(raw) > 32:
-        raise ValueError("Category is too long for bytes32")
-    return raw + (b"\x00" * (32 - len(raw)))
-
-
-def decode_category(category_b32: bytes) -> str:
-    return category_b32.decode("utf-8", errors="ignore").rstrip("\x00")
+from selection_engine import infer_categories
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,6 +18,22 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--category", default="")
     parser.add_argument("--budget-eth", type=float, default=0.01)
     parser.add_argument("--output", default="showcase/demo-data.json")
+    parser.add_argument(
+        "--tasks-file",
+        default="",
+        help="one prompt per line; adds the selected agent for each under `batch` (same budget and --category)",
+    )
+    parser.add_argument(
+        "--registry-index",
+        default="section2/registry_index.json",
+        help="registry_indexer checkpoint to read candidates from; contract reads are used when it does not exist",
+    )
+    parser.add_argument(
+        "--ranking-size",
+        type=int,
+        default=10,
+        help="ranked candidates to report; 0 reports the whole category",
+    )
     return parser.parse_args()
 
 
@@ -37,31 +43,35 @@ def main() -> None:
     manager.assert_rpc_connection()
     bridge = MonadBridge.from_deployment_file(manager.w3, args.deployment)
 
-    category_text = (args.category or "").strip().upper() or infer_category(args.prompt)
-    category_b32 = to_bytes32(category_text)
+    selector = AgentSelector.open(bridge, args.registry_index, ranking_size=args.ranking_size or None)
+    category_text = (args.category or "").strip().upper() or selector.infer_category(args.prompt)
     budget_wei = int(manager.w3.to_wei(args.budget_eth, "ether"))
 
-    addresses = bridge.read("getCategoryAgents", category_b32)
-    candidates: list[Candidate] = []
-    for address in addresses:
-        p = bridge.read("getAgentProfile", address)
-        if not p[7]:
-            continue
-        candidates.append(
-            Candidate(
-                address=address,
-                category=decode_category(p[2]),
-                base_fee_wei=int(p[3]),
-                reputation_score=int(p[5]),
-            )
-        )
+    selection = selector.select(category_text, budget_wei)
+    print(f"Candidates loaded from {selector.source}")
 
-    selection = select_best(candidates, category_text, budget_wei)
+    batch = []
+    if args.tasks_file:
+        lines = Path(args.tasks_file).read_text(encoding="utf-8").splitlines()
+        prompts = [line.strip() for line in lines if line.strip()]
+        categories = [category_text] * len(prompts) if args.category.strip() else infer_categories(prompts)
+        chosen = selector.select_many(categories, [budget_wei] * len(prompts))
+        batch = [
+            {
+                "prompt": prompt,
+                "category": category,
+                "selectedAgent": best.address if best is not None else None,
+                "selectedBaseFeeWei": best.base_fee_wei if best is not None else None,
+                "selectedReputation": best.reputation_score if best is not None else None,
+            }
+            for prompt, category, best in zip(prompts, categories, chosen)
+        ]
+        print(f"Selected agents for {len(batch)} tasks ({sum(item['selectedAgent'] is None for item in batch)} unmatched)")
 
     payload = {
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "network": {
-            "chainId": int(manager.w3.eth.chain_id),
+            "chainId": bridge.fee_oracle.chain_id,
             "contractAddress": bridge.contract.address,
         },
         "task": {
@@ -88,6 +98,7 @@ def main() -> None:
             "selectedEfficiency": selection.best.efficiency,
             "reason": selection.reason,
         },
+        "batch": batch,
         "workflow": {
             "steps": [
                 {"key": "createJobByCategory", "label": "Budget escrow lock (pending demo run)", "status": "pending", "txHash": ""},
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from selection_engine import Candidate, rank_key
+
+
+_UINT64_MAX = int(np.iinfo(np.uint64).max)
+
+
+@dataclass(frozen=True)
+class _CategoryColumns:
+    # Candidates in rank order (same order as `rank_candidates` ignoring budget).
+    ranked: tuple[Candidate, ...]
+    # suffix_min_fee reversed: ascending, so np.searchsorted can count how many
+    # rank positions (from the end) have a running-minimum fee <= budget.
+    min_fee_ascending: np.ndarray
+
+
+class BatchSelector:
+    """
+    Vectorized `select_best` for many (category, budget) pairs at once.
+
+    Per category, candidates are sorted once by the scalar rank key and stored
+    column-wise. The best candidate under budget B is the first rank position
+    whose fee is <= B, i.e. the first position where the running minimum fee
+    drops to <= B. That running minimum is non-increasing, so every budget of a
+    batch is resolved with a single `np.searchsorted` call per category.
+    """
+
+    def __init__(self, candidates: Iterable[Candidate]) -> None:
+        by_category: dict[str, list[Candidate]] = {}
+        for candidate in candidates:
+            by_category.setdefault(candidate.category, []).append(candidate)
+        self._columns = {category: _build_columns(items) for category, items in by_category.items()}
+
+    def select_many(self, categories: Sequence[str], budgets_wei: Sequence[int]) -> list[Optional[Candidate]]:
+        """
+        Returns the chosen candidate per task, or None where scalar
+        `select_best` would raise for lack of an eligible agent.
+        """
+        if len(categories) != len(budgets_wei):
+            raise ValueError("categories and budgets_wei must have the same length")
+        results: list[Optional[Candidate]] = [None] * len(categories)
+        if not categories:
+            return results
+
+        category_codes, inverse = np.unique(np.asarray(categories, dtype=object), return_inverse=True)
+        budgets = _budget_array(budgets_wei)
+        for code, category in enumerate(category_codes):
+            columns = self._columns.get(category)
+            if columns is None:
+                continue
+            task_idx = np.flatnonzero(inverse == code)
+            min_fees = columns.min_fee_ascending
+            if budgets.dtype != min_fees.dtype:
+                min_fees = min_fees.astype(object)
+            eligible = np.searchsorted(min_fees, budgets[task_idx], side="right")
+            first = len(columns.ranked) - eligible
+            for task, position, count in zip(task_idx.tolist(), first.tolist(), eligible.tolist()):
+                if count:
+                    results[task] = columns.ranked[position]
+        return results
+
+
+def _build_columns(candidates: list[Candidate]) -> _CategoryColumns:
+    ranked = tuple(sorted(candidates, key=rank_key))
+    fees = _fee_array([c.base_fee_wei for c in ranked])
+    running_min = np.minimum.accumulate(fees)
+    return _CategoryColumns(ranked=ranked, min_fee_ascending=running_min[::-1].copy())
+
+
+def _fee_array(values: Sequence[int]) -> np.ndarray:
+    # uint96 fees fit uint64 in practice; fall back to exact Python ints otherwise.
+    if all(0 <= value <= _UINT64_MAX for value in values):
+        return np.asarray(values, dtype=np.uint64)
+    return np.asarray(values, dtype=object)
+
+
+def _budget_array(values: Sequence[int]) -> np.ndarray:
+    if values and (min(values) < 0 or max(values) > _UINT64_MAX):
+        # Negative or > uint64 budgets: compare as exact Python ints instead.
+        return np.asarray([int(value) for value in values], dtype=object)
+    return np.asarray(values, dtype=np.uint64)
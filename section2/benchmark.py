@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import web3
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from web3 import Web3
+
+from agent_runtime import AgentRuntime
+from agent_wallet_manager import AgentWalletManager
+from artifact_store import ArtifactStore
+from async_monad_bridge import AsyncMonadBridge, make_async_web3
+from candidate_loader import load_category_candidates, to_bytes32
+from instrumentation import latency_stats
+from job_orchestrator import JobOrchestrator
+from key_store import SqliteKeyStore, SyntheticAgent
+from mock_worker_logic import MockWorkerLogic
+from monad_bridge import MonadBridge
+from receipt_watcher import AsyncReceiptWatcher
+from selection_engine import Candidate, select_best
+from synthetic_agent_seed import generate_keys, make_specs
+from worker_pool import WorkerPool
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS = ("send", "load", "select", "lifecycle")
+CHAIN_BENCHMARKS = frozenset({"send", "load", "lifecycle"})
+
+LOCALHOST_RPC_URL = "http://127.0.0.1:8545"
+LOCALHOST_DEPLOYMENT = REPO_ROOT / "deployments" / "localhost.json"
+# Hardhat's well-known dev accounts #0 (deployer, contract owner) and #1. Never funded outside a dev chain.
+HARDHAT_MASTER_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+HARDHAT_WORKER_KEY = "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d"
+# Left out of the report's config so keys passed via --master-key never land in a JSON file.
+SECRET_CONFIG_FIELDS = frozenset({"master_key", "worker_key"})
+
+MASTER_BASE_FEE_WEI = 100_000_000_000_000
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    benchmarks: tuple[str, ...]
+    start_node: bool
+    rpc_url: str
+    deployment_file: str
+    master_key: str
+    worker_key: str
+    category: str
+    agents: int
+    seed_batch_size: int
+    tx_count: int
+    poll_sec: float
+    load_repeat: int
+    select_sizes: tuple[int, ...]
+    select_repeat: int
+    select_limit: int
+    jobs: int
+    concurrency: int
+    budget_eth: float
+    timeout_sec: int
+    work_delay_sec: float
+    work_dir: str
+    output: str
+
+
+class HardhatNode:
+    """`npx hardhat node` from the repo root, for the lifetime of the benchmark run."""
+
+    def __init__(self, rpc_url: str = LOCALHOST_RPC_URL, startup_timeout_sec: float = 60.0) -> None:
+        self.rpc_url = rpc_url
+        self.startup_timeout_sec = startup_timeout_sec
+        self._proc: subprocess.Popen | None = None
+
+    def start(self) -> "HardhatNode":
+        w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        if w3.is_connected():
+            raise RuntimeError(f"Something is already listening on {self.rpc_url}; drop --start-node to use it")
+        self._proc = subprocess.Popen(
+            ["npx", "hardhat", "node"],
+            cwd=REPO_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + self.startup_timeout_sec
+        while not w3.is_connected():
+            if self._proc.poll() is not None:
+                raise RuntimeError(f"hardhat node exited with code {self._proc.returncode}")
+            if time.time() > deadline:
+                self.stop()
+                raise TimeoutError(f"hardhat node did not answer on {self.rpc_url} within {self.startup_timeout_sec:.0f}s")
+            time.sleep(0.5)
+        return self
+
+    def deploy_v2(self) -> Path:
+        env = {**os.environ, "AME_CONTRACT_VERSION": "v2"}
+        subprocess.run(
+            ["npx", "hardhat", "run", "scripts/deploy.js", "--network", "localhost"],
+            cwd=REPO_ROOT,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return LOCALHOST_DEPLOYMENT
+
+    def stop(self) -> None:
+        if self._proc is None:
+            return
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._proc = None
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> tuple[list[float], Any]:
+    samples: list[float] = []
+    value: Any = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        value = fn()
+        samples.append(time.perf_counter() - started)
+    return samples, value
+
+
+def synthetic_candidates(count: int, category: str, rng: random.Random) -> list[Candidate]:
+    return [
+        Candidate(
+            address=f"0x{index:040x}",
+            category=category,
+            base_fee_wei=rng.randrange(10_000_000_000_000, 500_000_000_000_000),
+            reputation_score=rng.randrange(0, 101),
+        )
+        for index in range(count)
+    ]
+
+
+def seed_agents(bridge: MonadBridge, owner: LocalAccount, cfg: BenchConfig, store_path: Path) -> dict[str, Any]:
+    per_tier = max(1, math.ceil(cfg.agents / 3))
+    specs = make_specs(per_tier, [cfg.category])[: cfg.agents]
+    keys = generate_keys(len(specs), workers=os.cpu_count() or 1)
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    store_path.unlink(missing_ok=True)
+    store = SqliteKeyStore(store_path)
+    seeded = 0
+    started = time.perf_counter()
+    for start in range(0, len(specs), cfg.seed_batch_size):
+        batch = list(zip(specs[start : start + cfg.seed_batch_size], keys[start : start + cfg.seed_batch_size]))
+        pending = [
+            bridge.submit_contract_tx(
+                owner,
+                "seedSyntheticAgent",
+                address,
+                spec.name,
+                "synthetic",
+                spec.category,
+                spec.base_fee_wei,
+                spec.reputation,
+            )
+            for spec, (address, _) in batch
+        ]
+        results = bridge.wait_for_receipts(pending, poll_sec=cfg.poll_sec)
+        store.put_many(
+            SyntheticAgent(
+                address=address,
+                private_key=private_key if private_key.startswith("0x") else f"0x{private_key}",
+                name=spec.name,
+                category_hex="0x" + spec.category.hex(),
+                base_fee_wei=spec.base_fee_wei,
+                reputation=spec.reputation,
+            )
+            for (spec, (address, private_key)), tx in zip(batch, results)
+            if tx.status == 1
+        )
+        seeded += sum(1 for tx in results if tx.status == 1)
+    elapsed = time.perf_counter() - started
+    store.close()
+    return {
+        "requested": len(specs),
+        "seeded": seeded,
+        "elapsedSec": elapsed,
+        "agentsPerSec": seeded / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def ensure_master_registered(bridge: MonadBridge, master: LocalAccount, category_b32: bytes, poll_sec: float) -> None:
+    # createJobByCategory is onlyRegistered.
+    if bool(bridge.read("isRegistered", master.address)):
+        return
+    stake_wei = int(bridge.read("minRegistrationStakeWei"))
+    tx = bridge.send_contract_tx(
+        master,
+        "registerAgentV2",
+        "BenchMaster",
+        "orchestration",
+        category_b32,
+        MASTER_BASE_FEE_WEI,
+        value_wei=stake_wei,
+        wait_poll_sec=poll_sec,
+    )
+    if tx.status != 1:
+        raise RuntimeError(f"registerAgentV2 for the benchmark master reverted: {tx.tx_hash}")
+
+
+def bench_send(bridge: MonadBridge, owner: LocalAccount, cfg: BenchConfig) -> dict[str, Any]:
+    # Rewriting the current fee is a cheap owner-only tx with no lasting effect.
+    fee_bps = int(bridge.read("platformFeeBps"))
+
+    sequential: list[float] = []
+    for _ in range(cfg.tx_count):
+        started = time.perf_counter()
+        tx = bridge.send_contract_tx(owner, "setPlatformFeeBps", fee_bps, wait_poll_sec=cfg.poll_sec)
+        sequential.append(time.perf_counter() - started)
+        if tx.status != 1:
+            raise RuntimeError(f"setPlatformFeeBps reverted: {tx.tx_hash}")
+
+    started = time.perf_counter()
+    pending = [bridge.submit_contract_tx(owner, "setPlatformFeeBps", fee_bps) for _ in range(cfg.tx_count)]
+    submitted = time.perf_counter() - started
+    results = bridge.wait_for_receipts(pending, poll_sec=cfg.poll_sec)
+    pipelined = time.perf_counter() - started
+    return {
+        "txCount": cfg.tx_count,
+        "sequentialLatencySec": latency_stats(sequential),
+        "sequentialTxPerSec": cfg.tx_count / sum(sequential) if sequential else 0.0,
+        "pipelinedSubmitSec": submitted,
+        "pipelinedElapsedSec": pipelined,
+        "pipelinedTxPerSec": cfg.tx_count / pipelined if pipelined > 0 else 0.0,
+        "pipelinedFailed": sum(1 for tx in results if tx.status != 1),
+    }
+
+
+def bench_load(bridge: MonadBridge, cfg: BenchConfig) -> dict[str, Any]:
+    samples, candidates = timed(lambda: load_category_candidates(bridge, to_bytes32(cfg.category)), cfg.load_repeat)
+    return {
+        "category": cfg.category,
+        "candidates": len(candidates),
+        "latencySec": latency_stats(samples),
+        "candidatesPerSec": len(candidates) / min(samples) if min(samples) > 0 else 0.0,
+    }
+
+
+def bench_select(cfg: BenchConfig) -> dict[str, Any]:
+    rng = random.Random(1234)
+    budget_wei = 250_000_000_000_000
+    results: dict[str, Any] = {}
+    for size in cfg.select_sizes:
+        candidates = synthetic_candidates(size, cfg.category, rng)
+        samples, _ = timed(lambda: select_best(candidates, cfg.category, budget_wei, limit=cfg.select_limit), cfg.select_repeat)
+        results[str(size)] = {
+            "latencySec": latency_stats(samples),
+            "candidatesPerSec": size / min(samples) if min(samples) > 0 else 0.0,
+        }
+    return {"limit": cfg.select_limit, "budgetWei": budget_wei, "sizes": results}
+
+
+async def bench_lifecycle(manager: AgentWalletManager, master: LocalAccount, cfg: BenchConfig, deployment: Path, store_path: Path) -> dict[str, Any]:
+    w3 = await make_async_web3(cfg.rpc_url, pool_size=max(16, cfg.concurrency * 2))
+    watcher = await AsyncReceiptWatcher(w3, poll_sec=cfg.poll_sec).start()
+    bridge = AsyncMonadBridge.from_deployment_file(w3, deployment, receipt_watcher=watcher)
+    try:
+        delay = max(cfg.work_delay_sec, 1e-3)
+        orchestrator = JobOrchestrator(
+            bridge,
+            master,
+            AgentRuntime(manager.w3, store_path),
+            budget_wei=int(Web3.to_wei(cfg.budget_eth, "ether")),
+            timeout_sec=cfg.timeout_sec,
+            concurrency=cfg.concurrency,
+            category=cfg.category,
+            worker_pool=WorkerPool(
+                MockWorkerLogic(min_delay_sec=delay, max_delay_sec=delay),
+                max_workers=cfg.concurrency,
+                max_queue=cfg.concurrency,
+            ),
+            artifact_store=ArtifactStore(Path(cfg.work_dir) / "artifacts"),
+        )
+        report = await orchestrator.run(["Benchmark lifecycle task."] * cfg.jobs)
+    finally:
+        await bridge.close()
+    errors = sorted({o["error"] for o in report["outcomes"] if not o["ok"]})
+    report.pop("outcomes")
+    report["workDelaySec"] = delay
+    report["errors"] = errors[:10]
+    return report
+
+
+def run(cfg: BenchConfig) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "meta": {
+            "startedAt": datetime.now(timezone.utc).isoformat(),
+            "gitCommit": _git_commit(),
+            "python": platform.python_version(),
+            "web3": web3.__version__,
+            "platform": platform.platform(),
+            "config": {k: v for k, v in asdict(cfg).items() if k not in SECRET_CONFIG_FIELDS},
+        },
+        "results": {},
+    }
+    results = report["results"]
+
+    if "select" in cfg.benchmarks:
+        results["select"] = bench_select(cfg)
+    if not CHAIN_BENCHMARKS.intersection(cfg.benchmarks):
+        return report
+
+    node = HardhatNode(cfg.rpc_url) if cfg.start_node else None
+    try:
+        deployment = Path(cfg.deployment_file)
+        if node is not None:
+            node.start()
+            deployment = node.deploy_v2()
+        manager = AgentWalletManager(cfg.rpc_url, cfg.master_key, cfg.worker_key)
+        manager.assert_rpc_connection()
+        bridge = MonadBridge.from_deployment_file(manager.w3, deployment)
+        master = Account.from_key(cfg.master_key)
+        report["meta"]["chainId"] = int(manager.w3.eth.chain_id)
+        report["meta"]["contract"] = bridge.contract.address
+
+        store_path = Path(cfg.work_dir) / "agents.sqlite"
+        results["seed"] = seed_agents(bridge, master, cfg, store_path)
+        if "send" in cfg.benchmarks:
+            results["send"] = bench_send(bridge, master, cfg)
+        if "load" in cfg.benchmarks:
+            results["load"] = bench_load(bridge, cfg)
+        if "lifecycle" in cfg.benchmarks:
+            ensure_master_registered(bridge, master, to_bytes32(cfg.category), cfg.poll_sec)
+            results["lifecycle"] = asyncio.run(bench_lifecycle(manager, master, cfg, deployment, store_path))
+    finally:
+        if node is not None:
+            node.stop()
+    return report
+
+
+def parse_args() -> BenchConfig:
+    parser = argparse.ArgumentParser(description="Benchmark the section2 Python paths against a local dev chain")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help=f"comma-separated subset of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--start-node", action="store_true", help="start `npx hardhat node` and deploy V2 to it")
+    parser.add_argument("--rpc-url", default=LOCALHOST_RPC_URL)
+    parser.add_argument("--deployment", default=str(LOCALHOST_DEPLOYMENT), help="used when the chain is already running")
+    parser.add_argument("--master-key", default=os.getenv("BENCH_MASTER_PRIVATE_KEY", HARDHAT_MASTER_KEY), help="must own the contract")
+    parser.add_argument("--worker-key", default=os.getenv("BENCH_WORKER_PRIVATE_KEY", HARDHAT_WORKER_KEY))
+    parser.add_argument("--category", default="DEVELOPMENT")
+    parser.add_argument("--agents", type=int, default=300, help="synthetic agents seeded into --category")
+    parser.add_argument("--seed-batch-size", type=int, default=200)
+    parser.add_argument("--tx-count", type=int, default=100, help="txs per send_contract_tx run")
+    parser.add_argument("--poll-sec", type=float, default=0.05, help="receipt polling interval")
+    parser.add_argument("--load-repeat", type=int, default=3)
+    parser.add_argument("--select-sizes", default="100,1000,10000,100000,1000000")
+    parser.add_argument("--select-repeat", type=int, default=3)
+    parser.add_argument("--select-limit", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--budget-eth", type=float, default=0.01)
+    parser.add_argument("--timeout-sec", type=int, default=120)
+    parser.add_argument("--work-delay-sec", type=float, default=0.05, help="mock worker time per job")
+    parser.add_argument("--work-dir", default="section2/bench")
+    parser.add_argument("--output", default="", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    benchmarks = tuple(b.strip() for b in args.benchmarks.split(",") if b.strip())
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    return BenchConfig(
+        benchmarks=benchmarks,
+        start_node=args.start_node,
+        rpc_url=args.rpc_url,
+        deployment_file=args.deployment,
+        master_key=args.master_key,
+        worker_key=args.worker_key,
+        category=args.category.strip().upper(),
+        agents=args.agents,
+        seed_batch_size=max(1, args.seed_batch_size),
+        tx_count=args.tx_count,
+        poll_sec=args.poll_sec,
+        load_repeat=args.load_repeat,
+        select_sizes=tuple(int(s) for s in args.select_sizes.split(",") if s.strip()),
+        select_repeat=args.select_repeat,
+        select_limit=args.select_limit,
+        jobs=args.jobs,
+        concurrency=args.concurrency,
+        budget_eth=args.budget_eth,
+        timeout_sec=args.timeout_sec,
+        work_delay_sec=args.work_delay_sec,
+        work_dir=args.work_dir,
+        output=args.output,
+    )
+
+
+def main() -> None:
+    cfg = parse_args()
+    report = run(cfg)
+    text = json.dumps(report, indent=2)
+    if not cfg.output:
+        print(text)
+        return
+    out = Path(cfg.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(text, encoding="utf-8")
+    print(f"Benchmark report written: {out}", file=sys.stderr)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,11 @@ from __future__ import annotations
 from eth_account import Account
 
 from agent_wallet_manager import AgentWalletManager
+from candidate_loader import to_bytes32
 from monad_bridge import MonadBridge
 from selection_engine import infer_category
 
 
-def to_bytes32(category: str) -> bytes:
-    raw = category.encode("utf-8")
-    return raw + (b"\x00" * (32 - len(raw)))
-
-
 def main() -> None:
     manager = AgentWalletManager.from_env()
     manager.assert_rpc_connection()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from itertools import count, islice
+from typing import Iterable
+
+from selection_engine import Candidate, rank_key
+
+
+# Node entry: (rank key, insertion sequence, candidate). The sequence number
+# reproduces the stable-sort tie order of `rank_candidates` and keeps tuple
+# comparison from ever reaching the Candidate itself.
+_Entry = tuple[tuple[int, int, float], int, Candidate]
+
+
+class BudgetIndex:
+    """
+    Answers "best agent under budget B" and "top K under budget B" for one category.
+
+    Candidates are kept in a fee-sorted array; a Fenwick tree over that array
+    stores the best `max_k` entries of every node range. A budget query is a
+    bisect on fees plus a merge of O(log N) short lists.
+
+    Reputation changes update O(log N) nodes in place. A new agent or a fee
+    change moves array positions, so the tree is rebuilt lazily on the next query.
+    """
+
+    def __init__(self, candidates: Iterable[Candidate] = (), max_k: int = 5) -> None:
+        if max_k <= 0:
+            raise ValueError("max_k must be positive")
+        self.max_k = max_k
+        self._seq = count()
+        self._entries: dict[str, _Entry] = {}
+        self._order: list[_Entry] = []
+        self._fees: list[int] = []
+        self._pos: dict[str, int] = {}
+        self._tree: list[list[_Entry]] = [[]]
+        self._dirty = False
+        for candidate in candidates:
+            self.upsert(candidate)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def best_under(self, budget_wei: int) -> Candidate | None:
+        ranked = self.top_k_under(budget_wei, 1)
+        return ranked[0] if ranked else None
+
+    def top_k_under(self, budget_wei: int, k: int) -> list[Candidate]:
+        if k <= 0:
+            return []
+        self._ensure_built()
+        prefix = bisect_right(self._fees, budget_wei)
+        if k > self.max_k:
+            entries = heapq.nsmallest(k, self._order[:prefix])
+            return [entry[2] for entry in entries]
+        lists = []
+        i = prefix
+        while i > 0:
+            lists.append(self._tree[i])
+            i -= i & -i
+        return [entry[2] for entry in islice(heapq.merge(*lists), k)]
+
+    def upsert(self, candidate: Candidate) -> None:
+        key = candidate.address.lower()
+        previous = self._entries.get(key)
+        seq = previous[1] if previous is not None else next(self._seq)
+        entry: _Entry = (rank_key(candidate), seq, candidate)
+        self._entries[key] = entry
+        if self._dirty or previous is None or previous[2].base_fee_wei != candidate.base_fee_wei:
+            self._dirty = True
+            return
+        position = self._pos[key]
+        self._order[position - 1] = entry
+        i = position
+        while i <= len(self._order):
+            self._tree[i] = self._node(i)
+            i += i & -i
+
+    def remove(self, address: str) -> None:
+        if self._entries.pop(address.lower(), None) is not None:
+            self._dirty = True
+
+    def _ensure_built(self) -> None:
+        if not self._dirty:
+            return
+        self._order = sorted(self._entries.values(), key=lambda entry: (entry[2].base_fee_wei, entry[1]))
+        self._fees = [entry[2].base_fee_wei for entry in self._order]
+        self._pos = {entry[2].address.lower(): index + 1 for index, entry in enumerate(self._order)}
+        self._tree = [[] for _ in range(len(self._order) + 1)]
+        for i in range(1, len(self._order) + 1):
+            self._tree[i] = self._node(i)
+        self._dirty = False
+
+    def _node(self, i: int) -> list[_Entry]:
+        # Fenwick node i covers (i - lowbit(i), i]: element i plus child nodes i-1, i-2, i-4, ...
+        lists = [[self._order[i - 1]]]
+        low = i - (i & -i)
+        j = i - 1
+        while j > low:
+            lists.append(self._tree[j])
+            j -= j & -j
+        return list(islice(heapq.merge(*lists), self.max_k))
+
+
+def build_category_indexes(candidates: Iterable[Candidate], max_k: int = 5) -> dict[str, BudgetIndex]:
+    indexes: dict[str, BudgetIndex] = {}
+    for candidate in candidates:
+        index = indexes.get(candidate.category)
+        if index is None:
+            index = indexes[candidate.category] = BudgetIndex(max_k=max_k)
+        index.upsert(candidate)
+    return indexes
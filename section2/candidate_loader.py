@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from web3.exceptions import Web3RPCError
+
+from monad_bridge import MonadBridge
+from selection_engine import Candidate
+
+
+PROFILE_CATEGORY = 2
+PROFILE_BASE_FEE = 3
+PROFILE_REPUTATION = 5
+PROFILE_REGISTERED = 7
+
+
+def to_bytes32(category: str) -> bytes:
+    raw = category.encode("utf-8")
+    if len(raw) > 32:
+        raise ValueError("category is too long for bytes32")
+    return raw + (b"\x00" * (32 - len(raw)))
+
+
+def decode_category(category_b32: bytes) -> str:
+    return category_b32.decode("utf-8", errors="ignore").rstrip("\x00")
+
+
+def profile_to_candidate(address: str, profile: Sequence[Any]) -> Candidate | None:
+    if not profile[PROFILE_REGISTERED]:
+        return None
+    return Candidate(
+        address=address,
+        category=decode_category(profile[PROFILE_CATEGORY]),
+        base_fee_wei=int(profile[PROFILE_BASE_FEE]),
+        reputation_score=int(profile[PROFILE_REPUTATION]),
+    )
+
+
+def load_profiles(bridge: MonadBridge, addresses: Sequence[str], batch_size: int = 200) -> list[Any]:
+    """
+    Fetch `getAgentProfile` for every address using JSON-RPC batch requests,
+    one HTTP round trip per `batch_size` addresses. Falls back to sequential
+    reads when the provider does not support batching or the endpoint rejects
+    batch requests (returned as a JSON-RPC error).
+    """
+    profiles: list[Any] = []
+    for start in range(0, len(addresses), batch_size):
+        chunk = addresses[start : start + batch_size]
+        try:
+            with bridge.instrumentation.span("read_batch", "getAgentProfile", size=len(chunk)):
+                with bridge.w3.batch_requests() as batch:
+                    for address in chunk:
+                        batch.add(bridge.contract.functions.getAgentProfile(address))
+                    profiles.extend(batch.execute())
+        except (AttributeError, NotImplementedError, ValueError, Web3RPCError):
+            profiles.extend(bridge.read("getAgentProfile", address) for address in chunk)
+    return profiles
+
+
+def load_category_candidates(bridge: MonadBridge, category_b32: bytes, batch_size: int = 200) -> list[Candidate]:
+    addresses = list(bridge.read("getCategoryAgents", category_b32))
+    candidates: list[Candidate] = []
+    for address, profile in zip(addresses, load_profiles(bridge, addresses, batch_size=batch_size)):
+        candidate = profile_to_candidate(address, profile)
+        if candidate is not None:
+            candidates.append(candidate)
+    return candidates
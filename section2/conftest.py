@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3.contract import Contract
+
+
+DEPLOYMENT = Path(__file__).resolve().parent.parent / "deployments" / "monadTestnet.json"
+
+
+@pytest.fixture(scope="session")
+def contract() -> Contract:
+    """The V2 contract bound to an offline Web3: enough for ABI encoding and log decoding."""
+    payload = json.loads(DEPLOYMENT.read_text(encoding="utf-8"))
+    return Web3().eth.contract(address=Web3.to_checksum_address(payload["address"]), abi=payload["abi"])
+
+
+@pytest.fixture(scope="session")
+def make_log(contract: Contract) -> Callable[..., dict[str, Any]]:
+    """Raw `eth_getLogs`-style entry for `event_name` emitted by `contract`."""
+    events = {entry["name"]: entry for entry in contract.abi if entry.get("type") == "event"}
+
+    def build(event_name: str, block_number: int = 1, log_index: int = 0, **args: Any) -> dict[str, Any]:
+        abi = events[event_name]
+        topics = [bytes(event_abi_to_log_topic(abi))]
+        data_types, data_values = [], []
+        for item in abi["inputs"]:
+            if item["indexed"]:
+                topics.append(encode([item["type"]], [args[item["name"]]]))
+            else:
+                data_types.append(item["type"])
+                data_values.append(args[item["name"]])
+        return {
+            "address": contract.address,
+            "topics": topics,
+            "data": encode(data_types, data_values),
+            "blockNumber": block_number,
+            "logIndex": log_index,
+            "transactionIndex": 0,
+            "transactionHash": b"\x00" * 32,
+            "blockHash": b"\x00" * 32,
+        }
+
+    return build
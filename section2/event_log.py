@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3.contract import Contract
+
+
+# Provider messages for an eth_getLogs range or result set that is too large. Any
+# other error (auth, rate limit, 5xx, decode) is not fixed by a smaller range.
+RANGE_ERROR_MARKERS = (
+    "block range",
+    "range too large",
+    "range is too",
+    "max range",
+    "maximum range",
+    "more than",
+    "too many results",
+    "response size",
+    "limited to",
+    "query timeout",
+    "query exceeds",
+)
+
+
+def is_range_error(exc: BaseException) -> bool:
+    message = str(exc).lower()
+    return "rate limit" not in message and any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+def event_topics(contract: Contract, event_names: Iterable[str]) -> dict[bytes, str]:
+    wanted = set(event_names)
+    topics: dict[bytes, str] = {}
+    for entry in contract.abi:
+        if entry.get("type") == "event" and entry.get("name") in wanted:
+            topics[bytes(event_abi_to_log_topic(entry))] = entry["name"]
+    missing = wanted - set(topics.values())
+    if missing:
+        raise ValueError(f"Events not found in contract ABI: {', '.join(sorted(missing))}")
+    return topics
+
+
+def decode_logs(contract: Contract, logs: Iterable[Any], event_names: Iterable[str]) -> list[Any]:
+    """
+    Decode the raw logs emitted by `contract` whose topic matches one of
+    `event_names`, keeping chain order (block number, log index).
+    """
+    topics = event_topics(contract, event_names)
+    decoded = []
+    for log in logs:
+        if Web3.to_checksum_address(log["address"]) != contract.address or not log["topics"]:
+            continue
+        name = topics.get(bytes(log["topics"][0]))
+        if name is None:
+            continue
+        decoded.append(getattr(contract.events, name)().process_log(log))
+    decoded.sort(key=lambda event: (event["blockNumber"], event["logIndex"]))
+    return decoded
+
+
+def fetch_events(
+    w3: Web3,
+    contract: Contract,
+    event_names: Sequence[str],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 2_000,
+    extra_topics: Sequence[Any] | None = None,
+) -> list[Any]:
+    """
+    Fetch and decode several event types with one `eth_getLogs` per block range.
+    The range is split into `chunk_size` blocks. A provider range error halves
+    the chunk and retries; each success doubles it again, up to `chunk_size`.
+    """
+    topics = event_topics(contract, event_names)
+    topic_filter: list[Any] = [[Web3.to_hex(topic) for topic in topics]]
+    if extra_topics:
+        topic_filter.extend(extra_topics)
+
+    events: list[Any] = []
+    start = from_block
+    size = max(1, chunk_size)
+    while start <= to_block:
+        end = min(to_block, start + size - 1)
+        try:
+            logs = w3.eth.get_logs(
+                {
+                    "address": contract.address,
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "topics": topic_filter,
+                }
+            )
+        except Exception as exc:
+            if size == 1 or not is_range_error(exc):
+                raise
+            size = max(1, size // 2)
+            continue
+        events.extend(decode_logs(contract, logs, event_names))
+        start = end + 1
+        size = min(max(1, chunk_size), size * 2)
+    return events
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import statistics
+import threading
+import time
+from typing import Any, Callable, Generic, TypeVar
+
+from web3 import AsyncWeb3, Web3
+
+
+T = TypeVar("T")
+
+DEFAULT_PRIORITY_FEE_WEI = 2_000_000_000
+
+
+def use_legacy_gas_from_env() -> bool:
+    return os.getenv("MONAD_USE_LEGACY_GAS", "1").strip().lower() in {"1", "true", "yes"}
+
+
+class _TtlValue(Generic[T]):
+    def __init__(self, ttl_sec: float) -> None:
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._value: T | None = None
+        self._expires_at = 0.0
+
+    def get(self, load: Callable[[], T]) -> T:
+        with self._lock:
+            now = time.monotonic()
+            if self._value is None or now >= self._expires_at:
+                self._value = load()
+                self._expires_at = now + self.ttl_sec
+            return self._value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._value = None
+
+
+class FeeOracle:
+    """
+    Cached fee inputs for the transaction builder.
+
+    - chain id is fetched once per process
+    - gas price / base fee / priority fee are cached for `ttl_sec` or until
+      `notify_block` reports a newer block
+    - priority fee is the median of the `priority_percentile` reward over the
+      last `fee_history_blocks` blocks (`eth_feeHistory`)
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        ttl_sec: float = 2.0,
+        use_legacy: bool | None = None,
+        priority_percentile: float = 50.0,
+        fee_history_blocks: int = 10,
+        default_priority_fee_wei: int = DEFAULT_PRIORITY_FEE_WEI,
+    ) -> None:
+        self.w3 = w3
+        self.use_legacy = use_legacy_gas_from_env() if use_legacy is None else use_legacy
+        self.priority_percentile = priority_percentile
+        self.fee_history_blocks = fee_history_blocks
+        self.default_priority_fee_wei = default_priority_fee_wei
+        self._chain_id: int | None = None
+        self._gas_price: _TtlValue[int] = _TtlValue(ttl_sec)
+        self._fee_history: _TtlValue[tuple[int | None, int]] = _TtlValue(ttl_sec)
+        self._lock = threading.Lock()
+        self._last_block = -1
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            with self._lock:
+                if self._chain_id is None:
+                    self._chain_id = int(self.w3.eth.chain_id)
+        return self._chain_id
+
+    def gas_price(self) -> int:
+        return self._gas_price.get(lambda: int(self.w3.eth.gas_price))
+
+    def base_fee(self) -> int | None:
+        return self._fee_history.get(self._load_fee_history)[0]
+
+    def priority_fee(self) -> int:
+        return self._fee_history.get(self._load_fee_history)[1]
+
+    def notify_block(self, block_number: int) -> None:
+        with self._lock:
+            if block_number <= self._last_block:
+                return
+            self._last_block = block_number
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._gas_price.clear()
+        self._fee_history.clear()
+
+    def fee_fields(
+        self,
+        max_fee_per_gas_wei: int | None = None,
+        max_priority_fee_per_gas_wei: int | None = None,
+    ) -> dict[str, int]:
+        if self.use_legacy:
+            return {"gasPrice": self.gas_price()}
+        if max_fee_per_gas_wei is not None and max_priority_fee_per_gas_wei is not None:
+            return {
+                "maxFeePerGas": max_fee_per_gas_wei,
+                "maxPriorityFeePerGas": max_priority_fee_per_gas_wei,
+            }
+        base_fee = self.base_fee()
+        if base_fee is None:
+            return {"gasPrice": self.gas_price()}
+        priority = self.priority_fee()
+        return {"maxPriorityFeePerGas": priority, "maxFeePerGas": int(base_fee * 2 + priority)}
+
+    def _load_fee_history(self) -> tuple[int | None, int]:
+        try:
+            history: Any = self.w3.eth.fee_history(self.fee_history_blocks, "latest", [self.priority_percentile])
+        except Exception:
+            # Node without eth_feeHistory: fall back to the latest block's base fee.
+            latest_block = self.w3.eth.get_block("latest")
+            base_fee = latest_block.get("baseFeePerGas")
+            return (int(base_fee) if base_fee is not None else None), self.default_priority_fee_wei
+        return parse_fee_history(history, self.default_priority_fee_wei)
+
+
+class AsyncFeeOracle:
+    """
+    `FeeOracle` for `AsyncWeb3`. Same caching rules; intended for use from a
+    single event loop, so concurrent misses may at worst fetch twice.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        ttl_sec: float = 2.0,
+        use_legacy: bool | None = None,
+        priority_percentile: float = 50.0,
+        fee_history_blocks: int = 10,
+        default_priority_fee_wei: int = DEFAULT_PRIORITY_FEE_WEI,
+    ) -> None:
+        self.w3 = w3
+        self.ttl_sec = ttl_sec
+        self.use_legacy = use_legacy_gas_from_env() if use_legacy is None else use_legacy
+        self.priority_percentile = priority_percentile
+        self.fee_history_blocks = fee_history_blocks
+        self.default_priority_fee_wei = default_priority_fee_wei
+        self._chain_id: int | None = None
+        self._gas_price: tuple[float, int] | None = None
+        self._fee_history: tuple[float, tuple[int | None, int]] | None = None
+        self._last_block = -1
+
+    async def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = int(await self.w3.eth.chain_id)
+        return self._chain_id
+
+    async def gas_price(self) -> int:
+        now = time.monotonic()
+        if self._gas_price is None or now >= self._gas_price[0]:
+            self._gas_price = (now + self.ttl_sec, int(await self.w3.eth.gas_price))
+        return self._gas_price[1]
+
+    async def fee_fields(
+        self,
+        max_fee_per_gas_wei: int | None = None,
+        max_priority_fee_per_gas_wei: int | None = None,
+    ) -> dict[str, int]:
+        if self.use_legacy:
+            return {"gasPrice": await self.gas_price()}
+        if max_fee_per_gas_wei is not None and max_priority_fee_per_gas_wei is not None:
+            return {
+                "maxFeePerGas": max_fee_per_gas_wei,
+                "maxPriorityFeePerGas": max_priority_fee_per_gas_wei,
+            }
+        base_fee, priority = await self._history()
+        if base_fee is None:
+            return {"gasPrice": await self.gas_price()}
+        return {"maxPriorityFeePerGas": priority, "maxFeePerGas": int(base_fee * 2 + priority)}
+
+    def notify_block(self, block_number: int) -> None:
+        if block_number > self._last_block:
+            self._last_block = block_number
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        self._gas_price = None
+        self._fee_history = None
+
+    async def _history(self) -> tuple[int | None, int]:
+        now = time.monotonic()
+        if self._fee_history is None or now >= self._fee_history[0]:
+            try:
+                history: Any = await self.w3.eth.fee_history(
+                    self.fee_history_blocks, "latest", [self.priority_percentile]
+                )
+                parsed = parse_fee_history(history, self.default_priority_fee_wei)
+            except Exception:
+                latest_block = await self.w3.eth.get_block("latest")
+                base_fee = latest_block.get("baseFeePerGas")
+                parsed = (int(base_fee) if base_fee is not None else None), self.default_priority_fee_wei
+            self._fee_history = (now + self.ttl_sec, parsed)
+        return self._fee_history[1]
+
+
+def parse_fee_history(history: Any, default_priority_fee_wei: int) -> tuple[int | None, int]:
+    # The last baseFeePerGas entry is the projected base fee of the next block.
+    base_fees = history.get("baseFeePerGas") or []
+    base_fee = int(base_fees[-1]) if base_fees else None
+    rewards = [int(row[0]) for row in history.get("reward") or [] if row]
+    priority = int(statistics.median(rewards)) if rewards else default_priority_fee_wei
+    return base_fee, priority
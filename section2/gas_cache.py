@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Hashable
+
+
+GasKey = tuple[Hashable, ...]
+
+# Functions whose gas does not depend on registry size. createJobByCategory is
+# left out on purpose: it runs getBestAgent over every agent in the category, so
+# a learned limit goes stale (and runs out of gas) as agents are seeded.
+FIXED_COST_FUNCTIONS = frozenset(
+    {
+        "registerAgentV2",
+        "seedSyntheticAgent",
+        "setAgentReputation",
+        "setPlatformFeeBps",
+        "setMinRegistrationStakeWei",
+        "createJob",
+        "acceptJob",
+        "submitWork",
+        "approveWork",
+        "releasePayment",
+        "applySyntheticFeedback",
+        "refundAfterTimeout",
+        "cancelOpenJob",
+    }
+)
+
+
+def arg_shape(value: Any) -> tuple[Hashable, ...]:
+    """
+    Coarse cost class of one ABI argument. Dynamic strings/bytes are bucketed by
+    32-byte words because each stored word is what drives their gas cost.
+    """
+    if isinstance(value, bool):
+        return ("bool",)
+    if isinstance(value, int):
+        return ("int",)
+    if isinstance(value, str):
+        return ("str", _words(len(value.encode("utf-8"))))
+    if isinstance(value, (bytes, bytearray)):
+        return ("bytes", _words(len(value)))
+    if isinstance(value, (list, tuple)):
+        return ("list", len(value), tuple(arg_shape(item) for item in value[:1]))
+    return (type(value).__name__,)
+
+
+def gas_key(fn_name: str, args: tuple[Any, ...], value_wei: int = 0) -> GasKey:
+    return (fn_name, value_wei > 0, tuple(arg_shape(arg) for arg in args))
+
+
+def _words(length: int) -> int:
+    return (length + 31) // 32
+
+
+class GasLimitCache:
+    """
+    Learned gas limits per (function, argument shape).
+
+    Seeded from `estimate_gas` on a miss and updated from receipt `gasUsed`.
+    A receipt that ran out of gas drops the entry so the next call re-estimates.
+    Only functions in `cacheable` are learned; callers estimate the rest every time.
+    """
+
+    def __init__(
+        self,
+        margin: float = 1.2,
+        out_of_gas_ratio: float = 0.97,
+        cacheable: frozenset[str] = FIXED_COST_FUNCTIONS,
+    ) -> None:
+        self.margin = margin
+        self.out_of_gas_ratio = out_of_gas_ratio
+        self.cacheable = cacheable
+        self._lock = threading.Lock()
+        self._max_gas: dict[GasKey, int] = {}
+
+    def is_cacheable(self, fn_name: str) -> bool:
+        return fn_name in self.cacheable
+
+    def limit_for(self, key: GasKey) -> int | None:
+        with self._lock:
+            gas = self._max_gas.get(key)
+        if gas is None:
+            return None
+        return int(gas * self.margin)
+
+    def record_estimate(self, key: GasKey | None, estimated_gas: int) -> int:
+        if key is None:
+            return int(estimated_gas * self.margin)
+        with self._lock:
+            self._max_gas[key] = max(self._max_gas.get(key, 0), int(estimated_gas))
+        return int(estimated_gas * self.margin)
+
+    def observe(self, key: GasKey, gas_used: int, gas_limit: int, status: int) -> None:
+        with self._lock:
+            if status != 1 and gas_limit > 0 and gas_used >= gas_limit * self.out_of_gas_ratio:
+                self._max_gas.pop(key, None)
+                return
+            if status == 1 and key in self._max_gas:
+                self._max_gas[key] = max(self._max_gas[key], int(gas_used))
+
+    def invalidate(self, key: GasKey | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._max_gas.clear()
+            else:
+                self._max_gas.pop(key, None)
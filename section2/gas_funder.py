@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence
+
+from eth_account.signers.local import LocalAccount
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from agent_runtime import required_gas_balance
+from monad_bridge import MonadBridge, TxResult
+
+
+@dataclass(frozen=True)
+class TopUp:
+    address: str
+    balance_wei: int
+    amount_wei: int
+    tx: TxResult | None = None
+
+
+class GasFunder:
+    """
+    Keeps synthetic worker balances above a low-water mark, off the job's critical path.
+
+    `fund` reads every balance in JSON-RPC batches, then sends all needed
+    transfers back-to-back from `funder` and waits for them together. Agents
+    below the low-water mark (`required_gas_balance` at the current gas price)
+    are refilled to `refill_factor` times that mark, so one top-up covers
+    several jobs. `start` repeats this on a background thread.
+    """
+
+    def __init__(
+        self,
+        bridge: MonadBridge,
+        funder: LocalAccount,
+        min_balance_wei: int = 0,
+        refill_factor: float = 2.0,
+        batch_size: int = 200,
+    ) -> None:
+        if refill_factor < 1.0:
+            raise ValueError("refill_factor must be >= 1")
+        self.bridge = bridge
+        self.funder = funder
+        self.min_balance_wei = min_balance_wei
+        self.refill_factor = refill_factor
+        self.batch_size = batch_size
+        self.last_error: Exception | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def low_water_wei(self) -> int:
+        return required_gas_balance(self.bridge.fee_oracle.gas_price(), self.min_balance_wei)
+
+    def balances(self, addresses: Sequence[str]) -> list[int]:
+        w3 = self.bridge.w3
+        checksummed = [Web3.to_checksum_address(a) for a in addresses]
+        balances: list[int] = []
+        for start in range(0, len(checksummed), self.batch_size):
+            chunk = checksummed[start : start + self.batch_size]
+            try:
+                with w3.batch_requests() as batch:
+                    for address in chunk:
+                        batch.add(w3.eth.get_balance(address))
+                    balances.extend(int(b) for b in batch.execute())
+            except (AttributeError, NotImplementedError, ValueError, Web3RPCError):
+                balances.extend(int(w3.eth.get_balance(address)) for address in chunk)
+        return balances
+
+    def plan(self, addresses: Sequence[str]) -> list[TopUp]:
+        low_water = self.low_water_wei()
+        target = int(low_water * self.refill_factor)
+        return [
+            TopUp(address=Web3.to_checksum_address(address), balance_wei=balance, amount_wei=target - balance)
+            for address, balance in zip(addresses, self.balances(addresses))
+            if balance < low_water
+        ]
+
+    def fund(self, addresses: Sequence[str], timeout_sec: int = 120) -> list[TopUp]:
+        # Serialized so the background loop and an explicit call never plan the same top-up twice.
+        with self._lock:
+            planned = self.plan(list(addresses))
+            if not planned:
+                return []
+            pending = [self.bridge.submit_transfer(self.funder, t.address, t.amount_wei) for t in planned]
+            results = self.bridge.wait_for_receipts(pending, timeout_sec=timeout_sec)
+            return [
+                TopUp(address=t.address, balance_wei=t.balance_wei, amount_wei=t.amount_wei, tx=tx)
+                for t, tx in zip(planned, results)
+            ]
+
+    def start(self, addresses: Callable[[], Iterable[str]], interval_sec: float = 10.0) -> "GasFunder":
+        """`addresses` is called on every round, e.g. `runtime.addresses`, so newly seeded agents are picked up."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(addresses, interval_sec), name="gas-funder", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout_sec: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout_sec)
+            self._thread = None
+
+    def _run(self, source: Callable[[], Iterable[str]], interval_sec: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.fund(list(source()))
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = exc
+            self._stop.wait(interval_sec)
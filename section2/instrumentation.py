@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol, Sequence
+
+from web3.middleware import Web3Middleware
+
+
+# Upper bounds in seconds, Prometheus style; the implicit last bucket is +Inf.
+LATENCY_BUCKETS_SEC = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Phases of one contract write, in the order they happen.
+TX_PHASES = ("estimate_gas", "gas_price", "nonce", "sign", "send", "receipt_wait")
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """One finished span. Field names follow OpenTelemetry so a callback can forward it as-is."""
+
+    name: str
+    label: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    error: str = ""
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_sec(self) -> float:
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e9
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_stats(samples: Sequence[float]) -> dict[str, float]:
+    """Exact summary of raw samples; `Histogram` is the bounded-memory counterpart for long runs."""
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else 0.0,
+    }
+
+
+class Histogram:
+    __slots__ = ("count", "errors", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_SEC) + 1)
+
+    def observe(self, value: float, error: bool = False) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for index, bound in enumerate(LATENCY_BUCKETS_SEC):
+            if value <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the +Inf bucket)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bound in enumerate(LATENCY_BUCKETS_SEC):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sumSec": self.total,
+            "minSec": self.min if self.count else 0.0,
+            "maxSec": self.max,
+            "p50Sec": self.quantile(0.5),
+            "p90Sec": self.quantile(0.9),
+            "p99Sec": self.quantile(0.99),
+        }
+
+
+class Sink(Protocol):
+    def emit(self, record: SpanRecord) -> None: ...
+
+    def flush(self, instrumentation: "Instrumentation") -> None: ...
+
+
+class Instrumentation:
+    """
+    Timing spans, per-label latency histograms and RPC call counts.
+
+    Code under measurement wraps each phase in `span(name, label)`; the label
+    is the contract function for bridge phases and the JSON-RPC method for
+    `rpc` spans, which come from the web3 middleware added by `install`.
+    `trace()` additionally collects the spans finished in the current thread
+    or task, which is how a caller gets the breakdown of one transaction.
+
+    A disabled instance (`DISABLED`, the bridges' default) hands out one
+    shared no-op span, so instrumented code costs an attribute lookup and a
+    method call per phase.
+    """
+
+    def __init__(self, enabled: bool = True, sinks: Sequence[Sink] = ()) -> None:
+        self.enabled = enabled
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._rpc_calls: Counter[str] = Counter()
+        self._trace: ContextVar[list[SpanRecord] | None] = ContextVar(f"trace-{id(self)}", default=None)
+
+    def span(self, name: str, label: str = "", **attributes: Any) -> Any:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, label, attributes)
+
+    def count_rpc(self, methods: Sequence[str]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._rpc_calls.update(methods)
+
+    @contextmanager
+    def trace(self) -> Iterator[list[SpanRecord]]:
+        records: list[SpanRecord] = []
+        token = self._trace.set(records)
+        try:
+            yield records
+        finally:
+            self._trace.reset(token)
+
+    def install(self, w3: Any) -> Any:
+        """Count and time every JSON-RPC request `w3` sends (sync or async). No-op when disabled."""
+        if self.enabled and "instrumentation" not in w3.middleware_onion:
+            w3.middleware_onion.add(lambda w3_: RpcMetricsMiddleware(w3_, self), name="instrumentation")
+        return w3
+
+    def histograms(self) -> dict[tuple[str, str], Histogram]:
+        with self._lock:
+            return dict(self._histograms)
+
+    def rpc_calls(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._rpc_calls)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            spans: dict[str, dict[str, Any]] = {}
+            for (name, label), histogram in sorted(self._histograms.items()):
+                spans.setdefault(name, {})[label or "-"] = histogram.to_dict()
+            return {"spans": spans, "rpcCalls": dict(self._rpc_calls.most_common())}
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush(self)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._rpc_calls.clear()
+
+    def _record(self, record: SpanRecord) -> None:
+        with self._lock:
+            key = (record.name, record.label)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(record.duration_sec, error=bool(record.error))
+        trace = self._trace.get()
+        if trace is not None:
+            trace.append(record)
+        for sink in self.sinks:
+            sink.emit(record)
+
+
+class _Span:
+    __slots__ = ("_owner", "_name", "_label", "_attributes", "_start_wall", "_start")
+
+    def __init__(self, owner: Instrumentation, name: str, label: str, attributes: dict[str, Any]) -> None:
+        self._owner = owner
+        self._name = name
+        self._label = label
+        self._attributes = attributes
+
+    def __enter__(self) -> "_Span":
+        self._start_wall = time.time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        elapsed = time.perf_counter_ns() - self._start
+        self._owner._record(
+            SpanRecord(
+                name=self._name,
+                label=self._label,
+                start_time_unix_nano=self._start_wall,
+                end_time_unix_nano=self._start_wall + elapsed,
+                error=exc_type.__name__ if exc_type is not None else "",
+                attributes=self._attributes,
+            )
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+DISABLED = Instrumentation(enabled=False)
+
+
+class RpcMetricsMiddleware(Web3Middleware):
+    """One `rpc` span per request (label = method); a batch is one `rpc` span labelled `batch`."""
+
+    def __init__(self, w3: Any, instrumentation: Instrumentation) -> None:
+        super().__init__(w3)
+        self.instrumentation = instrumentation
+
+    def wrap_make_request(self, make_request: Callable) -> Callable:
+        def middleware(method: str, params: Any) -> Any:
+            self.instrumentation.count_rpc((method,))
+            with self.instrumentation.span("rpc", method):
+                return make_request(method, params)
+
+        return middleware
+
+    def wrap_make_batch_request(self, make_batch_request: Callable) -> Callable:
+        def middleware(requests_info: list[tuple[str, Any]]) -> Any:
+            methods = [method for method, _ in requests_info]
+            self.instrumentation.count_rpc(methods)
+            with self.instrumentation.span("rpc", "batch", methods=methods):
+                return make_batch_request(requests_info)
+
+        return middleware
+
+    async def async_wrap_make_request(self, make_request: Callable) -> Callable:
+        async def middleware(method: str, params: Any) -> Any:
+            self.instrumentation.count_rpc((method,))
+            with self.instrumentation.span("rpc", method):
+                return await make_request(method, params)
+
+        return middleware
+
+    async def async_wrap_make_batch_request(self, make_batch_request: Callable) -> Callable:
+        async def middleware(requests_info: list[tuple[str, Any]]) -> Any:
+            methods = [method for method, _ in requests_info]
+            self.instrumentation.count_rpc(methods)
+            with self.instrumentation.span("rpc", "batch", methods=methods):
+                return await make_batch_request(requests_info)
+
+        return middleware
+
+
+class JsonLinesSink:
+    """Appends every span as one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def emit(self, record: SpanRecord) -> None:
+        line = json.dumps(
+            {
+                "name": record.name,
+                "label": record.label,
+                "startNs": record.start_time_unix_nano,
+                "durationSec": record.duration_sec,
+                "error": record.error,
+                **({"attributes": record.attributes} if record.attributes else {}),
+            },
+            default=str,
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+
+    def flush(self, instrumentation: Instrumentation) -> None:
+        with self._lock:
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+class PrometheusTextfileSink:
+    """
+    Writes the aggregated histograms and RPC counters in the Prometheus text
+    format on `flush`, atomically, for node_exporter's textfile collector.
+    """
+
+    def __init__(self, path: str | Path, prefix: str = "ame") -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def emit(self, record: SpanRecord) -> None:
+        pass
+
+    def flush(self, instrumentation: Instrumentation) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(render_prometheus(instrumentation, self.prefix), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class CallbackSink:
+    """
+    Hands every `SpanRecord` to `callback`, e.g. to re-emit it through an
+    OpenTelemetry tracer (`start_span(record.name, start_time=record.start_time_unix_nano)`
+    then `span.end(end_time=record.end_time_unix_nano)`).
+    """
+
+    def __init__(self, callback: Callable[[SpanRecord], None]) -> None:
+        self.callback = callback
+
+    def emit(self, record: SpanRecord) -> None:
+        self.callback(record)
+
+    def flush(self, instrumentation: Instrumentation) -> None:
+        pass
+
+
+def render_prometheus(instrumentation: Instrumentation, prefix: str = "ame") -> str:
+    lines = [
+        f"# HELP {prefix}_span_seconds Duration of instrumented phases.",
+        f"# TYPE {prefix}_span_seconds histogram",
+    ]
+    for (name, label), histogram in sorted(instrumentation.histograms().items()):
+        labels = f'span="{_escape(name)}",label="{_escape(label)}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_SEC, histogram.buckets):
+            cumulative += count
+            lines.append(f'{prefix}_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{prefix}_span_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{prefix}_span_seconds_sum{{{labels}}} {histogram.total}")
+        lines.append(f"{prefix}_span_seconds_count{{{labels}}} {histogram.count}")
+    lines.append(f"# HELP {prefix}_span_errors_total Instrumented phases that raised.")
+    lines.append(f"# TYPE {prefix}_span_errors_total counter")
+    for (name, label), histogram in sorted(instrumentation.histograms().items()):
+        lines.append(f'{prefix}_span_errors_total{{span="{_escape(name)}",label="{_escape(label)}"}} {histogram.errors}')
+    lines.append(f"# HELP {prefix}_rpc_calls_total JSON-RPC calls by method, including calls inside batches.")
+    lines.append(f"# TYPE {prefix}_rpc_calls_total counter")
+    for method, count in sorted(instrumentation.rpc_calls().items()):
+        lines.append(f'{prefix}_rpc_calls_total{{method="{_escape(method)}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def tx_breakdown(records: Sequence[SpanRecord]) -> dict[str, Any]:
+    """Seconds per tx phase plus the RPC methods seen, from the spans of one `trace()`."""
+    phases = {phase: 0.0 for phase in TX_PHASES}
+    rpc: Counter[str] = Counter()
+    for record in records:
+        if record.name in phases:
+            phases[record.name] += record.duration_sec
+        elif record.name == "rpc" and record.label == "batch":
+            rpc.update(record.attributes.get("methods", ()))
+        elif record.name == "rpc":
+            rpc[record.label] += 1
+    return {"phasesSec": phases, "rpcCalls": dict(rpc)}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Sequence, TypeVar
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from agent_runtime import AgentRuntime, gas_topup_wei
+from agent_wallet_manager import AgentWalletManager
+from artifact_store import ArtifactStore
+from async_monad_bridge import AsyncMonadBridge, make_async_web3
+from candidate_loader import to_bytes32
+from event_log import decode_logs
+from gas_funder import GasFunder
+from instrumentation import latency_stats
+from key_store import DEFAULT_KEY_STORE
+from mock_worker_logic import MockWorkerLogic, store_delivery
+from monad_bridge import MonadBridge, TxResult
+from nonce_manager import NonceManager
+from receipt_watcher import AsyncReceiptWatcher
+from selection_cache import SelectionCache
+from worker_pool import POOL_MODES, WorkerPool, work_timeout
+
+
+T = TypeVar("T")
+
+JOB_STEPS = (
+    "createJobByCategory",
+    "gasTopup",
+    "acceptJob",
+    "work",
+    "submitWork",
+    "releasePayment",
+    "applySyntheticFeedback",
+)
+
+
+@dataclass(frozen=True)
+class OrchestratorConfig:
+    deployment_file: str
+    prompts: tuple[str, ...]
+    concurrency: int
+    budget_eth: float
+    timeout_sec: int
+    category: str
+    synthetic_agents_file: str
+    pool_size: int
+    report_json: str
+    prefund: bool
+    worker_mode: str
+    worker_pool_size: int
+    artifacts_dir: str
+
+
+@dataclass
+class JobOutcome:
+    prompt: str
+    category: str
+    job_id: int | None = None
+    worker: str | None = None
+    ok: bool = False
+    error: str = ""
+    tx_hashes: dict[str, str] = field(default_factory=dict)
+    step_sec: dict[str, float] = field(default_factory=dict)
+
+
+class JobOrchestrator:
+    """
+    Runs many job lifecycles concurrently on one event loop.
+
+    Each job follows the console demo's steps (create -> accept -> work ->
+    submit -> release -> feedback); at most `concurrency` jobs are in flight.
+    Master-account txs of different jobs interleave freely because the async
+    bridge serializes sends per account, which keeps the master nonce order intact.
+    """
+
+    def __init__(
+        self,
+        bridge: AsyncMonadBridge,
+        master: LocalAccount,
+        runtime: AgentRuntime,
+        budget_wei: int,
+        timeout_sec: int,
+        concurrency: int = 8,
+        category: str = "",
+        worker_pool: WorkerPool | None = None,
+        selection_cache: SelectionCache | None = None,
+        artifact_store: ArtifactStore | None = None,
+        prefunded: bool = False,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.bridge = bridge
+        self.master = master
+        self.runtime = runtime
+        self.budget_wei = budget_wei
+        self.timeout_sec = timeout_sec
+        self.concurrency = concurrency
+        self.category = category
+        self.worker_pool = worker_pool or WorkerPool(MockWorkerLogic(), max_workers=concurrency, max_queue=concurrency)
+        self.selection_cache = selection_cache or SelectionCache()
+        self.artifact_store = artifact_store or ArtifactStore()
+        # A running GasFunder keeps workers topped up; per-job balance checks would only add RPCs.
+        self.prefunded = prefunded
+        self._gas_locks: dict[str, asyncio.Lock] = {}
+
+    async def run(self, prompts: Sequence[str]) -> dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(prompt: str) -> JobOutcome:
+            async with semaphore:
+                return await self._run_job(prompt)
+
+        await self.worker_pool.start()
+        try:
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(*(bounded(prompt) for prompt in prompts))
+            elapsed = time.perf_counter() - started
+        finally:
+            await self.worker_pool.close()
+        report = build_report(outcomes, elapsed, self.concurrency)
+        report["workerPool"] = asdict(self.worker_pool.metrics())
+        return report
+
+    async def _run_job(self, prompt: str) -> JobOutcome:
+        category = self.category or self.selection_cache.infer_category(prompt)
+        outcome = JobOutcome(prompt=prompt, category=category)
+        try:
+            tx_create = await self._step(
+                outcome,
+                "createJobByCategory",
+                self.bridge.send_contract_tx(
+                    self.master,
+                    "createJobByCategory",
+                    to_bytes32(category),
+                    self.timeout_sec,
+                    value_wei=self.budget_wei,
+                ),
+            )
+            # nextJobId is racy with concurrent creates; the receipt's JobCreated log is not.
+            created = decode_logs(self.bridge.contract, tx_create.logs, ["JobCreated"])
+            if not created:
+                raise RuntimeError(f"createJobByCategory produced no JobCreated event (status={tx_create.status})")
+            job_id = int(created[0]["args"]["jobId"])
+            outcome.job_id = job_id
+            outcome.worker = created[0]["args"]["worker"]
+            worker = self.runtime.get_synthetic_account(outcome.worker)
+
+            if not self.prefunded:
+                await self._step(outcome, "gasTopup", self._ensure_worker_gas(worker.address))
+            await self._step(outcome, "acceptJob", self.bridge.send_contract_tx(worker, "acceptJob", job_id))
+            # timeoutAt starts at acceptJob, so the work budget is timeoutSeconds minus time to submit.
+            result = await self._step(
+                outcome,
+                "work",
+                self.worker_pool.run(prompt, timeout_sec=work_timeout(self.timeout_sec)),
+            )
+            delivery_uri = store_delivery(self.artifact_store, result.output_json)
+            await self._step(
+                outcome,
+                "submitWork",
+                self.bridge.send_contract_tx(worker, "submitWork", job_id, delivery_uri),
+            )
+            await self._step(outcome, "releasePayment", self.bridge.send_contract_tx(self.master, "releasePayment", job_id))
+            await self._step(
+                outcome,
+                "applySyntheticFeedback",
+                self.bridge.send_contract_tx(self.master, "applySyntheticFeedback", job_id, random.choice([True, False])),
+            )
+            outcome.ok = True
+        except Exception as exc:
+            outcome.error = f"{type(exc).__name__}: {exc}"
+        return outcome
+
+    async def _step(self, outcome: JobOutcome, name: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        value = await awaitable
+        outcome.step_sec[name] = time.perf_counter() - started
+        if isinstance(value, TxResult):
+            outcome.tx_hashes[name] = value.tx_hash
+            if value.status != 1:
+                raise RuntimeError(f"{name} reverted: {value.tx_hash}")
+        return value
+
+    async def _ensure_worker_gas(self, worker_address: str) -> TxResult | None:
+        key = worker_address.lower()
+        lock = self._gas_locks.get(key)
+        if lock is None:
+            lock = self._gas_locks[key] = asyncio.Lock()
+        # One top-up per worker at a time, so concurrent jobs for the same agent do not double-fund it.
+        async with lock:
+            topup_wei = gas_topup_wei(
+                int(await self.bridge.w3.eth.get_balance(worker_address)),
+                await self.bridge.fee_oracle.gas_price(),
+            )
+            if topup_wei == 0:
+                return None
+            pending = await self.bridge.submit_transfer(self.master, worker_address, topup_wei)
+            return await self.bridge.wait_for_receipt(pending)
+
+
+def build_report(outcomes: Sequence[JobOutcome], elapsed_sec: float, concurrency: int) -> dict[str, Any]:
+    succeeded = [o for o in outcomes if o.ok]
+    steps: dict[str, dict[str, float]] = {}
+    for step in JOB_STEPS:
+        values = [o.step_sec[step] for o in outcomes if step in o.step_sec]
+        if values:
+            steps[step] = latency_stats(values)
+    return {
+        "jobs": len(outcomes),
+        "succeeded": len(succeeded),
+        "failed": len(outcomes) - len(succeeded),
+        "concurrency": concurrency,
+        "elapsedSec": elapsed_sec,
+        "jobsPerMin": (len(succeeded) / elapsed_sec * 60.0) if elapsed_sec > 0 else 0.0,
+        "stepLatencySec": steps,
+        "outcomes": [asdict(o) for o in outcomes],
+    }
+
+
+def parse_args() -> OrchestratorConfig:
+    parser = argparse.ArgumentParser(description="Run many AME V2 job lifecycles concurrently")
+    parser.add_argument("--deployment", default="deployments/monadTestnet.json")
+    parser.add_argument("--tasks-file", default="", help="one prompt per line")
+    parser.add_argument("--prompt", default="Analyze market demand for agentic coding services.")
+    parser.add_argument("--jobs", type=int, default=10, help="used with --prompt when no tasks file is given")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--budget-eth", type=float, default=0.01)
+    parser.add_argument("--timeout-sec", type=int, default=120)
+    parser.add_argument("--category", default="")
+    parser.add_argument("--synthetic-agents-file", default=DEFAULT_KEY_STORE)
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--report-json", default="")
+    parser.add_argument("--worker-mode", choices=POOL_MODES, default="asyncio")
+    parser.add_argument("--worker-pool-size", type=int, default=0, help="defaults to --concurrency")
+    parser.add_argument("--artifacts-dir", default="section2/artifacts")
+    parser.add_argument("--prefund", action="store_true", help="top up every synthetic agent before the run and keep them funded")
+    args = parser.parse_args()
+
+    if args.tasks_file:
+        lines = Path(args.tasks_file).read_text(encoding="utf-8").splitlines()
+        prompts = tuple(line.strip() for line in lines if line.strip())
+    else:
+        prompts = tuple([args.prompt] * args.jobs)
+    return OrchestratorConfig(
+        deployment_file=args.deployment,
+        prompts=prompts,
+        concurrency=args.concurrency,
+        budget_eth=args.budget_eth,
+        timeout_sec=args.timeout_sec,
+        category=(args.category or "").strip().upper(),
+        synthetic_agents_file=args.synthetic_agents_file,
+        pool_size=args.pool_size,
+        report_json=args.report_json,
+        prefund=args.prefund,
+        worker_mode=args.worker_mode,
+        worker_pool_size=args.worker_pool_size or args.concurrency,
+        artifacts_dir=args.artifacts_dir,
+    )
+
+
+async def run(cfg: OrchestratorConfig) -> dict[str, Any]:
+    manager = AgentWalletManager.from_env()
+    manager.assert_rpc_connection()
+    runtime = AgentRuntime(manager.w3, cfg.synthetic_agents_file)
+    master = Account.from_key(manager.master.private_key)
+
+    funder: GasFunder | None = None
+    nonce_manager: NonceManager | None = None
+    if cfg.prefund:
+        sync_bridge = MonadBridge.from_deployment_file(manager.w3, cfg.deployment_file)
+        # Both bridges send from the master account, so they must draw from one nonce sequence.
+        # The manager never re-syncs below nonces the funder thread has allocated but not yet sent.
+        nonce_manager = sync_bridge.nonce_manager
+        funder = GasFunder(sync_bridge, master)
+        topups = await asyncio.to_thread(funder.fund, runtime.addresses())
+        print(f"Pre-funded {len(topups)} of {len(runtime.addresses())} synthetic agents")
+        funder.start(runtime.addresses)
+
+    w3 = await make_async_web3(manager.rpc_url, pool_size=cfg.pool_size)
+    watcher = await AsyncReceiptWatcher(w3).start()
+    bridge = AsyncMonadBridge.from_deployment_file(
+        w3,
+        cfg.deployment_file,
+        nonce_manager=nonce_manager,
+        receipt_watcher=watcher,
+    )
+    try:
+        orchestrator = JobOrchestrator(
+            bridge,
+            master,
+            runtime,
+            budget_wei=int(w3.to_wei(cfg.budget_eth, "ether")),
+            timeout_sec=cfg.timeout_sec,
+            concurrency=cfg.concurrency,
+            category=cfg.category,
+            worker_pool=WorkerPool(
+                MockWorkerLogic(),
+                mode=cfg.worker_mode,
+                max_workers=cfg.worker_pool_size,
+                max_queue=max(cfg.concurrency, cfg.worker_pool_size),
+            ),
+            artifact_store=ArtifactStore(cfg.artifacts_dir),
+            prefunded=funder is not None,
+        )
+        return await orchestrator.run(cfg.prompts)
+    finally:
+        if funder is not None:
+            funder.stop()
+        await bridge.close()
+
+
+def main() -> None:
+    cfg = parse_args()
+    report = asyncio.run(run(cfg))
+
+    print(
+        f"jobs={report['jobs']} ok={report['succeeded']} failed={report['failed']} "
+        f"elapsed={report['elapsedSec']:.1f}s throughput={report['jobsPerMin']:.1f} jobs/min"
+    )
+    pool = report["workerPool"]
+    print(
+        f"  worker pool: completed={pool['completed']} failed={pool['failed']} timed_out={pool['timed_out']} "
+        f"max_queue_depth={pool['max_queue_depth']} avg_wait={pool['avg_wait_sec']:.3f}s"
+    )
+    for step, stats in report["stepLatencySec"].items():
+        print(f"  {step:<24} p50={stats['p50']:.3f}s p90={stats['p90']:.3f}s p99={stats['p99']:.3f}s n={stats['count']}")
+    for outcome in report["outcomes"]:
+        if not outcome["ok"]:
+            print(f"  FAILED job={outcome['job_id']} prompt={outcome['prompt'][:40]!r}: {outcome['error']}")
+
+    if cfg.report_json:
+        out = Path(cfg.report_json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from agent_wallet_manager import AgentWalletManager
+from candidate_loader import decode_category
+from event_log import fetch_events
+from monad_bridge import MonadBridge
+
+
+JOB_EVENTS = ("JobCreated", "JobAccepted", "WorkSubmitted", "PaymentReleased", "JobRefunded", "JobCancelled")
+
+# Mirrors the contract's JobStatus enum.
+JOB_STATUS = ("Open", "Taken", "Submitted", "Resolved", "Cancelled")
+STATUS_OPEN = 0
+STATUS_TAKEN = 1
+STATUS_SUBMITTED = 2
+STATUS_RESOLVED = 3
+STATUS_CANCELLED = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    employer TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    budget_wei TEXT NOT NULL,
+    category TEXT NOT NULL,
+    selected_by_algorithm INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    delivery_uri TEXT NOT NULL DEFAULT '',
+    created_block INTEGER NOT NULL,
+    accepted_block INTEGER,
+    submitted_block INTEGER,
+    closed_block INTEGER,
+    worker_payout_wei TEXT,
+    fee_wei TEXT,
+    refund_wei TEXT,
+    updated_block INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_worker ON jobs(worker, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_employer ON jobs(employer, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_category ON jobs(category, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_employer_updated ON jobs(employer, updated_block);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    job_id: int
+    employer: str
+    worker: str
+    budget_wei: int
+    category: str
+    selected_by_algorithm: bool
+    status: int
+    delivery_uri: str
+    created_block: int
+    accepted_block: int | None
+    submitted_block: int | None
+    closed_block: int | None
+
+    @property
+    def status_name(self) -> str:
+        return JOB_STATUS[self.status]
+
+
+class JobStore:
+    """
+    SQLite (WAL) job table built from the job-lifecycle event log.
+
+    `sync` backfills with chunked `eth_getLogs` and commits after every chunk,
+    so an interrupted backfill resumes from the last committed block.
+    Addresses are stored lower-case.
+    """
+
+    def __init__(
+        self,
+        bridge: MonadBridge,
+        db_path: str | Path = "section2/jobs.sqlite",
+        start_block: int = 0,
+        chunk_size: int = 2_000,
+    ) -> None:
+        self.bridge = bridge
+        self.db_path = Path(db_path)
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+        self._check_contract()
+
+    @property
+    def last_block(self) -> int:
+        value = self._meta("last_block")
+        return int(value) if value is not None else self.start_block - 1
+
+    def sync(self, to_block: int | None = None) -> int:
+        if to_block is None:
+            to_block = int(self.bridge.w3.eth.block_number)
+        applied = 0
+        start = self.last_block + 1
+        while start <= to_block:
+            end = min(to_block, start + self.chunk_size - 1)
+            events = fetch_events(
+                self.bridge.w3,
+                self.bridge.contract,
+                JOB_EVENTS,
+                start,
+                end,
+                chunk_size=self.chunk_size,
+            )
+            self.apply_events(events, last_block=end)
+            applied += len(events)
+            start = end + 1
+        return applied
+
+    def apply_events(self, events: Iterable[Any], last_block: int | None = None) -> None:
+        with self._lock, self._conn:
+            for event in events:
+                self._apply(event)
+            if last_block is not None:
+                self._set_meta("last_block", str(last_block))
+
+    def get(self, job_id: int) -> JobRecord | None:
+        rows = self._select("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def by_status(self, status: int, limit: int | None = None) -> list[JobRecord]:
+        return self._select("SELECT * FROM jobs WHERE status = ? ORDER BY job_id", (status,), limit)
+
+    def by_worker(self, worker: str, status: int | None = None, limit: int | None = None) -> list[JobRecord]:
+        return self._select_filtered("worker", worker.lower(), status, limit)
+
+    def by_employer(self, employer: str, status: int | None = None, limit: int | None = None) -> list[JobRecord]:
+        return self._select_filtered("employer", employer.lower(), status, limit)
+
+    def by_category(self, category: str, status: int | None = None, limit: int | None = None) -> list[JobRecord]:
+        return self._select_filtered("category", category, status, limit)
+
+    def changed_since(self, block: int, employer: str | None = None) -> list[JobRecord]:
+        """Jobs with a lifecycle event after `block`, optionally only `employer`'s."""
+        if employer is None:
+            return self._select("SELECT * FROM jobs WHERE updated_block > ? ORDER BY job_id", (block,))
+        return self._select(
+            "SELECT * FROM jobs WHERE employer = ? AND updated_block > ? ORDER BY job_id",
+            (employer.lower(), block),
+        )
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {name: 0 for name in JOB_STATUS}
+        for row in rows:
+            counts[JOB_STATUS[row["status"]]] = int(row["n"])
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _apply(self, event: Any) -> None:
+        name = event["event"]
+        args = event["args"]
+        block = int(event["blockNumber"])
+        job_id = int(args["jobId"])
+        if name == "JobCreated":
+            self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, employer, worker, budget_wei, category, selected_by_algorithm,"
+                " status, created_block, updated_block) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    args["employer"].lower(),
+                    args["worker"].lower(),
+                    str(int(args["budget"])),
+                    decode_category(args["category"]),
+                    int(bool(args["selectedByAlgorithm"])),
+                    STATUS_OPEN,
+                    block,
+                    block,
+                ),
+            )
+        elif name == "JobAccepted":
+            self._update(job_id, block, status=STATUS_TAKEN, accepted_block=block)
+        elif name == "WorkSubmitted":
+            self._update(job_id, block, status=STATUS_SUBMITTED, submitted_block=block, delivery_uri=args["deliveryURI"])
+        elif name == "PaymentReleased":
+            self._update(
+                job_id,
+                block,
+                status=STATUS_RESOLVED,
+                closed_block=block,
+                worker_payout_wei=str(int(args["workerPayout"])),
+                fee_wei=str(int(args["fee"])),
+            )
+        elif name in ("JobRefunded", "JobCancelled"):
+            self._update(job_id, block, status=STATUS_CANCELLED, closed_block=block, refund_wei=str(int(args["amount"])))
+
+    def _update(self, job_id: int, block: int, **columns: Any) -> None:
+        columns["updated_block"] = block
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*columns.values(), job_id))
+
+    def _select_filtered(self, column: str, value: str, status: int | None, limit: int | None) -> list[JobRecord]:
+        if status is None:
+            return self._select(f"SELECT * FROM jobs WHERE {column} = ? ORDER BY job_id", (value,), limit)
+        return self._select(
+            f"SELECT * FROM jobs WHERE {column} = ? AND status = ? ORDER BY job_id",
+            (value, status),
+            limit,
+        )
+
+    def _select(self, sql: str, params: tuple[Any, ...], limit: int | None = None) -> list[JobRecord]:
+        if limit is not None:
+            sql = f"{sql} LIMIT ?"
+            params = (*params, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_to_record(row) for row in rows]
+
+    def _migrate(self) -> None:
+        # Stores written before `updated_block` existed: add it, backfilled from the lifecycle columns.
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if columns and "updated_block" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN updated_block INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute(
+                    "UPDATE jobs SET updated_block = MAX(created_block, IFNULL(accepted_block, 0),"
+                    " IFNULL(submitted_block, 0), IFNULL(closed_block, 0))"
+                )
+
+    def _meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _check_contract(self) -> None:
+        stored = self._meta("contract")
+        address = self.bridge.contract.address
+        if stored is not None and stored != address:
+            raise ValueError(f"Job store {self.db_path} was built for contract {stored}, not {address}")
+        with self._lock, self._conn:
+            self._set_meta("contract", address)
+
+
+def _row_to_record(row: sqlite3.Row) -> JobRecord:
+    return JobRecord(
+        job_id=int(row["job_id"]),
+        employer=row["employer"],
+        worker=row["worker"],
+        budget_wei=int(row["budget_wei"]),
+        category=row["category"],
+        selected_by_algorithm=bool(row["selected_by_algorithm"]),
+        status=int(row["status"]),
+        delivery_uri=row["delivery_uri"],
+        created_block=int(row["created_block"]),
+        accepted_block=row["accepted_block"],
+        submitted_block=row["submitted_block"],
+        closed_block=row["closed_block"],
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill the local job store from V2 job events")
+    parser.add_argument("--deployment", default="deployments/monadTestnet.json")
+    parser.add_argument("--db", default="section2/jobs.sqlite")
+    parser.add_argument("--start-block", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=2_000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manager = AgentWalletManager.from_env()
+    manager.assert_rpc_connection()
+    bridge = MonadBridge.from_deployment_file(manager.w3, args.deployment)
+    store = JobStore(bridge, db_path=args.db, start_block=args.start_block, chunk_size=args.chunk_size)
+
+    applied = store.sync()
+    print(f"Applied {applied} job events up to block {store.last_block}")
+    for status, count in store.count_by_status().items():
+        print(f"  {status}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from selection_cache import LRUCache
+
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+DEFAULT_KEY_STORE = "section2/synthetic_agents.private.sqlite"
+# Above this a JSON key file (about 3,000 agents) is served from an indexed SQLite copy.
+LARGE_JSON_BYTES = 1 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    address TEXT PRIMARY KEY,
+    checksum_address TEXT NOT NULL,
+    private_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category_hex TEXT NOT NULL,
+    base_fee_wei TEXT NOT NULL,
+    reputation INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticAgent:
+    address: str
+    private_key: str
+    name: str
+    category_hex: str
+    base_fee_wei: int
+    reputation: int
+
+
+def agent_from_json(raw: dict[str, Any]) -> SyntheticAgent:
+    private_key = raw["private_key"]
+    if not private_key.startswith("0x"):
+        private_key = f"0x{private_key}"
+    return SyntheticAgent(
+        address=raw["address"],
+        private_key=private_key,
+        name=raw.get("name", "synthetic"),
+        category_hex=raw.get("category_hex", ""),
+        base_fee_wei=int(raw.get("base_fee_wei", 0)),
+        reputation=int(raw.get("reputation", 0)),
+    )
+
+
+class KeyStore(ABC):
+    """
+    Lookup of synthetic agent keys by address, with memoized account derivation.
+
+    `Account.from_key` (secp256k1) runs once per address; later calls return
+    the cached `LocalAccount`, bounded by `account_cache_size`.
+    """
+
+    def __init__(self, account_cache_size: int = 65_536) -> None:
+        self._accounts: LRUCache[str, LocalAccount] = LRUCache(account_cache_size)
+
+    @abstractmethod
+    def get(self, address: str) -> SyntheticAgent | None: ...
+
+    @abstractmethod
+    def addresses(self) -> list[str]: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def account(self, address: str) -> LocalAccount:
+        key = address.lower()
+
+        def derive() -> LocalAccount:
+            agent = self.get(key)
+            if agent is None:
+                raise KeyError(address)
+            return Account.from_key(agent.private_key)
+
+        return self._accounts.get_or_load(key, derive)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonKeyStore(KeyStore):
+    """The legacy `{"agents": [...]}` file, parsed on first use instead of at construction."""
+
+    def __init__(self, path: str | Path, account_cache_size: int = 65_536) -> None:
+        super().__init__(account_cache_size)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._agents: dict[str, SyntheticAgent] | None = None
+
+    def get(self, address: str) -> SyntheticAgent | None:
+        return self._index().get(address.lower())
+
+    def agents(self) -> list[SyntheticAgent]:
+        return list(self._index().values())
+
+    def addresses(self) -> list[str]:
+        return [agent.address for agent in self._index().values()]
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def _index(self) -> dict[str, SyntheticAgent]:
+        if self._agents is None:
+            with self._lock:
+                if self._agents is None:
+                    payload = json.loads(self.path.read_text(encoding="utf-8"))
+                    agents = (agent_from_json(raw) for raw in payload.get("agents", []))
+                    self._agents = {agent.address.lower(): agent for agent in agents}
+        return self._agents
+
+
+class SqliteKeyStore(KeyStore):
+    """
+    Keys in a SQLite table indexed by lower-case address. Nothing is loaded up
+    front: each lookup is a primary-key read, so startup time and memory do not
+    grow with the number of agents.
+    """
+
+    def __init__(self, path: str | Path, account_cache_size: int = 65_536) -> None:
+        super().__init__(account_cache_size)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def get(self, address: str) -> SyntheticAgent | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checksum_address, private_key, name, category_hex, base_fee_wei, reputation "
+                "FROM agents WHERE address = ?",
+                (address.lower(),),
+            ).fetchone()
+        if row is None:
+            return None
+        return SyntheticAgent(
+            address=row[0],
+            private_key=row[1],
+            name=row[2],
+            category_hex=row[3],
+            base_fee_wei=int(row[4]),
+            reputation=int(row[5]),
+        )
+
+    def addresses(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT checksum_address FROM agents")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0])
+
+    def put_many(self, agents: Iterable[SyntheticAgent]) -> int:
+        rows = [
+            (
+                agent.address.lower(),
+                agent.address,
+                agent.private_key,
+                agent.name,
+                agent.category_hex,
+                str(agent.base_fee_wei),
+                agent.reputation,
+            )
+            for agent in agents
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def import_json(self, path: str | Path) -> int:
+        return self.put_many(JsonKeyStore(path).agents())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_key_store(path: str | Path, account_cache_size: int = 65_536) -> KeyStore:
+    """
+    SQLite is the default. A `.sqlite` path that does not exist yet is
+    filled from its `.json` sibling when there is one. A JSON path is served
+    from its `.sqlite` sibling when that is at least as new, or when the JSON
+    is over `LARGE_JSON_BYTES`, in which case it is imported there first.
+    Only small JSON files are parsed into memory.
+    """
+    path = Path(path)
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        legacy = path.with_suffix(".json")
+        migrate = not path.exists() and legacy.exists()
+        store = SqliteKeyStore(path, account_cache_size)
+        if migrate:
+            store.import_json(legacy)
+        return store
+    sibling = path.with_suffix(".sqlite")
+    if sibling.exists() and (not path.exists() or sibling.stat().st_mtime >= path.stat().st_mtime):
+        return SqliteKeyStore(sibling, account_cache_size)
+    if path.exists() and path.stat().st_size > LARGE_JSON_BYTES:
+        store = SqliteKeyStore(sibling, account_cache_size)
+        store.import_json(path)
+        return store
+    return JsonKeyStore(path, account_cache_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a synthetic agent JSON key file into an indexed SQLite store")
+    parser.add_argument("--from-json", default="section2/synthetic_agents.private.json")
+    parser.add_argument("--to", default=DEFAULT_KEY_STORE)
+    args = parser.parse_args()
+
+    store = SqliteKeyStore(args.to)
+    count = store.import_json(args.from_json)
+    print(f"Imported {count} agents into {args.to} ({len(store)} total)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
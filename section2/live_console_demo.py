@@ -15,14 +15,25 @@ from rich.panel import Panel
 from rich.table import Table
 
 from agent_runtime import AgentRuntime
+from agent_selector import AgentSelector
+from artifact_store import ArtifactStore
 from agent_wallet_manager import AgentWalletManager
-from mock_worker_logic import MockWorkerLogic, format_delivery_uri
+from candidate_loader import to_bytes32
+from instrumentation import DISABLED, Instrumentation, JsonLinesSink, PrometheusTextfileSink, Sink, tx_breakdown
+from key_store import DEFAULT_KEY_STORE
+from mock_worker_logic import MockWorkerLogic, format_delivery_uri, store_delivery
 from monad_bridge import MonadBridge, TxResult
-from selection_engine import Candidate, infer_category, select_best
+from read_cache import ReadCache
+from receipt_watcher import ReceiptWatcher
 
 
 console = Console()
 
+# applySyntheticFeedback is broadcast right behind releasePayment and requires the
+# job to be Resolved, so estimating it beforehand always reverts. Its cost does not
+# depend on chain state (a few slot writes and two events, ~50k gas).
+FEEDBACK_GAS_LIMIT = 120_000
+
 
 @dataclass(frozen=True)
 class DemoConfig:
@@ -37,8 +48,15 @@ class DemoConfig:
     worker_expertise: str
     worker_base_fee_wei: int
     synthetic_agents_file: str
+    registry_index: str
+    ranking_size: int | None
     explorer_tx_base: str
     export_json: str
+    artifacts_dir: str
+    inline_delivery: bool
+    metrics: bool
+    metrics_jsonl: str
+    metrics_prom: str
 
 
 def parse_args() -> DemoConfig:
@@ -53,8 +71,24 @@ def parse_args() -> DemoConfig:
     parser.add_argument("--master-expertise", default="orchestration")
     parser.add_argument("--worker-expertise", default="execution")
     parser.add_argument("--worker-base-fee-wei", type=int, default=100000000000000)
-    parser.add_argument("--synthetic-agents-file", default="section2/synthetic_agents.private.json")
+    parser.add_argument("--synthetic-agents-file", default=DEFAULT_KEY_STORE)
+    parser.add_argument(
+        "--registry-index",
+        default="section2/registry_index.json",
+        help="registry_indexer checkpoint to read candidates from; contract reads are used when it does not exist",
+    )
+    parser.add_argument(
+        "--ranking-size",
+        type=int,
+        default=10,
+        help="ranked candidates to show and export; 0 reports the whole category",
+    )
     parser.add_argument("--export-json", default="showcase/demo-data.json")
+    parser.add_argument("--artifacts-dir", default="section2/artifacts")
+    parser.add_argument("--inline-delivery", action="store_true", help="embed the JSON result in the URI (legacy mock://)")
+    parser.add_argument("--no-metrics", action="store_true", help="skip the per-tx phase / RPC breakdown")
+    parser.add_argument("--metrics-jsonl", default="", help="also append every span to this JSON lines file")
+    parser.add_argument("--metrics-prom", default="", help="write Prometheus text metrics here at the end")
     args = parser.parse_args()
 
     load_dotenv()
@@ -71,18 +105,18 @@ def parse_args() -> DemoConfig:
         worker_expertise=args.worker_expertise,
         worker_base_fee_wei=args.worker_base_fee_wei,
         synthetic_agents_file=args.synthetic_agents_file,
+        registry_index=args.registry_index,
+        ranking_size=args.ranking_size or None,
         explorer_tx_base=explorer_tx_base,
         export_json=args.export_json,
+        artifacts_dir=args.artifacts_dir,
+        inline_delivery=args.inline_delivery,
+        metrics=not args.no_metrics,
+        metrics_jsonl=args.metrics_jsonl,
+        metrics_prom=args.metrics_prom,
     )
 
 
-def to_bytes32(category: str) -> bytes:
-    raw = category.encode("utf-8")
-    if len(raw) > 32:
-        raise ValueError("category is too long for bytes32")
-    return raw + (b"\x00" * (32 - len(raw)))
-
-
 def tx_display(tx_hash: str, explorer_tx_base: str) -> str:
     if explorer_tx_base:
         base = explorer_tx_base.rstrip("/")
@@ -90,12 +124,22 @@ def tx_display(tx_hash: str, explorer_tx_base: str) -> str:
     return tx_hash
 
 
-def run_tx(label: str, fn) -> TxResult:
-    with console.status(f"[bold yellow]Writing to chain...[/bold yellow] {label}", spinner="dots"):
-        result = fn()
+def run_tx(label: str, fn, instrumentation: Instrumentation = DISABLED) -> TxResult:
+    with instrumentation.trace() as spans:
+        with console.status(f"[bold yellow]Writing to chain...[/bold yellow] {label}", spinner="dots"):
+            result = fn()
+    if instrumentation.enabled:
+        console.print(f"[dim]  {label}: {format_breakdown(tx_breakdown(spans))}[/dim]")
     return result
 
 
+def format_breakdown(breakdown: dict) -> str:
+    phases = " ".join(f"{name}={sec * 1000:.0f}ms" for name, sec in breakdown["phasesSec"].items())
+    rpc = breakdown["rpcCalls"]
+    calls = ", ".join(f"{method}x{count}" for method, count in sorted(rpc.items()))
+    return f"{phases} | rpc={sum(rpc.values())} ({calls})" if rpc else phases
+
+
 def ensure_registered_v2(
     bridge: MonadBridge,
     account,
@@ -122,6 +166,7 @@ def ensure_registered_v2(
             base_fee_wei,
             value_wei=stake_wei,
         ),
+        bridge.instrumentation,
     )
     console.print(
         f"[cyan]TX[/cyan] registerAgentV2/{name}: {tx_display(tx.tx_hash, explorer_tx_base)} "
@@ -129,10 +174,6 @@ def ensure_registered_v2(
     )
 
 
-def decode_category(category_b32: bytes) -> str:
-    return category_b32.decode("utf-8", errors="ignore").rstrip("\x00")
-
-
 def wei_to_eth_str(wei_value: int, decimals: int = 6) -> str:
     scale = 10**18
     whole = wei_value // scale
@@ -167,7 +208,7 @@ def write_demo_export(
     payload = {
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "network": {
-            "chainId": int(bridge.w3.eth.chain_id),
+            "chainId": bridge.fee_oracle.chain_id,
             "contractAddress": bridge.contract.address,
             "explorerTxBase": cfg.explorer_tx_base,
         },
@@ -209,13 +250,30 @@ def main() -> None:
 
     manager = AgentWalletManager.from_env()
     manager.assert_rpc_connection()
-    bridge = MonadBridge.from_deployment_file(manager.w3, cfg.deployment_file)
-    runtime = AgentRuntime(manager.w3, cfg.synthetic_agents_file)
+    instrumentation = DISABLED
+    if cfg.metrics:
+        sinks: list[Sink] = []
+        if cfg.metrics_jsonl:
+            sinks.append(JsonLinesSink(cfg.metrics_jsonl))
+        if cfg.metrics_prom:
+            sinks.append(PrometheusTextfileSink(cfg.metrics_prom))
+        instrumentation = Instrumentation(sinks=sinks)
+        instrumentation.install(manager.w3)
+    watcher = ReceiptWatcher(manager.w3).start()
+    bridge = MonadBridge.from_deployment_file(
+        manager.w3,
+        cfg.deployment_file,
+        receipt_watcher=watcher,
+        read_cache=ReadCache(),
+        instrumentation=instrumentation,
+    )
+    runtime = AgentRuntime(manager.w3, cfg.synthetic_agents_file, bridge=bridge)
 
     master = Account.from_key(manager.master.private_key)
     worker = Account.from_key(manager.worker.private_key)
 
-    category_text = cfg.category or infer_category(cfg.prompt)
+    selector = AgentSelector.open(bridge, cfg.registry_index, ranking_size=cfg.ranking_size)
+    category_text = cfg.category or selector.infer_category(cfg.prompt)
     category_b32 = to_bytes32(category_text)
 
     stake_wei = int(bridge.read("minRegistrationStakeWei"))
@@ -254,29 +312,17 @@ def main() -> None:
     )
 
     budget_wei = int(manager.w3.to_wei(cfg.budget_eth, "ether"))
-    addresses = bridge.read("getCategoryAgents", category_b32)
-
-    candidates: list[Candidate] = []
-    for address in addresses:
-        profile = bridge.read("getAgentProfile", address)
-        if not profile[7]:
-            continue
-        candidates.append(
-            Candidate(
-                address=address,
-                category=decode_category(profile[2]),
-                base_fee_wei=int(profile[3]),
-                reputation_score=int(profile[5]),
-            )
-        )
-
-    selection = select_best(candidates, category_text, budget_wei)
+    # Catch the index up past the registrations above (or retire cached selections without one).
+    selector.refresh()
+    selection = selector.select(category_text, budget_wei)
+    console.print(f"[dim]Candidates loaded from {selector.source}[/dim]")
     console.print(Panel.fit(selection.reason, title="Selection Reason"))
 
     next_job_id = int(bridge.read("nextJobId"))
     tx_create = run_tx(
         "createJobByCategory",
         lambda: bridge.send_contract_tx(master, "createJobByCategory", category_b32, cfg.timeout_sec, value_wei=budget_wei),
+        instrumentation,
     )
     console.print(f"[bold]Master Agent:[/bold] Job opened with auto-selection. jobId={next_job_id}")
     console.print(f"[cyan]TX[/cyan] createJobByCategory: {tx_display(tx_create.tx_hash, cfg.explorer_tx_base)}")
@@ -288,35 +334,50 @@ def main() -> None:
     if gas_topup_tx:
         console.print(f"[cyan]TX[/cyan] gasTopup: {tx_display(gas_topup_tx, cfg.explorer_tx_base)}")
 
-    tx_accept = run_tx("acceptJob", lambda: bridge.send_contract_tx(selected_worker_account, "acceptJob", next_job_id))
+    tx_accept = run_tx(
+        "acceptJob",
+        lambda: bridge.send_contract_tx(selected_worker_account, "acceptJob", next_job_id),
+        instrumentation,
+    )
     console.print(f"[bold]Worker Agent:[/bold] Job accepted by {selected_worker_account.address}.")
     console.print(f"[cyan]TX[/cyan] acceptJob: {tx_display(tx_accept.tx_hash, cfg.explorer_tx_base)}")
 
     mock_worker = MockWorkerLogic()
     with console.status("[bold yellow]Worker running...[/bold yellow]", spinner="bouncingBar"):
         result = mock_worker.run(cfg.prompt)
-    delivery_uri = format_delivery_uri(result.output_json)
+    if cfg.inline_delivery:
+        delivery_uri = format_delivery_uri(result.output_json)
+    else:
+        delivery_uri = store_delivery(ArtifactStore(cfg.artifacts_dir), result.output_json)
     console.print("[bold]Worker Agent:[/bold] Work completed.")
     console.print(Panel.fit(result.summary, title="MockWorkerLogic"))
 
     tx_submit = run_tx(
         "submitWork",
         lambda: bridge.send_contract_tx(selected_worker_account, "submitWork", next_job_id, delivery_uri),
+        instrumentation,
     )
     console.print(f"[cyan]TX[/cyan] submitWork: {tx_display(tx_submit.tx_hash, cfg.explorer_tx_base)}")
 
-    tx_release = run_tx(
-        "releasePayment",
-        lambda: bridge.send_contract_tx(master, "releasePayment", next_job_id),
-    )
+    # releasePayment and applySyntheticFeedback are both master txs with
+    # consecutive nonces, so they are broadcast back-to-back and confirmed together.
+    feedback_positive = random.choice([True, False])
+
+    def release_and_feedback() -> list[TxResult]:
+        pending_release = bridge.submit_contract_tx(master, "releasePayment", next_job_id)
+        pending_feedback = bridge.submit_contract_tx(
+            master,
+            "applySyntheticFeedback",
+            next_job_id,
+            feedback_positive,
+            gas_limit=FEEDBACK_GAS_LIMIT,
+        )
+        return bridge.wait_for_receipts([pending_release, pending_feedback])
+
+    tx_release, tx_feedback = run_tx("releasePayment + applySyntheticFeedback", release_and_feedback, instrumentation)
     console.print("[bold green]Chain:[/bold green] Payment released.")
     console.print(f"[cyan]TX[/cyan] releasePayment: {tx_display(tx_release.tx_hash, cfg.explorer_tx_base)}")
 
-    feedback_positive = random.choice([True, False])
-    tx_feedback = run_tx(
-        "applySyntheticFeedback",
-        lambda: bridge.send_contract_tx(master, "applySyntheticFeedback", next_job_id, feedback_positive),
-    )
     feedback_label = "Great job" if feedback_positive else "Delayed delivery"
     console.print(f"[bold]Feedback:[/bold] {feedback_label}")
     console.print(f"[cyan]TX[/cyan] applySyntheticFeedback: {tx_display(tx_feedback.tx_hash, cfg.explorer_tx_base)}")
@@ -352,6 +413,11 @@ def main() -> None:
         },
         feedback_positive=feedback_positive,
     )
+    watcher.stop()
+    if instrumentation.enabled:
+        instrumentation.flush()
+        rpc = instrumentation.rpc_calls()
+        console.print(f"[dim]RPC calls: {sum(rpc.values())} total, {', '.join(f'{m}={c}' for m, c in sorted(rpc.items()))}[/dim]")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import random
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from artifact_store import ArtifactStore
+
 
 @dataclass(frozen=True)
 class MockWorkResult:
@@ -28,35 +31,53 @@ class MockWorkerLogic:
         self.max_delay_sec = max_delay_sec
 
     def run(self, prompt: str) -> MockWorkResult:
-        if not prompt or not prompt.strip():
-            raise ValueError("Prompt is required")
-
+        _require_prompt(prompt)
         time.sleep(random.uniform(self.min_delay_sec, self.max_delay_sec))
+        return _mock_result(prompt)
+
+    async def run_async(self, prompt: str) -> MockWorkResult:
+        """Same as `run`, but the simulated work yields to the event loop instead of blocking it."""
+        _require_prompt(prompt)
+        await asyncio.sleep(random.uniform(self.min_delay_sec, self.max_delay_sec))
+        return _mock_result(prompt)
+
 
-        normalized = " ".join(prompt.strip().split())
-        summary = f"Task analyzed and completed for: {normalized[:120]}"
-        confidence = 0.92
-        output = {
-            "task": normalized,
-            "status": "completed",
-            "result": {
-                "headline": "Mock worker finished execution",
-                "artifacts": ["analysis.txt", "result.json"],
-                "notes": "Generated in demo mode by MockWorkerLogic",
-            },
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-        }
-        return MockWorkResult(summary=summary, confidence=confidence, output_json=output)
+def _require_prompt(prompt: str) -> None:
+    if not prompt or not prompt.strip():
+        raise ValueError("Prompt is required")
+
+
+def _mock_result(prompt: str) -> MockWorkResult:
+    normalized = " ".join(prompt.strip().split())
+    summary = f"Task analyzed and completed for: {normalized[:120]}"
+    confidence = 0.92
+    output = {
+        "task": normalized,
+        "status": "completed",
+        "result": {
+            "headline": "Mock worker finished execution",
+            "artifacts": ["analysis.txt", "result.json"],
+            "notes": "Generated in demo mode by MockWorkerLogic",
+        },
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+    }
+    return MockWorkResult(summary=summary, confidence=confidence, output_json=output)
 
 
 def format_delivery_uri(payload: dict) -> str:
     """
     For demo-only usage: returns a pseudo URI that can be pushed to submitWork.
+    The whole payload ends up in calldata; prefer `store_delivery`.
     """
     encoded = json.dumps(payload, separators=(",", ":"))
     return f"mock://delivery/{encoded}"
 
 
+def store_delivery(store: ArtifactStore, payload: dict) -> str:
+    """Writes the payload to the artifact store and returns its fixed-size `artifact://sha256/...` URI."""
+    return store.put_json(payload).uri
+
+
 if __name__ == "__main__":
     worker = MockWorkerLogic()
     result = worker.run("Create a concise market summary for agent economy.")
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import json
-import os
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from eth_account.signers.local import LocalAccount
 from web3 import Web3
 from web3.contract import Contract
 from web3.exceptions import TransactionNotFound
 
+from fee_oracle import FeeOracle
+from gas_cache import GasKey, GasLimitCache, gas_key
+from instrumentation import DISABLED, Instrumentation
+from nonce_manager import NonceManager, is_already_known, is_nonce_error
+from read_cache import ReadCache
+from receipt_watcher import ReceiptWatcher
+
 
 @dataclass(frozen=True)
 class TxResult:
@@ -19,19 +25,59 @@ class TxResult:
     status: int
     block_number: int
     gas_used: int
+    logs: tuple[Any, ...] = field(default=(), repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class PendingTx:
+    """Handle for a transaction that was broadcast but not yet confirmed."""
+
+    tx_hash: bytes
+    sender: str
+    nonce: int
+    fn_name: str
+    gas_limit: int = 0
+    gas_key: Optional[GasKey] = None
 
 
 class MonadBridge:
     """
     Contract wrapper for build -> sign -> send -> wait flow.
     Designed for high-frequency usage with local pending-nonce tracking.
+
+    `submit_contract_tx` returns right after broadcast so many transactions
+    (including nonce-ordered ones from a single account) can be in flight at
+    once; `wait_for_receipts` then resolves a whole batch in one polling loop,
+    or, when a started `ReceiptWatcher` is attached, from the watcher's block feed.
     """
 
-    def __init__(self, w3: Web3, contract: Contract, default_gas_limit: int = 500_000) -> None:
+    def __init__(
+        self,
+        w3: Web3,
+        contract: Contract,
+        default_gas_limit: int = 500_000,
+        nonce_manager: Optional[NonceManager] = None,
+        fee_oracle: Optional[FeeOracle] = None,
+        gas_cache: Optional[GasLimitCache] = None,
+        receipt_watcher: Optional[ReceiptWatcher] = None,
+        read_cache: Optional[ReadCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
         self.w3 = w3
         self.contract = contract
         self.default_gas_limit = default_gas_limit
-        self._nonce_cache: Dict[str, int] = {}
+        self.nonce_manager = nonce_manager or NonceManager(w3)
+        self.fee_oracle = fee_oracle or FeeOracle(w3)
+        self.gas_cache = gas_cache or GasLimitCache()
+        self.receipt_watcher = receipt_watcher
+        self.read_cache = read_cache
+        # Spans per phase of reads and writes; the default instance is disabled and costs nothing.
+        self.instrumentation = instrumentation or DISABLED
+        if receipt_watcher is not None:
+            receipt_watcher.add_block_listener(self.fee_oracle.notify_block)
+            if read_cache is not None:
+                receipt_watcher.add_block_listener(read_cache.notify_block)
+                receipt_watcher.add_receipts_listener(lambda _, receipts: read_cache.observe_block(contract, receipts))
 
     @classmethod
     def from_deployment_file(
@@ -39,6 +85,12 @@ class MonadBridge:
         w3: Web3,
         deployment_file: str | Path,
         default_gas_limit: int = 500_000,
+        nonce_manager: Optional[NonceManager] = None,
+        fee_oracle: Optional[FeeOracle] = None,
+        gas_cache: Optional[GasLimitCache] = None,
+        receipt_watcher: Optional[ReceiptWatcher] = None,
+        read_cache: Optional[ReadCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> "MonadBridge":
         path = Path(deployment_file)
         if not path.exists():
@@ -48,11 +100,24 @@ class MonadBridge:
         address = payload["address"]
         abi = payload["abi"]
         contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
-        return cls(w3=w3, contract=contract, default_gas_limit=default_gas_limit)
+        return cls(
+            w3=w3,
+            contract=contract,
+            default_gas_limit=default_gas_limit,
+            nonce_manager=nonce_manager,
+            fee_oracle=fee_oracle,
+            gas_cache=gas_cache,
+            receipt_watcher=receipt_watcher,
+            read_cache=read_cache,
+            instrumentation=instrumentation,
+        )
 
-    def read(self, fn_name: str, *args: Any) -> Any:
+    def read(self, fn_name: str, *args: Any, block_identifier: Any = "latest") -> Any:
         fn = getattr(self.contract.functions, fn_name)(*args)
-        return fn.call()
+        with self.instrumentation.span("read", fn_name):
+            if self.read_cache is None:
+                return fn.call(block_identifier=block_identifier)
+            return self.read_cache.get_or_load(fn_name, args, block_identifier, lambda: fn.call(block_identifier=block_identifier))
 
     def send_contract_tx(
         self,
@@ -66,74 +131,185 @@ class MonadBridge:
         wait_timeout_sec: int = 120,
         wait_poll_sec: float = 1.0,
     ) -> TxResult:
+        pending = self.submit_contract_tx(
+            account,
+            fn_name,
+            *args,
+            value_wei=value_wei,
+            gas_limit=gas_limit,
+            max_fee_per_gas_wei=max_fee_per_gas_wei,
+            max_priority_fee_per_gas_wei=max_priority_fee_per_gas_wei,
+        )
+        return self.wait_for_receipt(pending, timeout_sec=wait_timeout_sec, poll_sec=wait_poll_sec)
+
+    def submit_contract_tx(
+        self,
+        account: LocalAccount,
+        fn_name: str,
+        *args: Any,
+        value_wei: int = 0,
+        gas_limit: Optional[int] = None,
+        max_fee_per_gas_wei: Optional[int] = None,
+        max_priority_fee_per_gas_wei: Optional[int] = None,
+    ) -> PendingTx:
         fn = getattr(self.contract.functions, fn_name)(*args)
-        nonce = self._next_nonce(account.address)
+        spans = self.instrumentation
+        learn_key: Optional[GasKey] = None
+        if gas_limit is None and self.gas_cache.is_cacheable(fn_name):
+            learn_key = gas_key(fn_name, args, value_wei)
+            gas_limit = self.gas_cache.limit_for(learn_key)
         if gas_limit is None:
             try:
-                estimated = fn.estimate_gas({"from": account.address, "value": value_wei})
-                gas_limit = int(estimated * 1.2)
+                with spans.span("estimate_gas", fn_name):
+                    estimated = fn.estimate_gas({"from": account.address, "value": value_wei})
+                gas_limit = self.gas_cache.record_estimate(learn_key, estimated)
             except Exception:
+                learn_key = None
                 gas_limit = self.default_gas_limit
 
-        tx: Dict[str, Any] = {
-            "from": account.address,
-            "nonce": nonce,
-            "value": value_wei,
-            "gas": gas_limit,
-            "chainId": self.w3.eth.chain_id,
-        }
-
-        use_legacy = os.getenv("MONAD_USE_LEGACY_GAS", "1").strip().lower() in {"1", "true", "yes"}
-        if use_legacy:
-            tx["gasPrice"] = self.w3.eth.gas_price
-        else:
-            latest_block = self.w3.eth.get_block("latest")
-            base_fee = latest_block.get("baseFeePerGas")
-            if max_fee_per_gas_wei is not None and max_priority_fee_per_gas_wei is not None:
-                tx["maxFeePerGas"] = max_fee_per_gas_wei
-                tx["maxPriorityFeePerGas"] = max_priority_fee_per_gas_wei
-            elif base_fee is not None:
-                priority = self.w3.to_wei(2, "gwei")
-                tx["maxPriorityFeePerGas"] = priority
-                tx["maxFeePerGas"] = int(base_fee * 2 + priority)
-            else:
-                tx["gasPrice"] = self.w3.eth.gas_price
-
-        built_tx = fn.build_transaction(tx)
-        signed = account.sign_transaction(built_tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-
-        receipt = self._wait_for_receipt(
-            tx_hash=tx_hash,
-            timeout_sec=wait_timeout_sec,
-            poll_sec=wait_poll_sec,
-        )
-        return TxResult(
-            tx_hash=tx_hash.hex(),
-            status=int(receipt.status),
-            block_number=int(receipt.blockNumber),
-            gas_used=int(receipt.gasUsed),
-        )
+        with spans.span("gas_price", fn_name):
+            tx: Dict[str, Any] = {
+                "from": account.address,
+                "value": value_wei,
+                "gas": gas_limit,
+                "chainId": self.fee_oracle.chain_id,
+            }
+            tx.update(self.fee_oracle.fee_fields(max_fee_per_gas_wei, max_priority_fee_per_gas_wei))
+
+        with self.nonce_manager.sender_lock(account.address):
+            # One retry after a nonce error: the allocator re-syncs from the chain first.
+            retries_left = 1
+            while True:
+                with spans.span("nonce", fn_name):
+                    nonce = self.nonce_manager.allocate(account.address)
+                signed = None
+                try:
+                    with spans.span("sign", fn_name):
+                        built_tx = fn.build_transaction({**tx, "nonce": nonce})
+                        signed = account.sign_transaction(built_tx)
+                    with spans.span("send", fn_name):
+                        tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+                except Exception as exc:
+                    if signed is None or not is_already_known(exc):
+                        self.nonce_manager.release(account.address, nonce)
+                        if not is_nonce_error(exc):
+                            raise
+                        self.nonce_manager.resync(account.address)
+                        if retries_left == 0:
+                            raise
+                        retries_left -= 1
+                        continue
+                    # Our own earlier broadcast of this signed tx reached the node: track it under its nonce.
+                    tx_hash = signed.hash
+                self.nonce_manager.mark_sent(account.address, nonce)
+                return PendingTx(
+                    tx_hash=bytes(tx_hash),
+                    sender=account.address,
+                    nonce=nonce,
+                    fn_name=fn_name,
+                    gas_limit=gas_limit,
+                    gas_key=learn_key,
+                )
+
+    def submit_transfer(self, account: LocalAccount, to: str, value_wei: int, gas_limit: int = 21_000) -> PendingTx:
+        spans = self.instrumentation
+        with spans.span("gas_price", "transfer"):
+            tx: Dict[str, Any] = {
+                "to": Web3.to_checksum_address(to),
+                "value": value_wei,
+                "gas": gas_limit,
+                "chainId": self.fee_oracle.chain_id,
+            }
+            tx.update(self.fee_oracle.fee_fields())
+        with self.nonce_manager.sender_lock(account.address):
+            with spans.span("nonce", "transfer"):
+                nonce = self.nonce_manager.allocate(account.address)
+            with spans.span("sign", "transfer"):
+                signed = account.sign_transaction({**tx, "nonce": nonce})
+            try:
+                with spans.span("send", "transfer"):
+                    tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            except Exception as exc:
+                if not is_already_known(exc):
+                    self.nonce_manager.release(account.address, nonce)
+                    if is_nonce_error(exc):
+                        self.nonce_manager.resync(account.address)
+                    raise
+                tx_hash = signed.hash
+            self.nonce_manager.mark_sent(account.address, nonce)
+        return PendingTx(tx_hash=bytes(tx_hash), sender=account.address, nonce=nonce, fn_name="transfer", gas_limit=gas_limit)
+
+    def wait_for_receipt(self, pending: PendingTx, timeout_sec: int = 120, poll_sec: float = 1.0) -> TxResult:
+        return self.wait_for_receipts([pending], timeout_sec=timeout_sec, poll_sec=poll_sec)[0]
 
-    def _next_nonce(self, address: str) -> int:
-        chain_nonce = self.w3.eth.get_transaction_count(address, block_identifier="pending")
-        cached = self._nonce_cache.get(address)
-        if cached is None:
-            next_nonce = chain_nonce
-        else:
-            next_nonce = max(chain_nonce, cached + 1)
-        self._nonce_cache[address] = next_nonce
-        return next_nonce
-
-    def _wait_for_receipt(self, tx_hash: bytes, timeout_sec: int, poll_sec: float) -> Any:
+    def wait_for_receipts(
+        self,
+        pending: Sequence[PendingTx],
+        timeout_sec: int = 120,
+        poll_sec: float = 1.0,
+    ) -> List[TxResult]:
+        """
+        Resolve many in-flight transactions with one shared polling loop.
+        Results are returned in the same order as `pending`.
+        """
+        label = pending[0].fn_name if len(pending) == 1 else "batch"
+        with self.instrumentation.span("receipt_wait", label, count=len(pending)):
+            if self.receipt_watcher is not None:
+                return self._wait_with_watcher(self.receipt_watcher, pending, timeout_sec)
+            return self._poll_receipts(pending, timeout_sec, poll_sec)
+
+    def _poll_receipts(self, pending: Sequence[PendingTx], timeout_sec: int, poll_sec: float) -> List[TxResult]:
+        results: Dict[bytes, TxResult] = {}
         start = time.time()
         while True:
-            try:
-                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            for item in pending:
+                if item.tx_hash in results:
+                    continue
+                try:
+                    receipt = self.w3.eth.get_transaction_receipt(item.tx_hash)
+                except TransactionNotFound:
+                    continue
                 if receipt is not None:
-                    return receipt
-            except TransactionNotFound:
-                pass
+                    results[item.tx_hash] = self._record_receipt(item, receipt)
+            if len(results) == len({item.tx_hash for item in pending}):
+                return [results[item.tx_hash] for item in pending]
             if time.time() - start > timeout_sec:
-                raise TimeoutError(f"Receipt timeout for tx: {tx_hash.hex()}")
+                missing = [item for item in pending if item.tx_hash not in results]
+                self._resync_senders(missing)
+                raise TimeoutError(f"Receipt timeout for tx: {', '.join(item.tx_hash.hex() for item in missing)}")
             time.sleep(poll_sec)
+
+    def _wait_with_watcher(self, watcher: ReceiptWatcher, pending: Sequence[PendingTx], timeout_sec: int) -> List[TxResult]:
+        try:
+            receipts = watcher.wait_many([item.tx_hash for item in pending], timeout_sec=timeout_sec)
+        except TimeoutError:
+            self._resync_senders(pending)
+            raise
+        results: Dict[bytes, TxResult] = {}
+        for item in pending:
+            if item.tx_hash not in results:
+                results[item.tx_hash] = self._record_receipt(item, receipts[item.tx_hash])
+        return [results[item.tx_hash] for item in pending]
+
+    def _record_receipt(self, item: PendingTx, receipt: Any) -> TxResult:
+        result = tx_result_from_receipt(item.tx_hash, receipt)
+        if item.gas_key is not None:
+            self.gas_cache.observe(item.gas_key, result.gas_used, item.gas_limit, result.status)
+        if self.read_cache is not None:
+            self.read_cache.observe_receipt(self.contract, result.status, result.logs)
+        return result
+
+    def _resync_senders(self, items: Sequence[PendingTx]) -> None:
+        # A dropped tx leaves a nonce gap; re-sync so later sends can fill it.
+        for sender in {item.sender for item in items}:
+            self.nonce_manager.resync(sender)
+
+
+def tx_result_from_receipt(tx_hash: bytes, receipt: Any) -> TxResult:
+    return TxResult(
+        tx_hash=tx_hash.hex(),
+        status=int(receipt.status),
+        block_number=int(receipt.blockNumber),
+        gas_used=int(receipt.gasUsed),
+        logs=tuple(receipt.get("logs") or ()),
+    )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+
+from web3 import Web3
+
+
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+)
+
+# The node already holds this exact signed tx (e.g. a broadcast retried after a dropped
+# connection). Not a nonce problem: re-signing with a new nonce would send a second copy.
+ALREADY_KNOWN_MARKERS = (
+    "already known",
+    "known transaction",
+)
+
+
+def is_nonce_error(exc: BaseException) -> bool:
+    message = str(exc).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+def is_already_known(exc: BaseException) -> bool:
+    message = str(exc).lower()
+    return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+
+class NonceManager:
+    """
+    Thread-safe per-address nonce allocator shared by every sender in the process.
+
+    The chain is only queried the first time an address is used and after
+    `resync`, which callers trigger on nonce errors or dropped transactions.
+
+    A nonce stays outstanding from `allocate` until the caller reports it
+    broadcast (`mark_sent`) or gives it back (`release`). The chain's pending
+    count cannot see outstanding nonces yet, so `resync`, `set` and `seed`
+    never move an address below them: otherwise one sender re-syncing could
+    hand out a nonce another thread is about to broadcast.
+
+    Senders hold `sender_lock(address)` from `allocate` until the broadcast
+    returns, so nonce N always reaches the node before N+1, even when a sync
+    and an async bridge send from the same account.
+    """
+
+    def __init__(self, w3: Web3 | None) -> None:
+        # w3 may be None when every address is filled through `seed`/`set` (async callers).
+        self.w3 = w3
+        self._lock = threading.Lock()
+        self._next: dict[str, int] = {}
+        self._outstanding: dict[str, set[int]] = {}
+        self._sender_locks: dict[str, threading.Lock] = {}
+
+    def sender_lock(self, address: str) -> threading.Lock:
+        key = address.lower()
+        with self._lock:
+            lock = self._sender_locks.get(key)
+            if lock is None:
+                lock = self._sender_locks[key] = threading.Lock()
+            return lock
+
+    def allocate(self, address: str) -> int:
+        key = address.lower()
+        with self._lock:
+            nonce = self._next.get(key)
+            if nonce is None:
+                nonce = max(self._fetch(address), self._floor(key))
+            self._next[key] = nonce + 1
+            self._outstanding.setdefault(key, set()).add(nonce)
+            return nonce
+
+    def mark_sent(self, address: str, nonce: int) -> None:
+        """Record that an allocated nonce reached the node, so the chain now accounts for it."""
+        with self._lock:
+            self._discard(address.lower(), nonce)
+
+    def release(self, address: str, nonce: int) -> None:
+        """
+        Give back a nonce whose tx was never broadcast. Only the most recent
+        allocation can be rolled back; anything older leaves a gap, so the
+        address is re-synced from the chain instead.
+        """
+        key = address.lower()
+        with self._lock:
+            self._discard(key, nonce)
+            if self._next.get(key) == nonce + 1:
+                self._next[key] = nonce
+            else:
+                self._next.pop(key, None)
+
+    def resync(self, address: str) -> int:
+        """
+        Re-read the pending nonce from the chain. After a dropped or replaced tx
+        the node reports the first missing nonce, so the next allocation fills the gap.
+        """
+        key = address.lower()
+        with self._lock:
+            nonce = max(self._fetch(address), self._floor(key))
+            self._next[key] = nonce
+            return nonce
+
+    def seed(self, address: str, nonce: int) -> None:
+        """Fill an address from an externally fetched chain nonce unless it is already tracked."""
+        key = address.lower()
+        with self._lock:
+            self._next.setdefault(key, max(nonce, self._floor(key)))
+
+    def set(self, address: str, nonce: int) -> None:
+        key = address.lower()
+        with self._lock:
+            self._next[key] = max(nonce, self._floor(key))
+
+    def peek(self, address: str) -> int | None:
+        with self._lock:
+            return self._next.get(address.lower())
+
+    def _floor(self, key: str) -> int:
+        outstanding = self._outstanding.get(key)
+        return max(outstanding) + 1 if outstanding else 0
+
+    def _discard(self, key: str, nonce: int) -> None:
+        outstanding = self._outstanding.get(key)
+        if outstanding is not None:
+            outstanding.discard(nonce)
+            if not outstanding:
+                del self._outstanding[key]
+
+    def _fetch(self, address: str) -> int:
+        if self.w3 is None:
+            raise RuntimeError(f"Nonce for {address} is not seeded and no Web3 client is available")
+        checksum = Web3.to_checksum_address(address)
+        return int(self.w3.eth.get_transaction_count(checksum, block_identifier="pending"))
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable, Iterable
+
+from web3 import Web3
+from web3.contract import Contract
+
+from event_log import event_topics
+from selection_cache import CacheStats, LRUCache
+
+
+# View functions that only change through an admin tx, keyed to the event that tx emits.
+CONSTANT_READS: dict[str, str] = {
+    "minRegistrationStakeWei": "MinStakeUpdated",
+    "platformFeeBps": "PlatformFeeUpdated",
+    "owner": "OwnershipTransferred",
+}
+
+# Agents cannot unregister, so a True answer never goes stale.
+STICKY_TRUE_READS = frozenset({"isRegistered"})
+
+
+class ReadCache:
+    """
+    Read-through cache for contract view calls, keyed by (function, args, block tag).
+
+    - reads at "latest" are pinned for `pin_blocks` blocks of the head reported
+      through `notify_block` (a `ReceiptWatcher` block listener), and for at most
+      `ttl_sec` when no block feed is attached
+    - reads at an explicit block number are immutable and kept until evicted
+    - `CONSTANT_READS` are kept until their update event is seen, in our own
+      receipts (`observe_receipt`) or in any block's receipts (`observe_block`,
+      fed by `ReceiptWatcher` on nodes with `eth_getBlockReceipts`). Admin txs
+      from other processes are not seen without that feed, so `constant_ttl_sec`
+      also bounds how long a constant can stay stale.
+    - any successful own write to the contract drops every pinned state read,
+      so a flow always reads its own writes
+    """
+
+    def __init__(
+        self,
+        pin_blocks: int = 1,
+        ttl_sec: float = 2.0,
+        constant_ttl_sec: float | None = 60.0,
+        maxsize: int = 4096,
+    ) -> None:
+        if pin_blocks <= 0:
+            raise ValueError("pin_blocks must be positive")
+        self.pin_blocks = pin_blocks
+        self.head_block: int | None = None
+        self.state: LRUCache[Hashable, Any] = LRUCache(maxsize, ttl_sec)
+        self.historical: LRUCache[Hashable, Any] = LRUCache(maxsize, None)
+        self.constants: LRUCache[Hashable, Any] = LRUCache(max(len(CONSTANT_READS), 16), constant_ttl_sec)
+        self._lock = threading.Lock()
+        self._state_generation = 0
+        self._constant_generation: dict[str, int] = {fn: 0 for fn in CONSTANT_READS}
+        self._sticky: set[tuple[str, Hashable]] = set()
+        self._config_topics: dict[str, dict[bytes, str]] = {}
+
+    def get_or_load(self, fn_name: str, args: tuple[Any, ...], block_tag: Any, load: Callable[[], Any]) -> Any:
+        try:
+            hash(args)
+        except TypeError:
+            return load()
+
+        if fn_name in STICKY_TRUE_READS:
+            with self._lock:
+                if (fn_name, args) in self._sticky:
+                    return True
+
+        if isinstance(block_tag, int):
+            value = self.historical.get_or_load((fn_name, args, block_tag), load)
+        elif fn_name in CONSTANT_READS and block_tag == "latest":
+            with self._lock:
+                generation = self._constant_generation[fn_name]
+            value = self.constants.get_or_load((fn_name, args, generation), load)
+        else:
+            with self._lock:
+                epoch = None if self.head_block is None else self.head_block // self.pin_blocks
+                key = (fn_name, args, str(block_tag), epoch, self._state_generation)
+            value = self.state.get_or_load(key, load)
+
+        if fn_name in STICKY_TRUE_READS and value is True:
+            with self._lock:
+                self._sticky.add((fn_name, args))
+        return value
+
+    def notify_block(self, block_number: int) -> None:
+        with self._lock:
+            if self.head_block is None or block_number > self.head_block:
+                self.head_block = block_number
+
+    def observe_receipt(self, contract: Contract, status: int, logs: Iterable[Any]) -> None:
+        """Invalidate after one of our own transactions; only logs from `contract` matter."""
+        if status != 1:
+            return
+        if self._observe_logs(contract, logs):
+            self.invalidate_state()
+
+    def observe_block(self, contract: Contract, receipts: Iterable[Any]) -> None:
+        """
+        Invalidate constants from every tx in a new block, whoever sent it. Pinned state
+        needs nothing here: the head moving on already retires it.
+        """
+        for receipt in receipts:
+            if receipt.get("status", 1) == 1:
+                self._observe_logs(contract, receipt.get("logs", ()))
+
+    def invalidate_event(self, event_name: str) -> None:
+        with self._lock:
+            for fn_name, trigger in CONSTANT_READS.items():
+                if trigger == event_name:
+                    self._constant_generation[fn_name] += 1
+
+    def invalidate_state(self) -> None:
+        # Bumping the generation makes every pinned key unreachable; LRU eviction reclaims them.
+        with self._lock:
+            self._state_generation += 1
+
+    def invalidate(self) -> None:
+        self.state.invalidate()
+        self.historical.invalidate()
+        self.constants.invalidate()
+        with self._lock:
+            self._sticky.clear()
+
+    def stats(self) -> dict[str, CacheStats]:
+        return {
+            "state": self.state.stats(),
+            "historical": self.historical.stats(),
+            "constants": self.constants.stats(),
+        }
+
+    def _observe_logs(self, contract: Contract, logs: Iterable[Any]) -> bool:
+        """Invalidates constants named by `contract`'s config events; True if any log came from it."""
+        touched = False
+        topics = self._topics_for(contract)
+        for log in logs:
+            if Web3.to_checksum_address(log["address"]) != contract.address:
+                continue
+            touched = True
+            name = topics.get(bytes(log["topics"][0])) if log["topics"] else None
+            if name is not None:
+                self.invalidate_event(name)
+        return touched
+
+    def _topics_for(self, contract: Contract) -> dict[bytes, str]:
+        key = contract.address
+        topics = self._config_topics.get(key)
+        if topics is None:
+            names = {name for name in CONSTANT_READS.values() if _has_event(contract, name)}
+            topics = self._config_topics[key] = event_topics(contract, names)
+        return topics
+
+
+def _has_event(contract: Contract, name: str) -> bool:
+    return any(entry.get("type") == "event" and entry.get("name") == name for entry in contract.abi)
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable
+
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import TransactionNotFound
+
+
+BlockListener = Callable[[int], None]
+# Called with (block number, every receipt in the block).
+ReceiptsListener = Callable[[int, list[Any]], None]
+
+
+def _receipt_hash(receipt: Any) -> bytes:
+    return bytes(receipt["transactionHash"])
+
+
+def _is_unsupported(exc: Exception) -> bool:
+    # Nodes without eth_getBlockReceipts answer -32601 / "method ... not found|does not exist|not supported".
+    message = str(exc).lower()
+    if "-32601" in message:
+        return True
+    return "method" in message and any(m in message for m in ("not found", "does not exist", "not supported", "not available"))
+
+
+class ReceiptWatcher:
+    """
+    One background thread that follows the chain head and resolves every
+    waiting transaction from the receipts of each new block.
+
+    The cost per poll is a single `eth_blockNumber` no matter how many txs are
+    in flight; each new block then costs one `eth_getBlockReceipts` (or, on
+    nodes without it, `eth_getBlockByNumber` plus receipts for watched txs only).
+    Block listeners (e.g. `FeeOracle.notify_block`) are called once per new head.
+    Receipts listeners also get the block's receipts, including other senders'
+    txs. They are only called while `eth_getBlockReceipts` is available, since
+    the fallback fetches watched receipts only.
+    """
+
+    def __init__(self, w3: Web3, poll_sec: float = 0.2, use_block_receipts: bool = True) -> None:
+        self.w3 = w3
+        self.poll_sec = poll_sec
+        self.use_block_receipts = use_block_receipts
+        self.last_block = -1
+        self.last_error: Exception | None = None
+        self._lock = threading.Lock()
+        self._waiting: dict[bytes, Future] = {}
+        # Hashes registered since the last scan; they may already be mined in a block we scanned earlier.
+        self._fresh: set[bytes] = set()
+        self._listeners: list[BlockListener] = []
+        self._receipts_listeners: list[ReceiptsListener] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_block_listener(self, listener: BlockListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def add_receipts_listener(self, listener: ReceiptsListener) -> None:
+        with self._lock:
+            self._receipts_listeners.append(listener)
+
+    def start(self) -> "ReceiptWatcher":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        if self.last_block < 0:
+            self.last_block = int(self.w3.eth.block_number)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="receipt-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout_sec: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout_sec)
+            self._thread = None
+
+    def __enter__(self) -> "ReceiptWatcher":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def watch(self, tx_hash: bytes) -> Future:
+        key = bytes(tx_hash)
+        with self._lock:
+            future = self._waiting.get(key)
+            if future is None:
+                future = self._waiting[key] = Future()
+                self._fresh.add(key)
+        return future
+
+    def wait(self, tx_hash: bytes, timeout_sec: float = 120) -> Any:
+        future = self.watch(tx_hash)
+        try:
+            return future.result(timeout=timeout_sec)
+        except FutureTimeoutError:
+            self._forget(bytes(tx_hash), future)
+            raise TimeoutError(f"Receipt timeout for tx: {bytes(tx_hash).hex()}") from None
+
+    def wait_many(self, tx_hashes: Iterable[bytes], timeout_sec: float = 120) -> dict[bytes, Any]:
+        """Wait for all hashes against one shared deadline; raises TimeoutError listing the missing ones."""
+        futures = {bytes(h): self.watch(h) for h in tx_hashes}
+        done: dict[bytes, Any] = {}
+        deadline = time.monotonic() + timeout_sec
+        for key, future in futures.items():
+            try:
+                done[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                pass
+        missing = [key for key in futures if key not in done]
+        if missing:
+            for key in missing:
+                self._forget(key, futures[key])
+            raise TimeoutError(f"Receipt timeout for tx: {', '.join(key.hex() for key in missing)}")
+        return done
+
+    def poll_once(self) -> None:
+        head = int(self.w3.eth.block_number)
+        for number in range(self.last_block + 1, head + 1):
+            receipts = self._block_receipts(number)
+            self._resolve(receipts)
+            if self.use_block_receipts:
+                with self._lock:
+                    receipts_listeners = list(self._receipts_listeners)
+                for receipts_listener in receipts_listeners:
+                    receipts_listener(number, receipts)
+            self.last_block = number
+            for listener in self._snapshot_listeners():
+                listener(number)
+        with self._lock:
+            fresh, self._fresh = self._fresh, set()
+        self._resolve(self._lookup(fresh))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+                self.last_error = None
+            except Exception as exc:
+                # Transient RPC failure: keep the waiters and retry on the next tick.
+                self.last_error = exc
+            self._stop.wait(self.poll_sec)
+
+    def _block_receipts(self, number: int) -> list[Any]:
+        if self.use_block_receipts:
+            try:
+                return list(self.w3.eth.get_block_receipts(number) or [])
+            except Exception as exc:
+                if not (isinstance(exc, (AttributeError, NotImplementedError)) or _is_unsupported(exc)):
+                    raise
+                self.use_block_receipts = False
+        block = self.w3.eth.get_block(number)
+        with self._lock:
+            wanted = [bytes(h) for h in block.get("transactions", []) if bytes(h) in self._waiting]
+        return [self.w3.eth.get_transaction_receipt(h) for h in wanted]
+
+    def _lookup(self, tx_hashes: Iterable[bytes]) -> list[Any]:
+        receipts = []
+        for tx_hash in tx_hashes:
+            with self._lock:
+                if tx_hash not in self._waiting:
+                    continue
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            if receipt is not None:
+                receipts.append(receipt)
+        return receipts
+
+    def _resolve(self, receipts: Iterable[Any]) -> None:
+        for receipt in receipts:
+            with self._lock:
+                future = self._waiting.pop(_receipt_hash(receipt), None)
+            if future is not None and not future.done():
+                future.set_result(receipt)
+
+    def _forget(self, key: bytes, future: Future) -> None:
+        with self._lock:
+            if self._waiting.get(key) is future:
+                del self._waiting[key]
+            self._fresh.discard(key)
+
+    def _snapshot_listeners(self) -> list[BlockListener]:
+        with self._lock:
+            return list(self._listeners)
+
+
+class AsyncReceiptWatcher:
+    """`ReceiptWatcher` for `AsyncWeb3`: one polling task on the running event loop."""
+
+    def __init__(self, w3: AsyncWeb3, poll_sec: float = 0.2, use_block_receipts: bool = True) -> None:
+        self.w3 = w3
+        self.poll_sec = poll_sec
+        self.use_block_receipts = use_block_receipts
+        self.last_block = -1
+        self.last_error: Exception | None = None
+        self._waiting: dict[bytes, asyncio.Future] = {}
+        self._fresh: set[bytes] = set()
+        self._listeners: list[BlockListener] = []
+        self._task: asyncio.Task | None = None
+
+    def add_block_listener(self, listener: BlockListener) -> None:
+        self._listeners.append(listener)
+
+    async def start(self) -> "AsyncReceiptWatcher":
+        if self._task is not None and not self._task.done():
+            return self
+        if self.last_block < 0:
+            self.last_block = int(await self.w3.eth.block_number)
+        self._task = asyncio.create_task(self._run(), name="receipt-watcher")
+        return self
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def __aenter__(self) -> "AsyncReceiptWatcher":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    def watch(self, tx_hash: bytes) -> asyncio.Future:
+        key = bytes(tx_hash)
+        future = self._waiting.get(key)
+        if future is None:
+            future = self._waiting[key] = asyncio.get_running_loop().create_future()
+            self._fresh.add(key)
+        return future
+
+    async def wait(self, tx_hash: bytes, timeout_sec: float = 120) -> Any:
+        key = bytes(tx_hash)
+        future = self.watch(key)
+        try:
+            # shield: a timed-out waiter must not cancel the future other waiters share.
+            return await asyncio.wait_for(asyncio.shield(future), timeout_sec)
+        except asyncio.TimeoutError:
+            if self._waiting.get(key) is future:
+                del self._waiting[key]
+            self._fresh.discard(key)
+            raise TimeoutError(f"Receipt timeout for tx: {key.hex()}") from None
+
+    async def poll_once(self) -> None:
+        head = int(await self.w3.eth.block_number)
+        for number in range(self.last_block + 1, head + 1):
+            self._resolve(await self._block_receipts(number))
+            self.last_block = number
+            for listener in list(self._listeners):
+                listener(number)
+        fresh, self._fresh = self._fresh, set()
+        for tx_hash in fresh:
+            if tx_hash not in self._waiting:
+                continue
+            try:
+                receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            if receipt is not None:
+                self._resolve([receipt])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.last_error = exc
+            await asyncio.sleep(self.poll_sec)
+
+    async def _block_receipts(self, number: int) -> list[Any]:
+        if self.use_block_receipts:
+            try:
+                return list(await self.w3.eth.get_block_receipts(number) or [])
+            except Exception as exc:
+                if not (isinstance(exc, (AttributeError, NotImplementedError)) or _is_unsupported(exc)):
+                    raise
+                self.use_block_receipts = False
+        block = await self.w3.eth.get_block(number)
+        wanted = [bytes(h) for h in block.get("transactions", []) if bytes(h) in self._waiting]
+        return [await self.w3.eth.get_transaction_receipt(h) for h in wanted]
+
+    def _resolve(self, receipts: Iterable[Any]) -> None:
+        for receipt in receipts:
+            future = self._waiting.pop(_receipt_hash(receipt), None)
+            if future is not None and not future.done():
+                future.set_result(receipt)
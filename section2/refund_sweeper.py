@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from web3.exceptions import Web3RPCError
+
+from agent_wallet_manager import AgentWalletManager
+from job_store import STATUS_OPEN, STATUS_TAKEN, JobStore
+from monad_bridge import MonadBridge, TxResult
+
+
+JOB_CREATED_AT = 3
+JOB_TIMEOUT_SECONDS = 5
+JOB_TIMEOUT_AT = 6
+JOB_STATUS = 7
+
+
+@dataclass
+class TrackedJob:
+    job_id: int
+    status: int
+    deadline: int | None = None
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    job_id: int
+    fn_name: str
+    tx: TxResult | None = None
+    # Why no receipt was collected (send or receipt wait failed); the job is retried.
+    error: str = ""
+
+    def describe(self) -> str:
+        if self.tx is None:
+            return f"{self.fn_name} job={self.job_id} failed: {self.error}"
+        return f"{self.fn_name} job={self.job_id} status={self.tx.status} tx={self.tx.tx_hash}"
+
+
+class RefundSweeper:
+    """
+    Frees escrow of the employer's timed-out jobs.
+
+    Job state comes from a `JobStore`, whose one chunked log scan per round
+    covers every job no matter how many are tracked. The employer's jobs
+    enter a deadline-ordered heap when created and move when accepted (new
+    deadline = timeoutAt). Submitted, paid, refunded and cancelled jobs
+    leave it. Each state change costs one batched `getJob` for the timeout
+    fields; nothing ever scans job ids up to `nextJobId`.
+
+    `sweep` pops every expired entry and sends `refundAfterTimeout` (Taken) or
+    `cancelOpenJob` (Open, after `open_grace_sec` without a worker) pipelined,
+    `batch_size` at a time. Work per sweep is proportional to the jobs that
+    expire, not to the jobs tracked. A job stays tracked until its tx succeeds;
+    one that reverts (e.g. accepted in the same block as the cancel) or fails
+    to send is re-read and rescheduled no earlier than `retry_sec` later.
+    Send and receipt failures come back as `SweepResult`s with `error` set;
+    `run` keeps the last failed round's exception in `last_error`.
+    """
+
+    def __init__(
+        self,
+        bridge: MonadBridge,
+        employer: LocalAccount,
+        store: JobStore,
+        start_block: int = 0,
+        open_grace_sec: int | None = None,
+        batch_size: int = 100,
+        retry_sec: int = 30,
+    ) -> None:
+        self.bridge = bridge
+        self.employer = employer
+        self.store = store
+        # None: an open job is cancelled once its own timeoutSeconds have passed since creation.
+        self.open_grace_sec = open_grace_sec
+        self.batch_size = batch_size
+        self.retry_sec = retry_sec
+        self.last_block = start_block - 1
+        self.last_error: Exception | None = None
+        self._lock = threading.Lock()
+        self._jobs: dict[int, TrackedJob] = {}
+        self._heap: list[tuple[int, int]] = []
+
+    def tracked(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def next_deadline(self) -> int | None:
+        with self._lock:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    def sync(self, to_block: int | None = None) -> int:
+        """Catch the job store up and re-plan the employer's jobs that changed. Returns jobs re-planned."""
+        self.store.sync(to_block)
+        records = self.store.changed_since(self.last_block, employer=self.employer.address)
+
+        changed: list[int] = []
+        with self._lock:
+            for record in records:
+                if record.status in (STATUS_OPEN, STATUS_TAKEN):
+                    tracked = self._jobs.get(record.job_id)
+                    if tracked is None:
+                        self._jobs[record.job_id] = TrackedJob(job_id=record.job_id, status=record.status)
+                        changed.append(record.job_id)
+                    elif tracked.status != record.status:
+                        tracked.status = record.status
+                        changed.append(record.job_id)
+                else:
+                    # Submitted / Resolved / Cancelled: nothing left to refund.
+                    self._jobs.pop(record.job_id, None)
+            self.last_block = self.store.last_block
+
+        for job_id, job in zip(changed, self._load_jobs(changed)):
+            self._schedule(job_id, job)
+        return len(changed)
+
+    def sweep(self, now_ts: int | None = None) -> list[SweepResult]:
+        if now_ts is None:
+            now_ts = int(self.bridge.w3.eth.get_block("latest")["timestamp"])
+        due = self._pop_due(now_ts)
+        results: list[SweepResult] = []
+        retry: list[int] = []
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start : start + self.batch_size]
+            sent = []
+            for job_id, status in batch:
+                fn_name = "refundAfterTimeout" if status == STATUS_TAKEN else "cancelOpenJob"
+                try:
+                    sent.append((job_id, fn_name, self.bridge.submit_contract_tx(self.employer, fn_name, job_id)))
+                except Exception as exc:
+                    results.append(SweepResult(job_id=job_id, fn_name=fn_name, error=_describe_error(exc)))
+                    retry.append(job_id)
+            if not sent:
+                continue
+            try:
+                txs = self.bridge.wait_for_receipts([pending for _, _, pending in sent])
+            except Exception as exc:
+                error = f"receipt wait failed: {_describe_error(exc)}"
+                results.extend(SweepResult(job_id=job_id, fn_name=fn_name, error=error) for job_id, fn_name, _ in sent)
+                retry.extend(job_id for job_id, _, _ in sent)
+                continue
+            for (job_id, fn_name, _), tx in zip(sent, txs):
+                results.append(SweepResult(job_id=job_id, fn_name=fn_name, tx=tx))
+                if tx.status == 1:
+                    with self._lock:
+                        self._jobs.pop(job_id, None)
+                else:
+                    retry.append(job_id)
+        if retry:
+            self._retry(retry, now_ts + self.retry_sec)
+        return results
+
+    def run(
+        self,
+        poll_sec: float = 1.0,
+        stop: threading.Event | None = None,
+        on_result: Callable[[SweepResult], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.sync()
+                results = self.sweep()
+                self.last_error = None
+            except Exception as exc:
+                # RPC hiccups must not kill the daemon; tracked jobs are kept and retried next round.
+                self.last_error = exc
+                if on_error is not None:
+                    on_error(exc)
+            else:
+                if on_result is not None:
+                    for result in results:
+                        on_result(result)
+            stop.wait(poll_sec)
+
+    def _retry(self, job_ids: Sequence[int], not_before: int) -> None:
+        # Requeue first, so the jobs come back even if the getJob re-read below fails.
+        with self._lock:
+            for job_id in job_ids:
+                tracked = self._jobs.get(job_id)
+                if tracked is not None:
+                    tracked.deadline = not_before
+                    heapq.heappush(self._heap, (not_before, job_id))
+        ids = sorted(set(job_ids))
+        for job_id, job in zip(ids, self._load_jobs(ids)):
+            self._schedule(job_id, job, not_before)
+
+    def _schedule(self, job_id: int, job: Sequence[Any], not_before: int = 0) -> None:
+        status = int(job[JOB_STATUS])
+        with self._lock:
+            tracked = self._jobs.get(job_id)
+            if tracked is None:
+                return
+            tracked.status = status
+            if status == STATUS_TAKEN:
+                # The contract refunds only once block.timestamp > timeoutAt.
+                tracked.deadline = max(int(job[JOB_TIMEOUT_AT]) + 1, not_before)
+            elif status == STATUS_OPEN:
+                grace = self.open_grace_sec if self.open_grace_sec is not None else int(job[JOB_TIMEOUT_SECONDS])
+                tracked.deadline = max(int(job[JOB_CREATED_AT]) + grace, not_before)
+            else:
+                del self._jobs[job_id]
+                return
+            heapq.heappush(self._heap, (tracked.deadline, job_id))
+
+    def _pop_due(self, now_ts: int) -> list[tuple[int, int]]:
+        """(job id, status) of expired jobs. They stay tracked, marked in flight (no deadline)."""
+        due: list[tuple[int, int]] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now_ts:
+                deadline, job_id = heapq.heappop(self._heap)
+                tracked = self._jobs.get(job_id)
+                # Entries are superseded instead of removed; skip those that no longer match.
+                if tracked is None or tracked.deadline != deadline:
+                    continue
+                tracked.deadline = None
+                due.append((job_id, tracked.status))
+        return due
+
+    def _drop_stale_head(self) -> None:
+        while self._heap:
+            deadline, job_id = self._heap[0]
+            tracked = self._jobs.get(job_id)
+            if tracked is not None and tracked.deadline == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def _load_jobs(self, job_ids: Sequence[int]) -> list[Any]:
+        jobs: list[Any] = []
+        for start in range(0, len(job_ids), self.batch_size):
+            chunk = job_ids[start : start + self.batch_size]
+            try:
+                with self.bridge.w3.batch_requests() as batch:
+                    for job_id in chunk:
+                        batch.add(self.bridge.contract.functions.getJob(job_id))
+                    jobs.extend(batch.execute())
+            except (AttributeError, NotImplementedError, ValueError, Web3RPCError):
+                jobs.extend(self.bridge.read("getJob", job_id) for job_id in chunk)
+        return jobs
+
+
+def _describe_error(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refund or cancel the master account's expired V2 jobs")
+    parser.add_argument("--deployment", default="deployments/monadTestnet.json")
+    parser.add_argument("--db", default="section2/jobs.sqlite", help="job store to keep in sync (see job_store.py)")
+    parser.add_argument("--start-block", type=int, default=0)
+    parser.add_argument("--open-grace-sec", type=int, default=None, help="cancel unaccepted jobs after this long")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--poll-sec", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="sync and sweep once, then exit")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manager = AgentWalletManager.from_env()
+    manager.assert_rpc_connection()
+    bridge = MonadBridge.from_deployment_file(manager.w3, args.deployment)
+    sweeper = RefundSweeper(
+        bridge,
+        Account.from_key(manager.master.private_key),
+        JobStore(bridge, db_path=args.db, start_block=args.start_block),
+        start_block=args.start_block,
+        open_grace_sec=args.open_grace_sec,
+        batch_size=args.batch_size,
+    )
+
+    started = time.time()
+    sweeper.sync()
+    print(
+        f"Tracked {sweeper.tracked()} jobs up to block {sweeper.last_block} "
+        f"in {time.time() - started:.2f}s"
+    )
+    if args.once:
+        for result in sweeper.sweep():
+            print(result.describe())
+        return
+    sweeper.run(
+        poll_sec=args.poll_sec,
+        on_result=lambda result: print(result.describe()),
+        on_error=lambda exc: print(f"Sweep round failed: {_describe_error(exc)}"),
+    )
+
+
+if __name__ == "__main__":
+    main()
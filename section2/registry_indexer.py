@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from agent_wallet_manager import AgentWalletManager
+from budget_index import BudgetIndex
+from candidate_loader import decode_category, load_profiles, profile_to_candidate
+from event_log import fetch_events
+from monad_bridge import MonadBridge
+from selection_engine import Candidate, SelectionResult, select_best, selection_reason
+
+
+REGISTRY_EVENTS = ("AgentRegisteredV2", "ReputationUpdated", "FeedbackApplied")
+# Starting score set by registerAgentV2.
+REGISTRATION_REPUTATION = 50
+
+
+class RegistryIndexer:
+    """
+    Local per-category agent index rebuilt from contract events.
+
+    `sync` replays `AgentRegisteredV2` / `ReputationUpdated` / `FeedbackApplied`
+    from the last checkpointed block and `follow` keeps doing so for new blocks.
+    `version` increases on every applied change so callers can key caches on it.
+    Each category also keeps a `BudgetIndex` for logarithmic budget queries;
+    `max_k` is the ranking length it answers without touching the whole category.
+    """
+
+    def __init__(
+        self,
+        bridge: MonadBridge,
+        checkpoint_file: str | Path | None = "section2/registry_index.json",
+        start_block: int = 0,
+        chunk_size: int = 2_000,
+        confirmations: int = 0,
+        max_k: int = 10,
+    ) -> None:
+        self.bridge = bridge
+        self.checkpoint_file = Path(checkpoint_file) if checkpoint_file else None
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.confirmations = confirmations
+        self.max_k = max_k
+        self.last_block = start_block - 1
+        self.version = 0
+        self._lock = threading.RLock()
+        self._agents: dict[str, Candidate] = {}
+        self._by_category: dict[str, dict[str, Candidate]] = {}
+        self._budget_indexes: dict[str, BudgetIndex] = {}
+        self.restored = self.load_checkpoint()
+
+    def candidates(self, category: str) -> list[Candidate]:
+        with self._lock:
+            return list(self._by_category.get(category, {}).values())
+
+    def profile(self, address: str) -> Candidate | None:
+        with self._lock:
+            return self._agents.get(address.lower())
+
+    def top_agents(self, category: str, budget_wei: int, k: int = 5) -> list[Candidate]:
+        with self._lock:
+            index = self._budget_indexes.get(category)
+            return index.top_k_under(budget_wei, k) if index is not None else []
+
+    def select_best(self, category: str, budget_wei: int, limit: int | None = 1) -> SelectionResult:
+        if limit is None:
+            return select_best(self.candidates(category), category, budget_wei)
+        ranked = self.top_agents(category, budget_wei, limit)
+        if not ranked:
+            raise ValueError(f"No eligible agent for category={category} and budgetWei={budget_wei}")
+        return SelectionResult(
+            category=category,
+            best=ranked[0],
+            reason=selection_reason(ranked[0], budget_wei),
+            candidates=ranked,
+        )
+
+    def sync(self, to_block: int | None = None) -> int:
+        """Apply all events up to `to_block` (default: head minus confirmations). Returns events applied."""
+        if to_block is None:
+            to_block = int(self.bridge.w3.eth.block_number) - self.confirmations
+        from_block = self.last_block + 1
+        if to_block < from_block:
+            return 0
+
+        events = fetch_events(
+            self.bridge.w3,
+            self.bridge.contract,
+            REGISTRY_EVENTS,
+            from_block,
+            to_block,
+            chunk_size=self.chunk_size,
+        )
+        # Seeded agents carry their reputation only in contract state, so new
+        # registrations are completed with one batched profile read.
+        registered = [event["args"]["agent"] for event in events if event["event"] == "AgentRegisteredV2"]
+        profiles = dict(zip(registered, load_profiles(self.bridge, registered))) if registered else {}
+
+        with self._lock:
+            for event in events:
+                self._apply(event, profiles)
+            self.last_block = to_block
+            if events:
+                self.version += 1
+        self.save_checkpoint()
+        return len(events)
+
+    def follow(self, poll_sec: float = 1.0, stop: threading.Event | None = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.sync()
+            stop.wait(poll_sec)
+
+    def load_checkpoint(self) -> bool:
+        """Restore the checkpoint; False when there is none for this contract."""
+        if self.checkpoint_file is None or not self.checkpoint_file.exists():
+            return False
+        payload = json.loads(self.checkpoint_file.read_text(encoding="utf-8"))
+        if payload.get("contract") != self.bridge.contract.address:
+            return False
+        with self._lock:
+            self.last_block = max(self.last_block, int(payload.get("last_block", self.last_block)))
+            for raw in payload.get("agents", []):
+                self._put(
+                    Candidate(
+                        address=raw["address"],
+                        category=raw["category"],
+                        base_fee_wei=int(raw["base_fee_wei"]),
+                        reputation_score=int(raw["reputation"]),
+                    )
+                )
+            self.version += 1
+        return True
+
+    def save_checkpoint(self) -> None:
+        if self.checkpoint_file is None:
+            return
+        with self._lock:
+            payload = {
+                "contract": self.bridge.contract.address,
+                "last_block": self.last_block,
+                "agents": [
+                    {
+                        "address": c.address,
+                        "category": c.category,
+                        "base_fee_wei": c.base_fee_wei,
+                        "reputation": c.reputation_score,
+                    }
+                    for c in self._agents.values()
+                ],
+            }
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_file.with_suffix(self.checkpoint_file.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self.checkpoint_file)
+
+    def _apply(self, event: Any, profiles: dict[str, Any]) -> None:
+        args = event["args"]
+        if event["event"] == "AgentRegisteredV2":
+            address = args["agent"]
+            candidate = profile_to_candidate(address, profiles[address]) if address in profiles else None
+            if candidate is None:
+                candidate = Candidate(
+                    address=address,
+                    category=decode_category(args["category"]),
+                    base_fee_wei=int(args["baseFeeWei"]),
+                    reputation_score=REGISTRATION_REPUTATION,
+                )
+            self._put(candidate)
+        elif event["event"] == "ReputationUpdated":
+            self._set_reputation(args["agent"], int(args["newScore"]))
+        elif event["event"] == "FeedbackApplied":
+            self._set_reputation(args["worker"], int(args["newReputation"]))
+
+    def _set_reputation(self, address: str, score: int) -> None:
+        current = self._agents.get(address.lower())
+        if current is not None and current.reputation_score != score:
+            self._put(replace(current, reputation_score=score))
+
+    def _put(self, candidate: Candidate) -> None:
+        key = candidate.address.lower()
+        previous = self._agents.get(key)
+        if previous is not None and previous.category != candidate.category:
+            self._by_category.get(previous.category, {}).pop(key, None)
+            self._budget_indexes[previous.category].remove(key)
+        self._agents[key] = candidate
+        self._by_category.setdefault(candidate.category, {})[key] = candidate
+        index = self._budget_indexes.get(candidate.category)
+        if index is None:
+            index = self._budget_indexes[candidate.category] = BudgetIndex(max_k=self.max_k)
+        index.upsert(candidate)
+
+
+def open_registry_index(bridge: MonadBridge, checkpoint_file: str | Path, max_k: int = 10) -> RegistryIndexer | None:
+    """
+    The checkpointed index caught up to the chain head, or None when no checkpoint
+    exists for this contract yet (a full replay is left to the indexer CLI).
+    """
+    indexer = RegistryIndexer(bridge, checkpoint_file=checkpoint_file, max_k=max_k)
+    if not indexer.restored:
+        return None
+    indexer.sync()
+    return indexer
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build and follow the local V2 agent registry index")
+    parser.add_argument("--deployment", default="deployments/monadTestnet.json")
+    parser.add_argument("--checkpoint", default="section2/registry_index.json")
+    parser.add_argument("--start-block", type=int, default=0)
+    parser.add_argument("--follow", action="store_true")
+    parser.add_argument("--poll-sec", type=float, default=1.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manager = AgentWalletManager.from_env()
+    manager.assert_rpc_connection()
+    bridge = MonadBridge.from_deployment_file(manager.w3, args.deployment)
+    indexer = RegistryIndexer(bridge, checkpoint_file=args.checkpoint, start_block=args.start_block)
+
+    started = time.time()
+    applied = indexer.sync()
+    print(f"Indexed {applied} events up to block {indexer.last_block} in {time.time() - started:.2f}s")
+    if args.follow:
+        indexer.follow(poll_sec=args.poll_sec)
+
+
+if __name__ == "__main__":
+    main()
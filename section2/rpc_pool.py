@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import HTTPProvider
+from web3.providers import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+
+RATE_LIMIT_CODES = (-32005, 429)
+
+# Sends that must not reach two nodes. They fail over only on a connection error or a
+# rate-limit reply, and any other failure (timeout, 5xx) is raised. All other methods fail
+# over on any retryable error. A connection error can still come after the node read the
+# request ("Connection aborted"), so a raw tx may be broadcast twice. The signed bytes and
+# hash are identical, and the bridges treat the node's "already known" reply as a
+# successful send (`nonce_manager.is_already_known`).
+NON_IDEMPOTENT_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+
+def split_rpc_urls(raw: str) -> list[str]:
+    return [url.strip() for url in (raw or "").split(",") if url.strip()]
+
+
+def make_session(pool_size: int = 32) -> requests.Session:
+    """Keep-alive session with `pool_size` pooled connections and no urllib3-level retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class RateLimitedError(Exception):
+    pass
+
+
+@dataclass
+class EndpointHealth:
+    url: str
+    ewma_latency_sec: float = 0.1
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    last_error: str = field(default="", repr=False)
+
+    def score(self) -> float:
+        # Lower is better: observed latency, inflated by recent failures.
+        return self.ewma_latency_sec * (1 + self.consecutive_failures)
+
+
+class FailoverHTTPProvider(JSONBaseProvider):
+    """
+    HTTP provider over several RPC URLs.
+
+    Every request goes to the healthy endpoint with the lowest EWMA latency.
+    Connection errors, timeouts, HTTP 5xx and rate limits (HTTP 429 / JSON-RPC
+    -32005) put the endpoint into an exponentially growing cooldown and the
+    request moves to the next endpoint; when every endpoint is cooling down the
+    call sleeps until the first one is available again. Each endpoint keeps its
+    own pooled keep-alive `requests.Session`.
+
+    `eth_sendRawTransaction` is only re-sent elsewhere after a connection error
+    or a rate-limit reply (see `NON_IDEMPOTENT_METHODS`), so a slow node never
+    causes a duplicate broadcast; a dropped connection can.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        pool_size: int = 32,
+        timeout_sec: float = 10.0,
+        max_attempts: int | None = None,
+        ewma_alpha: float = 0.2,
+        base_cooldown_sec: float = 0.5,
+        max_cooldown_sec: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__()
+        if not urls:
+            raise ValueError("at least one RPC URL is required")
+        self.urls = list(urls)
+        self.timeout_sec = timeout_sec
+        self.max_attempts = max_attempts or max(3, 2 * len(self.urls))
+        self.ewma_alpha = ewma_alpha
+        self.base_cooldown_sec = base_cooldown_sec
+        self.max_cooldown_sec = max_cooldown_sec
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tiebreak = itertools.count()
+        self.health = [EndpointHealth(url) for url in self.urls]
+        self._providers = [
+            HTTPProvider(
+                url,
+                request_kwargs={"timeout": timeout_sec},
+                session=make_session(pool_size),
+                exception_retry_configuration=None,
+            )
+            for url in self.urls
+        ]
+
+    def __str__(self) -> str:
+        return f"FailoverHTTPProvider({', '.join(self.urls)})"
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return self._call(method, lambda provider: provider.make_request(method, params))
+
+    def make_batch_request(self, requests_: List[Tuple[RPCEndpoint, Any]]) -> List[RPCResponse] | RPCResponse:
+        # A batch is read-only in practice here (profile loads, receipts); fail it over as a unit.
+        return self._call(RPCEndpoint("batch"), lambda provider: provider.make_batch_request(requests_))
+
+    def snapshot(self) -> list[EndpointHealth]:
+        with self._lock:
+            return [EndpointHealth(**vars(h)) for h in self.health]
+
+    def _call(self, method: str, send: Callable[[HTTPProvider], Any]) -> Any:
+        last_exc: Exception | None = None
+        for _ in range(self.max_attempts):
+            index = self._pick()
+            started = self._clock()
+            try:
+                response = send(self._providers[index])
+                if _is_rate_limited(response):
+                    raise RateLimitedError(f"{self.urls[index]} rate limited {method}")
+            except Exception as exc:
+                last_exc = exc
+                self._record_failure(index, exc)
+                # Sends move on only when the node refused/dropped the connection or rate limited them.
+                if method in NON_IDEMPOTENT_METHODS and not isinstance(exc, (requests.ConnectionError, RateLimitedError)):
+                    raise
+                if not _is_retryable(exc):
+                    raise
+                continue
+            self._record_success(index, self._clock() - started)
+            return response
+        assert last_exc is not None
+        raise last_exc
+
+    def _pick(self) -> int:
+        while True:
+            with self._lock:
+                now = self._clock()
+                ready = [i for i, h in enumerate(self.health) if h.cooldown_until <= now]
+                if ready:
+                    index = min(ready, key=lambda i: (self.health[i].score(), next(self._tiebreak)))
+                    self.health[index].requests += 1
+                    return index
+                wait = min(h.cooldown_until for h in self.health) - now
+            self._sleep(max(wait, 0.0))
+
+    def _record_success(self, index: int, latency_sec: float) -> None:
+        with self._lock:
+            h = self.health[index]
+            h.ewma_latency_sec += self.ewma_alpha * (latency_sec - h.ewma_latency_sec)
+            h.consecutive_failures = 0
+
+    def _record_failure(self, index: int, exc: Exception) -> None:
+        with self._lock:
+            h = self.health[index]
+            h.failures += 1
+            h.consecutive_failures += 1
+            h.last_error = f"{type(exc).__name__}: {exc}"
+            if isinstance(exc, RateLimitedError) or _http_status(exc) == 429:
+                h.rate_limited += 1
+            cooldown = min(self.max_cooldown_sec, self.base_cooldown_sec * 2 ** (h.consecutive_failures - 1))
+            h.cooldown_until = self._clock() + cooldown
+
+
+def _http_status(exc: Exception) -> int | None:
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (RateLimitedError, requests.ConnectionError, requests.Timeout)):
+        return True
+    status = _http_status(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _is_rate_limited(response: Any) -> bool:
+    items = response if isinstance(response, list) else [response]
+    for item in items:
+        error = item.get("error") if isinstance(item, dict) else None
+        if isinstance(error, dict) and error.get("code") in RATE_LIMIT_CODES:
+            return True
+    return False
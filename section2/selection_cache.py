@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+from selection_engine import Candidate, SelectionResult, infer_category, select_best, selection_reason
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe bounded cache with LRU eviction and optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl_sec: float | None = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_load(self, key: K, load: Callable[[], V]) -> V:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (self.ttl_sec is None or now - entry[0] < self.ttl_sec):
+                self._data.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        value = load()
+        self.put(key, value)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: K | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+
+@dataclass(frozen=True)
+class _CandidateSet:
+    candidates: tuple[Candidate, ...]
+    # Distinct fees, ascending. Budgets between two consecutive fees admit the
+    # same candidates, so the ladder position is an exact budget bucket.
+    fee_ladder: tuple[int, ...]
+    # Digest of the loaded candidates. Selections are keyed on it, so a bucket index
+    # computed against one ladder never matches a reload with a different ladder.
+    fingerprint: bytes
+
+
+class SelectionCache:
+    """
+    Memoizes `infer_category` (keyed on the normalized prompt), candidate loads
+    (keyed on category + registry version) and `select_best` results (keyed on
+    category + budget bucket + registry version + fingerprint of the loaded
+    candidate set, since the bucket is only meaningful for that set's fee ladder).
+
+    Pass `RegistryIndexer.version` (or any counter bumped on registration /
+    reputation changes) as `version`; stale entries then simply stop matching.
+    `invalidate()` drops everything at once.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl_sec: float | None = 30.0) -> None:
+        self.inference: LRUCache[tuple[str, str], str] = LRUCache(maxsize, ttl_sec)
+        self.candidate_sets: LRUCache[tuple[str, int], _CandidateSet] = LRUCache(maxsize, ttl_sec)
+        self.selections: LRUCache[tuple[str, int, bytes, int, int | None], SelectionResult | None] = LRUCache(
+            maxsize, ttl_sec
+        )
+
+    def infer_category(self, prompt: str, default: str = "RESEARCH") -> str:
+        normalized = " ".join((prompt or "").lower().split())
+        return self.inference.get_or_load((normalized, default), lambda: infer_category(normalized, default))
+
+    def select(
+        self,
+        category: str,
+        budget_wei: int,
+        load_candidates: Callable[[], Iterable[Candidate]],
+        version: int = 0,
+        limit: int | None = None,
+    ) -> SelectionResult:
+        candidate_set = self.candidate_sets.get_or_load(
+            (category, version),
+            lambda: _candidate_set(load_candidates()),
+        )
+        bucket = bisect_right(candidate_set.fee_ladder, budget_wei)
+
+        def compute() -> SelectionResult | None:
+            try:
+                return select_best(candidate_set.candidates, category, budget_wei, limit=limit)
+            except ValueError:
+                return None
+
+        cached = self.selections.get_or_load(
+            (category, version, candidate_set.fingerprint, bucket, limit),
+            compute,
+        )
+        if cached is None:
+            raise ValueError(f"No eligible agent for category={category} and budgetWei={budget_wei}")
+        # The reason text quotes the budget, so it is rendered for the caller's exact value.
+        return SelectionResult(
+            category=category,
+            best=cached.best,
+            reason=selection_reason(cached.best, budget_wei),
+            candidates=cached.candidates,
+        )
+
+    def invalidate(self) -> None:
+        self.inference.invalidate()
+        self.candidate_sets.invalidate()
+        self.selections.invalidate()
+
+    def stats(self) -> dict[str, CacheStats]:
+        return {
+            "inference": self.inference.stats(),
+            "candidates": self.candidate_sets.stats(),
+            "selections": self.selections.stats(),
+        }
+
+
+def _candidate_set(candidates: Iterable[Candidate]) -> _CandidateSet:
+    items = tuple(candidates)
+    digest = hashlib.blake2b(digest_size=16)
+    for c in items:
+        digest.update(f"{c.address.lower()}:{c.category}:{c.base_fee_wei}:{c.reputation_score};".encode())
+    return _CandidateSet(
+        candidates=items,
+        fee_ladder=tuple(sorted({c.base_fee_wei for c in items})),
+        fingerprint=digest.digest(),
+    )
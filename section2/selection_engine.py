@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import heapq
+import re
+from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 CATEGORY_KEYWORDS = {
@@ -11,6 +14,14 @@ CATEGORY_KEYWORDS = {
     "CONTENT_GEN": ("content", "write", "post", "summary", "copy", "article"),
 }
 
+_KEYWORD_CATEGORY = {keyword: category for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords}
+_CATEGORY_PRIORITY = {category: index for index, category in enumerate(CATEGORY_KEYWORDS)}
+# One alternation over every keyword (longest first). A keyword must start a word and may
+# carry a suffix ("debugging", "analyzed", "reports"), but never match inside one ("capital").
+_KEYWORD_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_CATEGORY, key=len, reverse=True)) + r")\w*\b"
+)
+
 
 @dataclass(frozen=True)
 class Candidate:
@@ -34,31 +45,88 @@ class SelectionResult:
     candidates: List[Candidate]
 
 
-def infer_category(prompt: str, default: str = "RESEARCH") -> str:
+def category_scores(prompt: str) -> Dict[str, int]:
+    """Keyword hits per category from a single regex pass over the prompt."""
     lowered = (prompt or "").lower()
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in lowered for keyword in keywords):
-            return category
-    return default
+    return dict(Counter(_KEYWORD_CATEGORY[match.group(1)] for match in _KEYWORD_PATTERN.finditer(lowered)))
+
+
+def infer_category(prompt: str, default: str = "RESEARCH") -> str:
+    # Highest score wins; ties go to the category listed first in CATEGORY_KEYWORDS.
+    scores = category_scores(prompt)
+    if not scores:
+        return default
+    return max(scores, key=lambda category: (scores[category], -_CATEGORY_PRIORITY[category]))
+
 
+def infer_categories(prompts: Iterable[str], default: str = "RESEARCH") -> List[str]:
+    """`infer_category` per prompt; a prompt repeated in the batch is scored once."""
+    inferred: Dict[str, str] = {}
+    categories = []
+    for prompt in prompts:
+        category = inferred.get(prompt)
+        if category is None:
+            category = inferred[prompt] = infer_category(prompt, default)
+        categories.append(category)
+    return categories
 
-def rank_candidates(candidates: Iterable[Candidate], budget_wei: int) -> List[Candidate]:
-    filtered = [c for c in candidates if c.base_fee_wei <= budget_wei]
+
+def rank_key(candidate: Candidate) -> Tuple[int, int, float]:
     # Goal: maximize quality (reputation) within budget.
     # Tie-breakers: cheaper fee first, then better efficiency.
-    filtered.sort(key=lambda c: (-c.reputation_score, c.base_fee_wei, -c.efficiency))
-    return filtered
+    return (-candidate.reputation_score, candidate.base_fee_wei, -candidate.efficiency)
+
 
+def rank_candidates(candidates: Iterable[Candidate], budget_wei: int, limit: Optional[int] = None) -> List[Candidate]:
+    eligible = (c for c in candidates if c.base_fee_wei <= budget_wei)
+    if limit is not None:
+        return top_k(eligible, budget_wei, limit)
+    return sorted(eligible, key=rank_key)
 
-def select_best(candidates: Iterable[Candidate], category: str, budget_wei: int) -> SelectionResult:
-    ranked = rank_candidates(candidates, budget_wei)
+
+def top_k(candidates: Iterable[Candidate], budget_wei: int, k: int) -> List[Candidate]:
+    """
+    Best `k` eligible candidates in O(N log K). Same order as
+    `rank_candidates(...)[:k]`, including ties (heapq.nsmallest is stable).
+    """
+    if k <= 0:
+        return []
+    eligible = (c for c in candidates if c.base_fee_wei <= budget_wei)
+    if k == 1:
+        best = min(eligible, key=rank_key, default=None)
+        return [best] if best is not None else []
+    return heapq.nsmallest(k, eligible, key=rank_key)
+
+
+def iter_ranked(candidates: Iterable[Candidate], budget_wei: int) -> Iterator[Candidate]:
+    """
+    Lazily yield eligible candidates in rank order. Building the heap is O(N);
+    each yielded candidate costs O(log N), so stopping early never pays for a full sort.
+    """
+    heap = [(rank_key(c), index, c) for index, c in enumerate(candidates) if c.base_fee_wei <= budget_wei]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def select_best(
+    candidates: Iterable[Candidate],
+    category: str,
+    budget_wei: int,
+    limit: Optional[int] = None,
+) -> SelectionResult:
+    """`limit` caps `SelectionResult.candidates` to the top entries; None keeps the full ranking."""
+    ranked = rank_candidates(candidates, budget_wei, limit=limit)
     if not ranked:
         raise ValueError(f"No eligible agent for category={category} and budgetWei={budget_wei}")
 
     best = ranked[0]
-    reason = (
+    return SelectionResult(category=category, best=best, reason=selection_reason(best, budget_wei), candidates=ranked)
+
+
+def selection_reason(best: Candidate, budget_wei: int) -> str:
+    return (
         f"Agent {best.address} selected because it has the highest quality score "
         f"(reputation={best.reputation_score}) under budget {budget_wei}; "
         f"ties are broken by lower base fee."
     )
-    return SelectionResult(category=category, best=best, reason=reason, candidates=ranked)
@@ -3,13 +3,17 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterator, TextIO
 
 from dotenv import load_dotenv
 from eth_account import Account
 
 from agent_wallet_manager import AgentWalletManager
+from candidate_loader import to_bytes32
+from key_store import DEFAULT_KEY_STORE, SQLITE_SUFFIXES, SqliteKeyStore, agent_from_json
 from monad_bridge import MonadBridge
 
 
@@ -28,31 +32,87 @@ CATEGORY_BYTES = {
     "CONTENT_GEN": b"CONTENT_GEN" + b"\x00" * (32 - len("CONTENT_GEN")),
 }
 
+TIER_VALUES = [
+    ("high", 250_000_000_000_000, 92),
+    ("mid", 150_000_000_000_000, 75),
+    ("low", 80_000_000_000_000, 45),
+]
 
-def make_specs() -> list[SeedSpec]:
+
+def make_specs(per_tier: int = 1, categories: list[str] | None = None) -> list[SeedSpec]:
     specs: list[SeedSpec] = []
-    tier_values = [
-        ("high", 250_000_000_000_000, 92),
-        ("mid", 150_000_000_000_000, 75),
-        ("low", 80_000_000_000_000, 45),
-    ]
-    for category_name, category_bytes in CATEGORY_BYTES.items():
-        for label, fee, score in tier_values:
-            specs.append(
-                SeedSpec(
-                    name=f"{category_name}_{label}",
-                    category=category_bytes,
-                    base_fee_wei=fee,
-                    reputation=score,
+    for category_name in categories or list(CATEGORY_BYTES):
+        for label, fee, score in TIER_VALUES:
+            for index in range(per_tier):
+                # With one agent per tier the names stay as before ("DEVELOPMENT_high").
+                suffix = "" if per_tier == 1 else f"_{index:05d}"
+                specs.append(
+                    SeedSpec(
+                        name=f"{category_name}_{label}{suffix}",
+                        category=to_bytes32(category_name),
+                        base_fee_wei=fee,
+                        reputation=score,
+                    )
                 )
-            )
     return specs
 
 
+def _new_keys(count: int) -> list[tuple[str, str]]:
+    keys = []
+    for _ in range(count):
+        account = Account.create()
+        keys.append((account.address, account.key.hex()))
+    return keys
+
+
+def generate_keys(count: int, workers: int = 1, chunk_size: int = 500) -> list[tuple[str, str]]:
+    """(address, private key hex) pairs; secp256k1 derivation is spread over `workers` processes."""
+    if workers <= 1 or count <= chunk_size:
+        return _new_keys(count)
+    chunks = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [pair for chunk in pool.map(_new_keys, chunks) for pair in chunk]
+
+
+def journal_path(output: Path) -> Path:
+    return output.with_name(output.name + ".journal.jsonl")
+
+
+def read_journal(path: Path) -> dict[str, dict[str, Any]]:
+    """Latest journal record per spec name. A torn last line from a crash is ignored."""
+    records: dict[str, dict[str, Any]] = {}
+    if not path.exists():
+        return records
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["name"]] = record
+    return records
+
+
+def append_journal(fh: TextIO, records: list[dict[str, Any]]) -> None:
+    for record in records:
+        fh.write(json.dumps(record) + "\n")
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def chunked(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Seed synthetic V2 agents")
     parser.add_argument("--deployment", default="deployments/monadTestnet.json")
-    parser.add_argument("--output", default="section2/synthetic_agents.private.json")
+    parser.add_argument("--output", default=DEFAULT_KEY_STORE)
+    parser.add_argument("--per-tier", type=int, default=1, help="agents per (category, tier)")
+    parser.add_argument("--categories", default="", help="comma-separated; defaults to the four built-in categories")
+    parser.add_argument("--workers", type=int, default=1, help="processes used for key generation")
+    parser.add_argument("--batch-size", type=int, default=200, help="seed txs in flight per batch")
     return parser.parse_args()
 
 
@@ -66,39 +126,107 @@ def main() -> None:
 
     owner_key = (os.getenv("DEPLOYER_PRIVATE_KEY") or manager.master.private_key).strip()
     owner_account = Account.from_key(owner_key)
-    specs = make_specs()
-    seeded_records = []
-
-    for spec in specs:
-        synthetic = Account.create()
-        tx = bridge.send_contract_tx(
-            owner_account,
-            "seedSyntheticAgent",
-            synthetic.address,
-            spec.name,
-            "synthetic",
-            spec.category,
-            spec.base_fee_wei,
-            spec.reputation,
-        )
-
-        seeded_records.append(
-            {
-                "address": synthetic.address,
-                "private_key": synthetic.key.hex(),
-                "name": spec.name,
-                "category_hex": "0x" + spec.category.hex(),
-                "base_fee_wei": spec.base_fee_wei,
-                "reputation": spec.reputation,
-                "tx_hash": tx.tx_hash,
-            }
-        )
-        print(f"Seeded {spec.name}: {synthetic.address} tx={tx.tx_hash}")
+    categories = [c.strip().upper() for c in args.categories.split(",") if c.strip()] or None
+    specs = make_specs(args.per_tier, categories)
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps({"agents": seeded_records}, indent=2), encoding="utf-8")
-    print(f"Wrote synthetic agent keys to {out_path}")
+    journal = journal_path(out_path)
+
+    # Resume: a journal left by an interrupted run lists every key that was ever
+    # broadcast. Seeded entries are kept; submitted-but-unconfirmed ones are
+    # checked on chain and re-sent with the same key when missing.
+    previous = read_journal(journal)
+    todo: list[tuple[SeedSpec, tuple[str, str] | None]] = []
+    confirmed: list[dict[str, Any]] = []
+    for spec in specs:
+        record = previous.get(spec.name)
+        if record is None:
+            todo.append((spec, None))
+        elif record["status"] != "seeded":
+            if bool(bridge.read("isRegistered", record["address"])):
+                confirmed.append({**record, "status": "seeded"})
+            else:
+                todo.append((spec, (record["address"], record["private_key"])))
+    if previous:
+        print(f"Resuming from {journal}: {len(specs) - len(todo)} already seeded, {len(todo)} to go")
+
+    fresh_keys = iter(generate_keys(sum(1 for _, key in todo if key is None), args.workers))
+    work = [(spec, key or next(fresh_keys)) for spec, key in todo]
+
+    with journal.open("a", encoding="utf-8") as fh:
+        append_journal(fh, confirmed)
+        for batch in chunked(work, max(1, args.batch_size)):
+            # Keys hit the journal before broadcast, so a crash never loses the key of a seeded agent.
+            append_journal(
+                fh,
+                [
+                    _seed_record(spec, address, private_key, status="submitted")
+                    for spec, (address, private_key) in batch
+                ],
+            )
+            pending = [
+                bridge.submit_contract_tx(
+                    owner_account,
+                    "seedSyntheticAgent",
+                    address,
+                    spec.name,
+                    "synthetic",
+                    spec.category,
+                    spec.base_fee_wei,
+                    spec.reputation,
+                )
+                for spec, (address, _) in batch
+            ]
+            results = bridge.wait_for_receipts(pending)
+            seeded = []
+            for (spec, (address, private_key)), tx in zip(batch, results):
+                # A re-send after resume reverts with AlreadyRegistered when the first tx landed after all.
+                if tx.status != 1 and not bool(bridge.read("isRegistered", address)):
+                    print(f"Seed failed for {spec.name}: {address} tx={tx.tx_hash}")
+                    continue
+                seeded.append(_seed_record(spec, address, private_key, status="seeded", tx_hash=tx.tx_hash))
+            append_journal(fh, seeded)
+            print(f"Seeded {len(seeded)}/{len(batch)} agents (last: {batch[-1][0].name})")
+
+    journaled = read_journal(journal)
+    records = [r for r in journaled.values() if r["status"] == "seeded"]
+    if out_path.suffix.lower() in SQLITE_SUFFIXES:
+        # Indexed store for large runs; INSERT OR REPLACE makes re-compaction idempotent.
+        store = SqliteKeyStore(out_path)
+        store.put_many(agent_from_json(r) for r in records)
+        store.close()
+    else:
+        seeded_records = [{k: v for k, v in r.items() if k != "status"} for r in records]
+        tmp_path = out_path.with_name(out_path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"agents": seeded_records}, indent=2), encoding="utf-8")
+        tmp_path.replace(out_path)
+    missing = [spec.name for spec in specs if journaled.get(spec.name, {}).get("status") != "seeded"]
+    if missing:
+        # Keep the journal: it holds the keys and resume state of the specs that still need seeding.
+        print(f"Wrote {len(records)} synthetic agent keys to {out_path}; {len(missing)} not seeded, re-run to resume")
+        return
+    journal.unlink()
+    print(f"Wrote {len(records)} synthetic agent keys to {out_path}")
+
+
+def _seed_record(
+    spec: SeedSpec,
+    address: str,
+    private_key: str,
+    status: str,
+    tx_hash: str = "",
+) -> dict[str, Any]:
+    return {
+        "address": address,
+        "private_key": private_key,
+        "name": spec.name,
+        "category_hex": "0x" + spec.category.hex(),
+        "base_fee_wei": spec.base_fee_wei,
+        "reputation": spec.reputation,
+        "tx_hash": tx_hash,
+        "status": status,
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from artifact_store import URI_PREFIX, ArtifactStore, parse_uri
+
+
+def test_identical_content_is_stored_once(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+    first = store.put_json({"b": 1, "a": [1, 2]})
+    again = store.put_json({"a": [1, 2], "b": 1})
+    streamed = store.put_file(io.BytesIO(b'{"a":[1,2],"b":1}'))
+    assert first.created and not again.created and not streamed.created
+    assert first.uri == again.uri == streamed.uri
+    assert [path for path in (tmp_path / "sha256").rglob("*") if path.is_file()] == [store.path_for(first.digest)]
+    # Temp files of deduplicated writes are cleaned up.
+    assert list((tmp_path / "tmp").iterdir()) == []
+    assert store.read_json(first.uri) == {"a": [1, 2], "b": 1}
+
+
+def test_uri_length_does_not_grow_with_payload(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+    small = store.put_bytes(b"x")
+    large = store.put_stream(b"y" * 4096 for _ in range(512))
+    assert large.size == 4096 * 512
+    assert len(small.uri) == len(large.uri) == len(URI_PREFIX) + 64 == 82
+    assert parse_uri(large.uri) == large.digest and store.exists(large.uri)
+
+
+def test_bad_uris_and_corruption_are_rejected(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+    ref = store.put_bytes(b"payload")
+    for uri in ("ipfs://abc", URI_PREFIX + "ab", URI_PREFIX + "G" * 64):
+        with pytest.raises(ValueError):
+            parse_uri(uri)
+    store.path_for(ref.digest).write_bytes(b"tampered")
+    with pytest.raises(ValueError):
+        store.read_bytes(ref.uri)
+    assert store.read_bytes(ref.uri, verify=False) == b"tampered"
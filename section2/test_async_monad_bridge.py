@@ -0,0 +1,80 @@
+"""
+AsyncMonadBridge against a local dev chain.
+
+Needs `npx hardhat node` with V2 deployed (`AME_CONTRACT_VERSION=v2 npx hardhat
+run scripts/deploy.js --network localhost`); skipped when the node or
+`deployments/localhost.json` is missing. `AME_TEST_RPC_URL`,
+`AME_TEST_DEPLOYMENT` and `AME_TEST_OWNER_KEY` point it elsewhere.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+from eth_account import Account
+from web3 import Web3
+
+from async_monad_bridge import AsyncMonadBridge, make_async_web3
+from receipt_watcher import AsyncReceiptWatcher
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RPC_URL = os.getenv("AME_TEST_RPC_URL", "http://127.0.0.1:8545")
+DEPLOYMENT = Path(os.getenv("AME_TEST_DEPLOYMENT", str(REPO_ROOT / "deployments" / "localhost.json")))
+# Hardhat's well-known dev account #0, the deployer and therefore the contract owner.
+OWNER_KEY = os.getenv("AME_TEST_OWNER_KEY", "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80")
+TX_COUNT = 20
+
+
+def _chain_ready() -> bool:
+    if not DEPLOYMENT.exists():
+        return False
+    try:
+        w3 = Web3(Web3.HTTPProvider(RPC_URL, request_kwargs={"timeout": 2}))
+        return w3.is_connected() and len(w3.eth.get_code(Web3.to_checksum_address(_deployed_address()))) > 0
+    except Exception:
+        return False
+
+
+def _deployed_address() -> str:
+    return json.loads(DEPLOYMENT.read_text(encoding="utf-8"))["address"]
+
+
+pytestmark = pytest.mark.skipif(not _chain_ready(), reason=f"no V2 deployment reachable at {RPC_URL}")
+
+
+async def _pipelined_sends(use_watcher: bool) -> None:
+    owner = Account.from_key(OWNER_KEY)
+    w3 = await make_async_web3(RPC_URL, pool_size=TX_COUNT)
+    watcher = await AsyncReceiptWatcher(w3, poll_sec=0.05).start() if use_watcher else None
+    bridge = AsyncMonadBridge.from_deployment_file(w3, DEPLOYMENT, receipt_watcher=watcher)
+    try:
+        start_nonce = int(await w3.eth.get_transaction_count(owner.address, "pending"))
+        # Rewriting the current fee is an owner-only tx with no lasting effect.
+        fee_bps = int(await bridge.read("platformFeeBps"))
+
+        pending = await asyncio.gather(
+            *(bridge.submit_contract_tx(owner, "setPlatformFeeBps", fee_bps) for _ in range(TX_COUNT))
+        )
+        assert sorted(p.nonce for p in pending) == list(range(start_nonce, start_nonce + TX_COUNT))
+        assert len({p.tx_hash for p in pending}) == TX_COUNT
+
+        results = await bridge.wait_for_receipts(pending, poll_sec=0.05)
+        assert [r.status for r in results] == [1] * TX_COUNT
+        for item, result in zip(pending, results):
+            assert Web3.to_bytes(hexstr=result.tx_hash) == item.tx_hash
+        assert int(await w3.eth.get_transaction_count(owner.address, "latest")) == start_nonce + TX_COUNT
+    finally:
+        await bridge.close()
+
+
+def test_pipelined_sends_are_nonce_ordered_and_confirmed() -> None:
+    asyncio.run(_pipelined_sends(use_watcher=False))
+
+
+def test_pipelined_sends_with_receipt_watcher() -> None:
+    asyncio.run(_pipelined_sends(use_watcher=True))
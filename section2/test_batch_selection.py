@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from agent_selector import AgentSelector
+from batch_selection import BatchSelector
+from selection_engine import Candidate, select_best
+
+
+CATEGORIES = ("RESEARCH", "DEVELOPMENT", "DATA_MINING")
+
+
+def _pool(rng: random.Random, size: int, max_fee: int) -> list[Candidate]:
+    return [
+        Candidate(
+            address=f"0x{index:040x}",
+            category=rng.choice(CATEGORIES),
+            base_fee_wei=rng.randint(0, max_fee),
+            reputation_score=rng.randint(0, 6),
+        )
+        for index in range(size)
+    ]
+
+
+def _scalar(pool: list[Candidate], category: str, budget: int) -> Candidate | None:
+    try:
+        return select_best([c for c in pool if c.category == category], category, budget).best
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("max_fee", [20, 2**80])
+def test_select_many_matches_select_best(seed: int, max_fee: int) -> None:
+    rng = random.Random(seed)
+    pool = _pool(rng, 150, max_fee)
+    categories = [rng.choice(CATEGORIES + ("CONTENT_GEN",)) for _ in range(300)]
+    budgets = [rng.choice([-1, 0, rng.randint(0, max_fee), max_fee, 2**70]) for _ in categories]
+    chosen = BatchSelector(pool).select_many(categories, budgets)
+    assert chosen == [_scalar(pool, category, budget) for category, budget in zip(categories, budgets)]
+
+
+def test_tie_break_and_no_eligible() -> None:
+    cheap = Candidate("0xA", "RESEARCH", 10, 5)
+    pricey = Candidate("0xB", "RESEARCH", 20, 5)
+    better = Candidate("0xC", "RESEARCH", 50, 9)
+    selector = BatchSelector([pricey, better, cheap])
+    assert selector.select_many(["RESEARCH"] * 4, [5, 10, 30, 50]) == [None, cheap, cheap, better]
+    assert selector.select_many(["UNKNOWN"], [10**18]) == [None]
+    assert selector.select_many([], []) == []
+    with pytest.raises(ValueError):
+        selector.select_many(["RESEARCH"], [])
+
+
+def test_agent_selector_loads_each_category_once() -> None:
+    pool = _pool(random.Random(0), 60, 20)
+    loads: list[str] = []
+
+    def candidates(category: str) -> list[Candidate]:
+        loads.append(category)
+        return [c for c in pool if c.category == category]
+
+    selector = AgentSelector(bridge=None, indexer=SimpleNamespace(candidates=candidates))
+    categories = ["RESEARCH", "DEVELOPMENT", "RESEARCH", "RESEARCH"]
+    chosen = selector.select_many(categories, [10, 10, 3, 20])
+    assert loads == ["RESEARCH", "DEVELOPMENT"]
+    assert chosen == [_scalar(pool, c, b) for c, b in zip(categories, [10, 10, 3, 20])]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from budget_index import BudgetIndex, build_category_indexes
+from selection_engine import Candidate, rank_candidates, select_best
+
+
+def _candidate(rng: random.Random, index: int) -> Candidate:
+    return Candidate(
+        address=f"0x{index:040x}",
+        category="RESEARCH",
+        base_fee_wei=rng.randint(1, 30),
+        reputation_score=rng.randint(0, 8),
+    )
+
+
+def _assert_matches(index: BudgetIndex, agents: dict[str, Candidate], budgets: list[int]) -> None:
+    # `agents` keeps first-insertion order, which is the tie order of the reference ranking.
+    pool = list(agents.values())
+    for budget in budgets:
+        expected = rank_candidates(pool, budget)
+        for k in (1, 3, index.max_k, index.max_k + 4):
+            assert index.top_k_under(budget, k) == expected[:k], (budget, k)
+        if expected:
+            assert index.best_under(budget) == select_best(pool, "RESEARCH", budget).best
+        else:
+            assert index.best_under(budget) is None
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_select_best_through_upserts_and_fee_changes(seed: int) -> None:
+    rng = random.Random(seed)
+    agents = {f"0x{i:040x}": _candidate(rng, i) for i in range(60)}
+    index = BudgetIndex(agents.values(), max_k=4)
+    budgets = [0, 1, 5, 15, 30, 100]
+    _assert_matches(index, agents, budgets)
+
+    for step in range(200):
+        roll = rng.random()
+        if roll < 0.5:
+            # Reputation change: in-place node update.
+            address = rng.choice(list(agents))
+            updated = Candidate(address, "RESEARCH", agents[address].base_fee_wei, rng.randint(0, 8))
+        elif roll < 0.8:
+            # Fee change: array positions move, lazy rebuild.
+            address = rng.choice(list(agents))
+            updated = Candidate(address, "RESEARCH", rng.randint(1, 30), agents[address].reputation_score)
+        else:
+            updated = _candidate(rng, 1_000 + step)
+            address = updated.address
+        agents[address] = updated
+        index.upsert(updated)
+        if step % 10 == 0:
+            _assert_matches(index, agents, budgets)
+    _assert_matches(index, agents, budgets)
+
+
+def test_remove_and_category_split() -> None:
+    a = Candidate("0xA", "RESEARCH", 10, 5)
+    b = Candidate("0xB", "RESEARCH", 20, 9)
+    c = Candidate("0xC", "DEVELOPMENT", 5, 1)
+    indexes = build_category_indexes([a, b, c], max_k=2)
+    assert set(indexes) == {"RESEARCH", "DEVELOPMENT"}
+    assert indexes["RESEARCH"].top_k_under(100, 2) == [b, a]
+    indexes["RESEARCH"].remove("0xb")
+    assert indexes["RESEARCH"].top_k_under(100, 2) == [a]
+    assert len(indexes["RESEARCH"]) == 1
+    with pytest.raises(ValueError):
+        BudgetIndex(max_k=0)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from web3.exceptions import Web3RPCError
+
+from candidate_loader import load_category_candidates
+from instrumentation import DISABLED
+
+
+CATEGORY = b"RESEARCH".ljust(32, b"\x00")
+
+
+def _profile(fee: int, reputation: int, registered: bool = True) -> tuple[Any, ...]:
+    return ("name", "expertise", CATEGORY, fee, 0, reputation, 0, registered)
+
+
+PROFILES = {
+    "0xa": _profile(100, 50),
+    "0xb": _profile(200, 80),
+    "0xc": _profile(300, 90, registered=False),
+}
+
+
+class _FakeBridge:
+    def __init__(self, batch_error: Exception | None) -> None:
+        self.batch_error = batch_error
+        self.reads: list[tuple[str, tuple[Any, ...]]] = []
+        self.batches = 0
+        self.instrumentation = DISABLED
+        self.contract = SimpleNamespace(functions=SimpleNamespace(getAgentProfile=lambda address: address))
+        self.w3 = SimpleNamespace(batch_requests=self._batch_requests)
+
+    def read(self, fn_name: str, *args: Any) -> Any:
+        self.reads.append((fn_name, args))
+        if fn_name == "getCategoryAgents":
+            return list(PROFILES)
+        return PROFILES[args[0]]
+
+    @contextmanager
+    def _batch_requests(self) -> Iterator[Any]:
+        queued: list[str] = []
+
+        def execute() -> list[Any]:
+            self.batches += 1
+            if self.batch_error is not None:
+                raise self.batch_error
+            return [PROFILES[address] for address in queued]
+
+        yield SimpleNamespace(add=queued.append, execute=execute)
+
+
+def test_profiles_are_read_in_one_batch() -> None:
+    bridge = _FakeBridge(batch_error=None)
+    candidates = load_category_candidates(bridge, CATEGORY)
+    assert [(c.address, c.base_fee_wei, c.reputation_score) for c in candidates] == [("0xa", 100, 50), ("0xb", 200, 80)]
+    assert all(c.category == "RESEARCH" for c in candidates)
+    assert bridge.batches == 1
+    assert bridge.reads == [("getCategoryAgents", (CATEGORY,))]
+
+
+def test_rejected_batch_falls_back_to_single_reads() -> None:
+    bridge = _FakeBridge(batch_error=Web3RPCError("batch requests are not supported"))
+    candidates = load_category_candidates(bridge, CATEGORY)
+    assert [c.address for c in candidates] == ["0xa", "0xb"]
+    assert [args for fn, args in bridge.reads if fn == "getAgentProfile"] == [("0xa",), ("0xb",), ("0xc",)]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from event_log import decode_logs, fetch_events, is_range_error
+
+
+WORKER = Web3.to_checksum_address("0x" + "22" * 20)
+
+
+class _LogsNode:
+    """eth_getLogs stand-in that rejects ranges wider than `max_range` blocks."""
+
+    def __init__(self, logs: list[dict[str, Any]], max_range: int, error: Exception | None = None) -> None:
+        self.logs = logs
+        self.max_range = max_range
+        self.error = error
+        self.ranges: list[tuple[int, int]] = []
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(get_logs=self.get_logs))
+
+    def get_logs(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        start, end = params["fromBlock"], params["toBlock"]
+        self.ranges.append((start, end))
+        if self.error is not None:
+            raise self.error
+        if end - start + 1 > self.max_range:
+            raise Web3RPCError(f"eth_getLogs block range too large: max is {self.max_range}")
+        return [log for log in self.logs if start <= log["blockNumber"] <= end]
+
+
+def test_decode_logs_keeps_chain_order(contract, make_log) -> None:
+    logs = [
+        make_log("JobAccepted", block_number=5, log_index=1, jobId=2, worker=WORKER),
+        make_log("JobAccepted", block_number=3, log_index=0, jobId=1, worker=WORKER),
+        make_log("PlatformFeeUpdated", block_number=4, previousFeeBps=1, newFeeBps=2),
+    ]
+    decoded = decode_logs(contract, logs, ["JobAccepted"])
+    assert [event["args"]["jobId"] for event in decoded] == [1, 2]
+
+
+def test_range_errors_halve_the_chunk_and_successes_grow_it_back(contract, make_log) -> None:
+    logs = [make_log("JobAccepted", block_number=block, jobId=block, worker=WORKER) for block in (0, 150, 999)]
+    node = _LogsNode(logs, max_range=300)
+    events = fetch_events(node.w3, contract, ["JobAccepted"], 0, 999, chunk_size=1000)
+    assert [event["args"]["jobId"] for event in events] == [0, 150, 999]
+    covered = [r for r in node.ranges if r[1] - r[0] + 1 <= 300]
+    assert covered[0][0] == 0 and covered[-1][1] == 999
+    assert all(a[1] + 1 == b[0] for a, b in zip(covered, covered[1:]))
+    # After the first accepted 250-block chunk the size doubles again before shrinking on the next error.
+    assert (0, 249) in node.ranges and (250, 749) in node.ranges
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        Web3RPCError("401 Unauthorized"),
+        Web3RPCError("429 rate limit exceeded, more than 10 requests per second"),
+        ValueError("could not decode"),
+    ],
+)
+def test_other_errors_are_raised_without_shrinking(contract, error) -> None:
+    node = _LogsNode([], max_range=10_000, error=error)
+    with pytest.raises(type(error)):
+        fetch_events(node.w3, contract, ["JobAccepted"], 0, 999, chunk_size=1000)
+    assert node.ranges == [(0, 999)]
+
+
+def test_is_range_error() -> None:
+    assert is_range_error(Web3RPCError("query returned more than 10000 results"))
+    assert is_range_error(Web3RPCError("exceed maximum block range: 5000"))
+    assert not is_range_error(Web3RPCError("execution reverted"))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from gas_cache import FIXED_COST_FUNCTIONS, GasLimitCache, arg_shape, gas_key
+
+
+def test_arg_shape_buckets_dynamic_values_by_word() -> None:
+    assert arg_shape("a") == arg_shape("x" * 32) == ("str", 1)
+    assert arg_shape("x" * 33) == ("str", 2)
+    assert arg_shape(b"\x00" * 64) == ("bytes", 2)
+    assert arg_shape("") == ("str", 0)
+    # Non-ASCII text is sized by its UTF-8 encoding.
+    assert arg_shape("ü" * 16) == ("str", 1)
+    assert arg_shape("ü" * 17) == ("str", 2)
+
+
+def test_arg_shape_keeps_bool_apart_from_int() -> None:
+    assert arg_shape(True) == ("bool",)
+    assert arg_shape(7) == ("int",)
+    assert arg_shape([1, 2, 3]) == ("list", 3, (("int",),))
+    assert arg_shape([]) == ("list", 0, ())
+
+
+def test_gas_key_separates_payable_calls_and_arg_shapes() -> None:
+    assert gas_key("submitWork", (1, "ipfs://a")) == gas_key("submitWork", (2, "ipfs://b"))
+    assert gas_key("submitWork", (1, "x" * 40)) != gas_key("submitWork", (1, "x"))
+    assert gas_key("createJob", (1,), value_wei=10) != gas_key("createJob", (1,))
+
+
+def test_estimate_is_learned_with_margin() -> None:
+    cache = GasLimitCache(margin=1.5)
+    key = gas_key("acceptJob", (1,))
+    assert cache.limit_for(key) is None
+    assert cache.record_estimate(key, 100_000) == 150_000
+    assert cache.limit_for(key) == 150_000
+    # Without a key (non-cacheable function) the margin applies but nothing is stored.
+    assert cache.record_estimate(None, 200_000) == 300_000
+    assert cache.limit_for(key) == 150_000
+
+
+def test_observe_raises_limit_to_largest_gas_used() -> None:
+    cache = GasLimitCache(margin=1.0)
+    key = gas_key("submitWork", (1, "uri"))
+    cache.record_estimate(key, 50_000)
+    cache.observe(key, 60_000, gas_limit=80_000, status=1)
+    assert cache.limit_for(key) == 60_000
+    cache.observe(key, 40_000, gas_limit=80_000, status=1)
+    assert cache.limit_for(key) == 60_000
+
+
+def test_observe_ignores_unknown_keys_and_plain_reverts() -> None:
+    cache = GasLimitCache(margin=1.0)
+    key = gas_key("releasePayment", (1,))
+    cache.observe(key, 60_000, gas_limit=80_000, status=1)
+    assert cache.limit_for(key) is None
+    cache.record_estimate(key, 50_000)
+    # A revert well below the limit is a logic failure, not a sign the limit was too low.
+    cache.observe(key, 30_000, gas_limit=80_000, status=0)
+    assert cache.limit_for(key) == 50_000
+
+
+def test_out_of_gas_receipt_evicts_entry() -> None:
+    cache = GasLimitCache(margin=1.0)
+    key = gas_key("releasePayment", (1,))
+    cache.record_estimate(key, 50_000)
+    cache.observe(key, 49_900, gas_limit=50_000, status=0)
+    assert cache.limit_for(key) is None
+
+
+def test_only_fixed_cost_functions_are_cacheable() -> None:
+    cache = GasLimitCache()
+    assert cache.is_cacheable("acceptJob")
+    assert not cache.is_cacheable("createJobByCategory")
+    assert "createJobByCategory" not in FIXED_COST_FUNCTIONS
+    assert GasLimitCache(cacheable=frozenset({"createJobByCategory"})).is_cacheable("createJobByCategory")
+
+
+def test_invalidate() -> None:
+    cache = GasLimitCache(margin=1.0)
+    first, second = gas_key("acceptJob", (1,)), gas_key("submitWork", (1, "u"))
+    cache.record_estimate(first, 1)
+    cache.record_estimate(second, 2)
+    cache.invalidate(first)
+    assert cache.limit_for(first) is None and cache.limit_for(second) == 2
+    cache.invalidate()
+    assert cache.limit_for(second) is None
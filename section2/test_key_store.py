@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from eth_account import Account
+
+import key_store
+from key_store import JsonKeyStore, SqliteKeyStore, open_key_store
+
+
+def _write_json(path: Path, count: int) -> list[dict[str, object]]:
+    agents = []
+    for index in range(count):
+        key = f"{index + 1:064x}"
+        agents.append(
+            {
+                "address": Account.from_key(key).address,
+                # The legacy files sometimes omit the 0x prefix.
+                "private_key": key if index % 2 else f"0x{key}",
+                "name": f"agent-{index}",
+                "category_hex": "0x" + "00" * 32,
+                "base_fee_wei": str(1_000 + index),
+                "reputation": 50 + index,
+            }
+        )
+    path.write_text(json.dumps({"agents": agents}), encoding="utf-8")
+    return agents
+
+
+def test_json_and_sqlite_stores_agree(tmp_path: Path) -> None:
+    source = tmp_path / "agents.private.json"
+    raw = _write_json(source, 6)
+    json_store = JsonKeyStore(source)
+    sqlite_store = SqliteKeyStore(tmp_path / "agents.private.sqlite")
+    assert sqlite_store.import_json(source) == 6
+
+    assert len(json_store) == len(sqlite_store) == 6
+    assert sorted(json_store.addresses()) == sorted(sqlite_store.addresses())
+    for entry in raw:
+        address = str(entry["address"])
+        assert json_store.get(address.lower()) == sqlite_store.get(address.lower()) == sqlite_store.get(address)
+        assert json_store.account(address).address == sqlite_store.account(address).address == address
+    assert json_store.get("0x" + "00" * 20) is None and sqlite_store.get("0x" + "00" * 20) is None
+    with pytest.raises(KeyError):
+        sqlite_store.account("0x" + "00" * 20)
+    sqlite_store.close()
+
+
+def test_missing_sqlite_path_is_filled_from_json_sibling(tmp_path: Path) -> None:
+    _write_json(tmp_path / "agents.private.json", 3)
+    store = open_key_store(tmp_path / "agents.private.sqlite")
+    assert isinstance(store, SqliteKeyStore) and len(store) == 3
+    store.close()
+
+
+def test_json_path_prefers_newer_sqlite_sibling(tmp_path: Path) -> None:
+    source = tmp_path / "agents.private.json"
+    _write_json(source, 2)
+    assert isinstance(open_key_store(source), JsonKeyStore)
+
+    sibling = SqliteKeyStore(tmp_path / "agents.private.sqlite")
+    sibling.import_json(source)
+    sibling.close()
+    assert isinstance(open_key_store(source), SqliteKeyStore)
+
+    # A JSON file rewritten after the copy was made is the newer truth again.
+    later = os.stat(tmp_path / "agents.private.sqlite").st_mtime + 10
+    os.utime(source, (later, later))
+    assert isinstance(open_key_store(source), JsonKeyStore)
+
+
+def test_large_json_is_served_from_sqlite(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "agents.private.json"
+    _write_json(source, 4)
+    monkeypatch.setattr(key_store, "LARGE_JSON_BYTES", 100)
+    store = open_key_store(source)
+    assert isinstance(store, SqliteKeyStore) and len(store) == 4
+    assert (tmp_path / "agents.private.sqlite").exists()
+    store.close()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from async_monad_bridge import AsyncMonadBridge
+from monad_bridge import MonadBridge
+from nonce_manager import NonceManager
+
+
+SENDER = "0x" + "5e" * 20
+RECIPIENT = "0x" + "7a" * 20
+
+
+class _Node:
+    """Records nonces in the order their broadcasts arrive."""
+
+    def __init__(self) -> None:
+        self.received: list[int] = []
+        self._lock = threading.Lock()
+
+    def receive(self, nonce: int) -> bytes:
+        with self._lock:
+            self.received.append(nonce)
+        return nonce.to_bytes(32, "big")
+
+
+def _account() -> Any:
+    return SimpleNamespace(
+        address=SENDER,
+        sign_transaction=lambda tx: SimpleNamespace(raw_transaction=tx["nonce"], hash=bytes(32)),
+    )
+
+
+def test_release_and_resync_never_rewind_below_outstanding() -> None:
+    chain = {"count": 5}
+    manager = NonceManager(SimpleNamespace(eth=SimpleNamespace(get_transaction_count=lambda *a, **k: chain["count"])))
+    first, second = manager.allocate(SENDER), manager.allocate(SENDER)
+    assert (first, second) == (5, 6)
+    manager.release(SENDER, second)
+    assert manager.peek(SENDER) == 6
+    # The chain has not seen nonce 5 yet; a re-sync must not hand it out again.
+    assert manager.resync(SENDER) == 6
+    manager.mark_sent(SENDER, first)
+    chain["count"] = 6
+    assert manager.resync(SENDER) == 6
+    assert manager.sender_lock(SENDER) is manager.sender_lock(SENDER.upper())
+
+
+def test_sync_and_async_senders_broadcast_in_nonce_order() -> None:
+    node = _Node()
+    manager = NonceManager(SimpleNamespace(eth=SimpleNamespace(get_transaction_count=lambda *a, **k: 0)))
+
+    on_the_wire = threading.Event()
+
+    def slow_send(raw: int) -> bytes:
+        on_the_wire.set()
+        time.sleep(0.005)
+        return node.receive(raw)
+
+    async def async_send(raw: int) -> bytes:
+        return node.receive(raw)
+
+    async def async_zero(*args: Any, **kwargs: Any) -> int:
+        return 0
+
+    async def async_chain_id() -> int:
+        return 1
+
+    async def async_fee_fields() -> dict[str, int]:
+        return {"gasPrice": 1}
+
+    sync_bridge = MonadBridge(
+        SimpleNamespace(eth=SimpleNamespace(send_raw_transaction=slow_send)),
+        contract=None,
+        nonce_manager=manager,
+        fee_oracle=SimpleNamespace(chain_id=1, fee_fields=lambda: {"gasPrice": 1}),
+    )
+    async_bridge = AsyncMonadBridge(
+        SimpleNamespace(eth=SimpleNamespace(send_raw_transaction=async_send, get_transaction_count=async_zero)),
+        contract=None,
+        nonce_manager=manager,
+        fee_oracle=SimpleNamespace(chain_id=async_chain_id, fee_fields=async_fee_fields),
+    )
+    account = _account()
+
+    def funder() -> None:
+        for _ in range(20):
+            sync_bridge.submit_transfer(account, RECIPIENT, 1)
+
+    async def orchestrator() -> None:
+        # Start while the funder's first transfer is mid-broadcast.
+        while not on_the_wire.is_set():
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*(async_bridge.submit_transfer(account, RECIPIENT, 1) for _ in range(20)))
+
+    thread = threading.Thread(target=funder)
+    thread.start()
+    asyncio.run(orchestrator())
+    thread.join()
+    assert node.received == list(range(40))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import selection_cache
+from read_cache import ReadCache
+from receipt_watcher import ReceiptWatcher
+
+
+class _Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> int:
+        self.calls += 1
+        return self.calls
+
+
+def _fee_updated(make_log, new_fee: int) -> dict[str, Any]:
+    return make_log("PlatformFeeUpdated", previousFeeBps=0, newFeeBps=new_fee)
+
+
+def test_constants_stay_cached_until_own_update_receipt(contract, make_log) -> None:
+    cache = ReadCache()
+    load = _Loader()
+    assert cache.get_or_load("platformFeeBps", (), "latest", load) == 1
+    assert cache.get_or_load("platformFeeBps", (), "latest", load) == 1
+    # A reverted tx or an unrelated event leaves the constant alone.
+    cache.observe_receipt(contract, 0, [_fee_updated(make_log, 5)])
+    cache.observe_receipt(contract, 1, [make_log("MinStakeUpdated", previousStake=0, newStake=1)])
+    assert cache.get_or_load("platformFeeBps", (), "latest", load) == 1
+    cache.observe_receipt(contract, 1, [_fee_updated(make_log, 5)])
+    assert cache.get_or_load("platformFeeBps", (), "latest", load) == 2
+
+
+def test_block_receipts_from_other_senders_invalidate_constants(contract, make_log) -> None:
+    cache = ReadCache()
+    fee, state = _Loader(), _Loader()
+    cache.notify_block(10)
+    cache.get_or_load("platformFeeBps", (), "latest", fee)
+    cache.get_or_load("nextJobId", (), "latest", state)
+
+    foreign = {"status": 1, "logs": [_fee_updated(make_log, 7)]}
+    reverted = {"status": 0, "logs": [make_log("MinStakeUpdated", previousStake=0, newStake=1)]}
+    stake = _Loader()
+    cache.get_or_load("minRegistrationStakeWei", (), "latest", stake)
+    cache.observe_block(contract, [foreign, reverted])
+
+    assert cache.get_or_load("platformFeeBps", (), "latest", fee) == 2
+    assert cache.get_or_load("minRegistrationStakeWei", (), "latest", stake) == 1
+    # Pinned state is left to the head: still served within block 10.
+    assert cache.get_or_load("nextJobId", (), "latest", state) == 1
+    cache.notify_block(11)
+    assert cache.get_or_load("nextJobId", (), "latest", state) == 2
+
+
+def test_own_write_drops_pinned_state(contract, make_log) -> None:
+    cache = ReadCache()
+    load = _Loader()
+    cache.notify_block(3)
+    cache.get_or_load("getJob", (1,), "latest", load)
+    cache.observe_receipt(contract, 1, [make_log("JobAccepted", jobId=1, worker="0x" + "a1" * 20)])
+    assert cache.get_or_load("getJob", (1,), "latest", load) == 2
+    # Explicit block numbers are immutable.
+    assert cache.get_or_load("getJob", (1,), 3, load) == 3
+    assert cache.get_or_load("getJob", (1,), 3, load) == 3
+
+
+def test_sticky_true_and_constant_ttl(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr(selection_cache.time, "monotonic", lambda: now[0])
+    cache = ReadCache(constant_ttl_sec=60)
+    assert cache.get_or_load("isRegistered", ("0xA",), "latest", lambda: True) is True
+    assert cache.get_or_load("isRegistered", ("0xA",), "latest", lambda: False) is True
+    assert cache.get_or_load("isRegistered", ("0xB",), "latest", lambda: False) is False
+
+    load = _Loader()
+    cache.get_or_load("owner", (), "latest", load)
+    now[0] = 59.0
+    assert cache.get_or_load("owner", (), "latest", load) == 1
+    now[0] = 60.0
+    assert cache.get_or_load("owner", (), "latest", load) == 2
+
+
+class _Eth:
+    def __init__(self, supports_block_receipts: bool) -> None:
+        self.supports_block_receipts = supports_block_receipts
+        self.block_number = 2
+
+    def get_block_receipts(self, number: int) -> list[dict[str, Any]]:
+        if not self.supports_block_receipts:
+            raise ValueError("the method eth_getBlockReceipts does not exist/is not available")
+        return [{"transactionHash": bytes([number]) * 32, "status": 1, "logs": []}]
+
+    def get_block(self, number: int) -> dict[str, Any]:
+        return {"transactions": []}
+
+
+def test_watcher_feeds_block_receipts_only_when_complete() -> None:
+    for supported, expected in ((True, [1, 2]), (False, [])):
+        watcher = ReceiptWatcher(SimpleNamespace(eth=_Eth(supported)))
+        watcher.last_block = 0
+        seen: list[int] = []
+        heads: list[int] = []
+        watcher.add_receipts_listener(lambda number, receipts: seen.append(number))
+        watcher.add_block_listener(heads.append)
+        watcher.poll_once()
+        assert seen == expected and heads == [1, 2]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from web3 import Web3
+
+from job_store import STATUS_OPEN, STATUS_TAKEN, JobStore
+from monad_bridge import TxResult
+from refund_sweeper import RefundSweeper
+
+
+EMPLOYER = Web3.to_checksum_address("0x" + "e1" * 20)
+OTHER = Web3.to_checksum_address("0x" + "0f" * 20)
+WORKER = Web3.to_checksum_address("0x" + "a1" * 20)
+
+
+class _Chain:
+    """Logs, `getJob` reads and tx sends; no `batch_requests`, so reads fall back to single calls."""
+
+    def __init__(self, contract, logs: list[dict[str, Any]], jobs: dict[int, tuple[Any, ...]]) -> None:
+        self.contract = contract
+        self.logs = logs
+        self.jobs = jobs
+        self.head = max(log["blockNumber"] for log in logs)
+        self.get_logs_calls = 0
+        self.sent: list[tuple[str, int]] = []
+        self.send_error: Exception | None = None
+        self.w3 = SimpleNamespace(eth=self)
+
+    @property
+    def block_number(self) -> int:
+        return self.head
+
+    def get_logs(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        self.get_logs_calls += 1
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    def read(self, fn_name: str, job_id: int) -> tuple[Any, ...]:
+        assert fn_name == "getJob"
+        return self.jobs[job_id]
+
+    def submit_contract_tx(self, account: Any, fn_name: str, job_id: int) -> tuple[str, int]:
+        if self.send_error is not None:
+            raise self.send_error
+        self.sent.append((fn_name, job_id))
+        return fn_name, job_id
+
+    def wait_for_receipts(self, pending: list[Any]) -> list[TxResult]:
+        return [TxResult(tx_hash=f"0x{job_id:02x}", status=1, block_number=self.head, gas_used=1) for _, job_id in pending]
+
+
+def _job(status: int, created_at: int = 0, timeout_seconds: int = 0, timeout_at: int = 0) -> tuple[Any, ...]:
+    return (EMPLOYER, WORKER, 0, created_at, 0, timeout_seconds, timeout_at, status)
+
+
+def _created(make_log, job_id: int, employer: str, block: int) -> dict[str, Any]:
+    return make_log(
+        "JobCreated",
+        block_number=block,
+        jobId=job_id,
+        employer=employer,
+        worker=WORKER,
+        budget=10,
+        category=b"\x00" * 32,
+        selectedByAlgorithm=False,
+    )
+
+
+def test_sweeper_plans_from_job_store(contract, make_log, tmp_path) -> None:
+    logs = [
+        _created(make_log, 1, EMPLOYER, 1),
+        _created(make_log, 2, OTHER, 1),
+        _created(make_log, 3, EMPLOYER, 1),
+        make_log("JobAccepted", block_number=2, jobId=3, worker=WORKER),
+        _created(make_log, 4, EMPLOYER, 2),
+        make_log("WorkSubmitted", block_number=2, log_index=1, jobId=4, worker=WORKER, deliveryURI="ipfs://x"),
+    ]
+    jobs = {
+        1: _job(STATUS_OPEN, created_at=100, timeout_seconds=50),
+        3: _job(STATUS_TAKEN, created_at=100, timeout_at=200),
+    }
+    chain = _Chain(contract, logs, jobs)
+    store = JobStore(chain, db_path=tmp_path / "jobs.sqlite")
+    sweeper = RefundSweeper(chain, SimpleNamespace(address=EMPLOYER), store)
+
+    assert sweeper.sync() == 2
+    assert chain.get_logs_calls == 1
+    assert sweeper.tracked() == 2 and sweeper.last_block == 2
+    assert sweeper.next_deadline() == 150
+
+    results = sweeper.sweep(now_ts=160)
+    assert [(r.fn_name, r.job_id) for r in results] == [("cancelOpenJob", 1)]
+    assert sweeper.tracked() == 1 and sweeper.next_deadline() == 201
+
+    # Work arrives before the timeout: the job leaves the heap without another getJob.
+    logs.append(make_log("WorkSubmitted", block_number=3, jobId=3, worker=WORKER, deliveryURI="ipfs://y"))
+    chain.head = 3
+    assert sweeper.sync() == 0
+    assert sweeper.tracked() == 0
+    assert sweeper.sweep(now_ts=10_000) == []
+    assert chain.sent == [("cancelOpenJob", 1)]
+
+
+def test_failures_are_reported_not_printed(contract, make_log, tmp_path, capsys) -> None:
+    chain = _Chain(contract, [_created(make_log, 1, EMPLOYER, 1)], {1: _job(STATUS_OPEN, created_at=100, timeout_seconds=50)})
+    sweeper = RefundSweeper(chain, SimpleNamespace(address=EMPLOYER), JobStore(chain, db_path=tmp_path / "jobs.sqlite"))
+    sweeper.sync()
+
+    chain.send_error = ConnectionError("node down")
+    [result] = sweeper.sweep(now_ts=160)
+    assert result.tx is None and result.error == "ConnectionError: node down"
+    assert "failed: ConnectionError" in result.describe()
+    # Still tracked, rescheduled retry_sec later.
+    assert sweeper.tracked() == 1 and sweeper.next_deadline() == 160 + sweeper.retry_sec
+
+    stop = threading.Event()
+    errors: list[Exception] = []
+
+    def fail_once(to_block: int | None = None) -> int:
+        stop.set()
+        raise TimeoutError("rpc timeout")
+
+    sweeper.sync = fail_once
+    sweeper.run(poll_sec=0, stop=stop, on_error=errors.append)
+    assert isinstance(sweeper.last_error, TimeoutError) and errors == [sweeper.last_error]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from web3 import Web3
+
+from agent_selector import AgentSelector
+from candidate_loader import to_bytes32
+from instrumentation import DISABLED
+from registry_indexer import RegistryIndexer, open_registry_index
+
+
+ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+BOB = Web3.to_checksum_address("0x" + "b2" * 20)
+CAROL = Web3.to_checksum_address("0x" + "c3" * 20)
+
+
+class _Chain:
+    """Just enough of MonadBridge for the indexer: eth_getLogs over `logs` and contract reads."""
+
+    def __init__(self, contract, logs: list[dict[str, Any]], profiles: dict[str, tuple[Any, ...]]) -> None:
+        self.contract = contract
+        self.logs = logs
+        self.profiles = profiles
+        self.head = max((log["blockNumber"] for log in logs), default=0)
+        self.reads: list[str] = []
+        self.instrumentation = DISABLED
+        self.w3 = SimpleNamespace(eth=self)
+
+    @property
+    def block_number(self) -> int:
+        return self.head
+
+    def get_logs(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    def read(self, fn_name: str, *args: Any) -> Any:
+        self.reads.append(fn_name)
+        if fn_name == "getAgentProfile":
+            return self.profiles[args[0]]
+        if fn_name == "getCategoryAgents":
+            return [a for a, p in self.profiles.items() if p[2] == args[0]]
+        raise AssertionError(fn_name)
+
+
+def _profile(category: str, fee: int, reputation: int) -> tuple[Any, ...]:
+    return ("name", "expertise", to_bytes32(category), fee, 0, reputation, 0, True)
+
+
+def _registration(make_log, agent: str, category: str, fee: int, block: int) -> dict[str, Any]:
+    return make_log(
+        "AgentRegisteredV2",
+        block_number=block,
+        agent=agent,
+        name="n",
+        expertise="e",
+        category=to_bytes32(category),
+        baseFeeWei=fee,
+        stakeWei=0,
+    )
+
+
+def test_sync_builds_category_index_from_events(contract, make_log, tmp_path) -> None:
+    chain = _Chain(
+        contract,
+        [
+            _registration(make_log, ALICE, "RESEARCH", 100, 1),
+            _registration(make_log, BOB, "RESEARCH", 200, 2),
+            _registration(make_log, CAROL, "DEVELOPMENT", 50, 2),
+            make_log("ReputationUpdated", block_number=3, agent=BOB, oldScore=80, newScore=81, reason=b"\x00" * 32),
+            make_log("FeedbackApplied", block_number=4, jobId=1, worker=ALICE, positive=False, newReputation=49),
+        ],
+        # Seeded agents carry their real reputation in contract state only.
+        {ALICE: _profile("RESEARCH", 100, 50), BOB: _profile("RESEARCH", 200, 80), CAROL: _profile("DEVELOPMENT", 50, 60)},
+    )
+    indexer = RegistryIndexer(chain, checkpoint_file=tmp_path / "index.json")
+    assert not indexer.restored
+    assert indexer.sync() == 5
+    assert indexer.version == 1 and indexer.last_block == 4
+    research = {c.address: c.reputation_score for c in indexer.candidates("RESEARCH")}
+    assert research == {ALICE: 49, BOB: 81}
+    assert indexer.select_best("RESEARCH", 150).best.address == ALICE
+    assert indexer.select_best("RESEARCH", 10**18).best.address == BOB
+    assert indexer.sync() == 0 and indexer.version == 1
+
+
+def test_checkpoint_restores_and_catches_up(contract, make_log, tmp_path) -> None:
+    checkpoint = tmp_path / "index.json"
+    logs = [_registration(make_log, ALICE, "RESEARCH", 100, 1)]
+    chain = _Chain(contract, logs, {ALICE: _profile("RESEARCH", 100, 50), BOB: _profile("RESEARCH", 90, 70)})
+    assert open_registry_index(chain, checkpoint) is None
+    RegistryIndexer(chain, checkpoint_file=checkpoint).sync()
+
+    logs.append(_registration(make_log, BOB, "RESEARCH", 90, 7))
+    chain.head = 9
+    indexer = open_registry_index(chain, checkpoint)
+    assert indexer is not None and indexer.last_block == 9
+    assert {c.address for c in indexer.candidates("RESEARCH")} == {ALICE, BOB}
+
+
+def test_selector_reads_index_when_present_and_contract_otherwise(contract, make_log, tmp_path) -> None:
+    checkpoint = tmp_path / "index.json"
+    chain = _Chain(
+        contract,
+        [_registration(make_log, ALICE, "RESEARCH", 100, 1)],
+        {ALICE: _profile("RESEARCH", 100, 50)},
+    )
+    rpc = AgentSelector.open(chain, checkpoint)
+    assert rpc.indexer is None
+    assert rpc.select("RESEARCH", 1_000).best.address == ALICE
+    assert "getCategoryAgents" in chain.reads
+
+    RegistryIndexer(chain, checkpoint_file=checkpoint).sync()
+    chain.reads.clear()
+    indexed = AgentSelector.open(chain, checkpoint)
+    assert indexed.indexer is not None
+    assert indexed.select("RESEARCH", 1_000).best.address == ALICE
+    assert chain.reads == []
+
+
+def test_selector_ranks_through_budget_index(contract, make_log, tmp_path, monkeypatch) -> None:
+    checkpoint = tmp_path / "index.json"
+    chain = _Chain(
+        contract,
+        [
+            _registration(make_log, ALICE, "RESEARCH", 100, 1),
+            _registration(make_log, BOB, "RESEARCH", 200, 1),
+            _registration(make_log, CAROL, "RESEARCH", 300, 1),
+        ],
+        {ALICE: _profile("RESEARCH", 100, 50), BOB: _profile("RESEARCH", 200, 80), CAROL: _profile("RESEARCH", 300, 90)},
+    )
+    RegistryIndexer(chain, checkpoint_file=checkpoint).sync()
+    selector = AgentSelector.open(chain, checkpoint, ranking_size=2)
+    assert selector.indexer is not None and selector.indexer.max_k == 2
+    # A capped selection must not fall back to scanning the category.
+    monkeypatch.setattr(selector.indexer, "candidates", None)
+    result = selector.select("RESEARCH", 250)
+    assert [c.address for c in result.candidates] == [BOB, ALICE]
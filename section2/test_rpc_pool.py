@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+import requests
+
+from rpc_pool import FailoverHTTPProvider, RateLimitedError, split_rpc_urls
+
+
+class _Endpoint:
+    """Stand-in JSON-RPC node on localhost answering with a fixed HTTP status and body."""
+
+    def __init__(self, status: int = 200, error: dict[str, Any] | None = None) -> None:
+        self.status = status
+        self.error = error
+        self.methods: list[str] = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                endpoint.methods.append(request["method"])
+                reply: dict[str, Any] = {"jsonrpc": "2.0", "id": request["id"]}
+                if endpoint.error is not None:
+                    reply["error"] = endpoint.error
+                else:
+                    reply["result"] = "0x10"
+                body = json.dumps(reply).encode()
+                self.send_response(endpoint.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def endpoints() -> Iterator[list[_Endpoint]]:
+    started: list[_Endpoint] = []
+    yield started
+    for endpoint in started:
+        endpoint.close()
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class _Clock:
+    """Cooldowns elapse when the provider sleeps, without real waiting."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _provider(urls: list[str]) -> FailoverHTTPProvider:
+    clock = _Clock()
+    return FailoverHTTPProvider(urls, timeout_sec=2, clock=clock, sleep=clock.sleep)
+
+
+def test_split_rpc_urls() -> None:
+    assert split_rpc_urls(" http://a , ,http://b") == ["http://a", "http://b"]
+    with pytest.raises(ValueError):
+        FailoverHTTPProvider([])
+
+
+def test_server_error_moves_read_to_next_endpoint(endpoints) -> None:
+    broken, healthy = _Endpoint(status=500), _Endpoint()
+    endpoints += [broken, healthy]
+    provider = _provider([broken.url, healthy.url])
+    for _ in range(3):
+        assert provider.make_request("eth_blockNumber", [])["result"] == "0x10"
+    assert broken.methods == ["eth_blockNumber"]
+    assert len(healthy.methods) == 3
+    first = provider.snapshot()[0]
+    assert first.failures == 1 and "500" in first.last_error
+
+
+def test_rate_limited_reply_fails_over_and_is_counted(endpoints) -> None:
+    limited = _Endpoint(error={"code": -32005, "message": "limit exceeded"})
+    healthy = _Endpoint()
+    endpoints += [limited, healthy]
+    provider = _provider([limited.url, healthy.url])
+    assert provider.make_request("eth_sendRawTransaction", ["0x00"])["result"] == "0x10"
+    assert limited.methods == healthy.methods == ["eth_sendRawTransaction"]
+    assert provider.snapshot()[0].rate_limited == 1
+
+    alone = _provider([limited.url])
+    with pytest.raises(RateLimitedError):
+        alone.make_request("eth_blockNumber", [])
+
+
+def test_raw_tx_is_not_rebroadcast_after_server_error(endpoints) -> None:
+    broken, healthy = _Endpoint(status=502), _Endpoint()
+    endpoints += [broken, healthy]
+    provider = _provider([broken.url, healthy.url])
+    with pytest.raises(requests.HTTPError):
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+    assert healthy.methods == []
+
+
+def test_raw_tx_moves_on_when_first_node_is_unreachable(endpoints) -> None:
+    healthy = _Endpoint()
+    endpoints.append(healthy)
+    provider = _provider([_closed_port_url(), healthy.url])
+    assert provider.make_request("eth_sendRawTransaction", ["0x00"])["result"] == "0x10"
+    assert healthy.methods == ["eth_sendRawTransaction"]
+    assert "ConnectionError" in provider.snapshot()[0].last_error
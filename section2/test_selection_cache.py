@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+import selection_cache
+from agent_selector import AgentSelector
+from selection_cache import LRUCache, SelectionCache
+from selection_engine import Candidate
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(selection_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get_or_load("a", lambda: -1) == 1
+    cache.put("c", 3)
+    assert cache.get_or_load("b", lambda: -2) == -2
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 2, 2)
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_lru_entries_expire_after_ttl(clock: _Clock) -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=8, ttl_sec=30)
+    loads: list[int] = []
+
+    def load() -> int:
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get_or_load("k", load) == 1
+    clock.now += 29.9
+    assert cache.get_or_load("k", load) == 1
+    clock.now += 0.1
+    assert cache.get_or_load("k", load) == 2
+    cache.invalidate("k")
+    assert cache.get_or_load("k", load) == 3
+
+
+def test_selection_is_reloaded_when_version_moves() -> None:
+    pool = [Candidate("0xA", "RESEARCH", 10, 5), Candidate("0xB", "RESEARCH", 20, 9)]
+    loads: list[int] = []
+
+    def load() -> list[Candidate]:
+        loads.append(1)
+        return list(pool)
+
+    cache = SelectionCache()
+    assert cache.select("RESEARCH", 25, load, version=1).best.address == "0xB"
+    # Same budget bucket (between fees 20 and the next fee): served from cache, reason re-rendered.
+    again = cache.select("RESEARCH", 30, load, version=1)
+    assert again.best.address == "0xB" and "budget 30" in again.reason
+    assert len(loads) == 1
+
+    pool[1] = Candidate("0xB", "RESEARCH", 20, 1)
+    assert cache.select("RESEARCH", 25, load, version=1).best.address == "0xB"
+    assert cache.select("RESEARCH", 25, load, version=2).best.address == "0xA"
+    assert len(loads) == 2
+    with pytest.raises(ValueError, match="No eligible agent"):
+        cache.select("RESEARCH", 5, load, version=2)
+
+
+def test_agent_selector_keys_cache_on_index_version() -> None:
+    pool = {"RESEARCH": [Candidate("0xA", "RESEARCH", 10, 5)]}
+    index = SimpleNamespace(version=3, candidates=lambda category: list(pool[category]))
+    selector = AgentSelector(bridge=None, indexer=index, ranking_size=None)
+    assert selector.version == 3
+    assert selector.select("RESEARCH", 100).best.address == "0xA"
+
+    pool["RESEARCH"].append(Candidate("0xB", "RESEARCH", 10, 9))
+    assert selector.select("RESEARCH", 100).best.address == "0xA"
+    index.version = 4
+    assert selector.select("RESEARCH", 100).best.address == "0xB"
+
+    assert selector.infer_category("Fix the  API") == selector.infer_category("fix the api") == "DEVELOPMENT"
+    assert selector.cache.stats()["inference"].hits == 1
+
+
+def test_refresh_without_index_retires_cached_selections(monkeypatch) -> None:
+    pool = [Candidate("0xA", "RESEARCH", 10, 5)]
+    monkeypatch.setattr("agent_selector.load_category_candidates", lambda bridge, category: list(pool))
+    selector = AgentSelector(bridge=None)
+    assert selector.select("RESEARCH", 100).best.address == "0xA"
+    pool.append(Candidate("0xB", "RESEARCH", 10, 9))
+    assert selector.select("RESEARCH", 100).best.address == "0xA"
+    assert selector.refresh() == 0 and selector.version == 1
+    assert selector.select("RESEARCH", 100).best.address == "0xB"
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from itertools import islice
+
+import pytest
+
+import selection_engine
+from selection_engine import (
+    Candidate,
+    category_scores,
+    infer_categories,
+    infer_category,
+    iter_ranked,
+    rank_candidates,
+    rank_key,
+    select_best,
+    top_k,
+)
+
+
+def _pool(seed: int, size: int = 200) -> list[Candidate]:
+    rng = random.Random(seed)
+    # Narrow value ranges so reputation and fee ties are common.
+    return [
+        Candidate(
+            address=f"0x{index:040x}",
+            category="RESEARCH",
+            base_fee_wei=rng.randint(0, 20),
+            reputation_score=rng.randint(0, 10),
+        )
+        for index in range(size)
+    ]
+
+
+def _reference(candidates: list[Candidate], budget_wei: int) -> list[Candidate]:
+    return sorted((c for c in candidates if c.base_fee_wei <= budget_wei), key=rank_key)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("budget", [-1, 0, 7, 20])
+def test_top_k_matches_full_sort_including_ties(seed: int, budget: int) -> None:
+    pool = _pool(seed)
+    expected = _reference(pool, budget)
+    for k in (0, 1, 2, 10, len(pool) + 5):
+        assert top_k(pool, budget, k) == expected[:k]
+        assert rank_candidates(pool, budget, limit=k) == expected[:k]
+    assert rank_candidates(pool, budget) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_iter_ranked_is_the_sorted_order(seed: int) -> None:
+    pool = _pool(seed)
+    assert list(iter_ranked(pool, 12)) == _reference(pool, 12)
+    assert list(islice(iter_ranked(iter(pool), 12), 3)) == _reference(pool, 12)[:3]
+
+
+def test_select_best_limit_and_no_eligible() -> None:
+    pool = _pool(0)
+    result = select_best(pool, "RESEARCH", 12, limit=3)
+    assert result.best == _reference(pool, 12)[0]
+    assert len(result.candidates) == 3
+    with pytest.raises(ValueError, match="No eligible agent"):
+        select_best(pool, "RESEARCH", -1)
+
+
+@pytest.mark.parametrize(
+    "prompt, category",
+    [
+        ("debugging", "DEVELOPMENT"),
+        ("i keep debugging things", "DEVELOPMENT"),
+        ("analyzed the numbers", "RESEARCH"),
+        ("Scraped datasets", "DATA_MINING"),
+        ("two articles, please", "CONTENT_GEN"),
+    ],
+)
+def test_keywords_match_with_suffixes(prompt: str, category: str) -> None:
+    assert set(category_scores(prompt)) == {category}
+    assert infer_category(prompt, default="NONE") == category
+
+
+def test_keywords_do_not_match_inside_words() -> None:
+    # "api" inside "capital", "code" inside "barcode", "post" inside "compost".
+    assert category_scores("capital barcode compost") == {}
+    assert infer_category("raise capital", default="NONE") == "NONE"
+    assert infer_category("capital for the api", default="NONE") == "DEVELOPMENT"
+
+
+def test_infer_categories_scores_repeated_prompts_once(monkeypatch) -> None:
+    calls: list[str] = []
+    real = selection_engine.infer_category
+    monkeypatch.setattr(selection_engine, "infer_category", lambda prompt, default: calls.append(prompt) or real(prompt, default))
+    prompts = ["fix the api", "write a post", "fix the api", "nothing", "nothing"]
+    assert infer_categories(prompts, default="NONE") == ["DEVELOPMENT", "CONTENT_GEN", "DEVELOPMENT", "NONE", "NONE"]
+    assert calls == ["fix the api", "write a post", "nothing"]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from mock_worker_logic import MockWorkResult
+from worker_pool import WorkerPool, work_timeout
+
+
+class _GatedBackend:
+    """Each prompt runs until its gate is opened."""
+
+    def __init__(self) -> None:
+        self.gates: dict[str, asyncio.Event] = {}
+        self.ran: list[str] = []
+
+    def gate(self, prompt: str) -> asyncio.Event:
+        return self.gates.setdefault(prompt, asyncio.Event())
+
+    def run(self, prompt: str) -> MockWorkResult:
+        raise AssertionError("asyncio mode should use run_async")
+
+    async def run_async(self, prompt: str) -> MockWorkResult:
+        self.ran.append(prompt)
+        await self.gate(prompt).wait()
+        return MockWorkResult(summary=prompt, confidence=1.0, output_json={})
+
+
+def test_work_timeout_keeps_submit_margin() -> None:
+    assert work_timeout(60) == 50.0
+    assert work_timeout(5) == 1.0
+
+
+def test_caller_stuck_on_full_queue_times_out_without_enqueueing() -> None:
+    async def scenario() -> None:
+        backend = _GatedBackend()
+        async with WorkerPool(backend, max_workers=1, max_queue=1) as pool:
+            running = asyncio.create_task(pool.run("a"))
+            await asyncio.sleep(0)
+            queued = asyncio.create_task(pool.run("b"))
+            await asyncio.sleep(0)
+            with pytest.raises(TimeoutError):
+                await pool.run("c", timeout_sec=0.05)
+            backend.gate("a").set()
+            backend.gate("b").set()
+            assert (await running).summary == "a" and (await queued).summary == "b"
+            assert backend.ran == ["a", "b"]
+            assert pool.metrics().timed_out == 1
+
+    asyncio.run(asyncio.wait_for(scenario(), 2))
+
+
+def test_deadline_includes_time_waiting_for_queue_space() -> None:
+    async def scenario() -> None:
+        backend = _GatedBackend()
+        backend.gate("c").set()
+        async with WorkerPool(backend, max_workers=1, max_queue=1) as pool:
+            asyncio.create_task(pool.run("a"))
+            await asyncio.sleep(0)
+            asyncio.create_task(pool.run("b"))
+            await asyncio.sleep(0)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            late = asyncio.create_task(pool.run("c", timeout_sec=0.2))
+            # "c" gets into the queue at 0.15s; restarting the clock there would let it finish at 0.3s.
+            await asyncio.sleep(0.15)
+            backend.gate("a").set()
+            await asyncio.sleep(0.15)
+            backend.gate("b").set()
+            with pytest.raises(TimeoutError):
+                await late
+            assert loop.time() - started < 0.3 + 0.05
+
+    asyncio.run(asyncio.wait_for(scenario(), 2))
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from mock_worker_logic import MockWorkResult
+
+
+POOL_MODES = ("asyncio", "thread", "process")
+
+# Time left after the work phase for the submitWork tx to confirm before the job's timeoutAt.
+DEFAULT_SUBMIT_MARGIN_SEC = 10.0
+
+
+class WorkerBackend(Protocol):
+    def run(self, prompt: str) -> MockWorkResult: ...
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    timed_out: int
+    max_queue_depth: int
+    avg_wait_sec: float
+    avg_run_sec: float
+
+
+def work_timeout(timeout_seconds: int, submit_margin_sec: float = DEFAULT_SUBMIT_MARGIN_SEC) -> float:
+    """
+    Budget for the work phase of a job accepted just now. The contract's
+    timeoutAt is acceptance time + timeoutSeconds, after which the employer may
+    refund, so the result has to be submitted before that.
+    """
+    return max(1.0, float(timeout_seconds) - submit_margin_sec)
+
+
+@dataclass
+class _Task:
+    prompt: str
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class WorkerPool:
+    """
+    Bounded execution pool for worker backends.
+
+    `mode` picks where `backend.run` executes:
+    - "asyncio": `backend.run_async` on the event loop when the backend has it, else a thread
+    - "thread": a `ThreadPoolExecutor` (blocking I/O-bound backends)
+    - "process": a `ProcessPoolExecutor` (CPU-bound backends; must be picklable)
+
+    At most `max_workers` tasks run at once and at most `max_queue` wait;
+    `run` blocks the caller while the queue is full (backpressure). A task
+    that exceeds its timeout, counted from the call to `run` including any
+    wait for queue space, raises `TimeoutError`; in "asyncio" mode it is
+    cancelled, in executor modes the slot frees up once the call returns.
+    """
+
+    def __init__(
+        self,
+        backend: WorkerBackend,
+        mode: str = "asyncio",
+        max_workers: int = 8,
+        max_queue: int = 64,
+    ) -> None:
+        if mode not in POOL_MODES:
+            raise ValueError(f"mode must be one of {', '.join(POOL_MODES)}")
+        if max_workers <= 0 or max_queue <= 0:
+            raise ValueError("max_workers and max_queue must be positive")
+        self.backend = backend
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue[_Task] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._executor: Executor | None = None
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+    async def start(self) -> "WorkerPool":
+        if self._queue is not None:
+            return self
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self.mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="worker")
+        elif self.mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._workers = [asyncio.create_task(self._consume(), name=f"worker-{i}") for i in range(self.max_workers)]
+        return self
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "WorkerPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def run(self, prompt: str, timeout_sec: float | None = None) -> MockWorkResult:
+        if self._queue is None:
+            await self.start()
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        # The deadline covers time spent blocked on a full queue, not only the work itself.
+        deadline = None if timeout_sec is None else loop.time() + timeout_sec
+        future: asyncio.Future = loop.create_future()
+        try:
+            await asyncio.wait_for(
+                self._queue.put(_Task(prompt=prompt, future=future, enqueued_at=time.perf_counter())),
+                timeout_sec,
+            )
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+            return await asyncio.wait_for(future, None if deadline is None else max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            raise TimeoutError(f"Work did not finish within {timeout_sec:.1f}s") from None
+
+    def metrics(self) -> PoolMetrics:
+        done = self._completed + self._failed
+        return PoolMetrics(
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            running=self._running,
+            completed=self._completed,
+            failed=self._failed,
+            timed_out=self._timed_out,
+            max_queue_depth=self._max_depth,
+            avg_wait_sec=self._wait_total / done if done else 0.0,
+            avg_run_sec=self._run_total / done if done else 0.0,
+        )
+
+    async def _consume(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            task = await queue.get()
+            try:
+                if task.future.done():
+                    # The caller already timed out while the task was queued.
+                    continue
+                started = time.perf_counter()
+                self._wait_total += started - task.enqueued_at
+                self._running += 1
+                try:
+                    result = await self._execute(task)
+                except asyncio.CancelledError:
+                    if not task.future.done():
+                        task.future.cancel()
+                    raise
+                except _Abandoned:
+                    pass
+                except Exception as exc:
+                    self._failed += 1
+                    if not task.future.done():
+                        task.future.set_exception(exc)
+                else:
+                    self._completed += 1
+                    if not task.future.done():
+                        task.future.set_result(result)
+                finally:
+                    self._running -= 1
+                    self._run_total += time.perf_counter() - started
+            finally:
+                queue.task_done()
+
+    async def _execute(self, task: _Task) -> MockWorkResult:
+        if self._executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.backend.run, task.prompt)
+        run_async = getattr(self.backend, "run_async", None)
+        if run_async is None:
+            return await asyncio.to_thread(self.backend.run, task.prompt)
+        # Tie the coroutine to the caller's future so a caller-side timeout cancels the work too.
+        work = asyncio.ensure_future(run_async(task.prompt))
+        task.future.add_done_callback(lambda f: work.cancel() if f.cancelled() else None)
+        try:
+            # asyncio.wait does not propagate the work's own cancellation into this consumer.
+            await asyncio.wait({work})
+        except asyncio.CancelledError:
+            work.cancel()
+            raise
+        if work.cancelled():
+            raise _Abandoned()
+        return work.result()
+
+
+class _Abandoned(Exception):
+    """The caller gave up (timeout) and the work was cancelled; already counted as timed out."""